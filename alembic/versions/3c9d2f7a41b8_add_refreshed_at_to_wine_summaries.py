@@ -0,0 +1,37 @@
+"""add refreshed_at to wine_summaries
+
+Revision ID: 3c9d2f7a41b8
+Revises: 78ee26cb63e4
+Create Date: 2026-10-19 01:30:27.114502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2f7a41b8'
+down_revision: Union[str, None] = '78ee26cb63e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Step 1: Add the column, new rows default to now()
+    op.add_column('wine_summaries', sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    # Step 2: Existing rows were last summarized when they were created
+    wine_summaries_table = sa.sql.table(
+        'wine_summaries',
+        sa.sql.column('created_at', sa.DateTime(timezone=True)),
+        sa.sql.column('refreshed_at', sa.DateTime(timezone=True))
+    )
+    op.execute(wine_summaries_table.update().values(refreshed_at=wine_summaries_table.c.created_at))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('wine_summaries', 'refreshed_at')
@@ -0,0 +1,87 @@
+"""add wine_key to wine_summaries
+
+Revision ID: 5e1a7c3d9b20
+Revises: 3c9d2f7a41b8
+Create Date: 2026-10-19 01:41:08.327916
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.normalize import canonical_wine_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a7c3d9b20'
+down_revision: Union[str, None] = '3c9d2f7a41b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Step 1: Add the column as nullable
+    op.add_column('wine_summaries', sa.Column('wine_key', sa.String(length=255), nullable=True))
+
+    # Step 2: Group rows by the same normalization the app uses, reading in id-ordered batches.
+    # Lookups go only by wine_key, so a row without one could never be served again.
+    wine_summaries_table = sa.sql.table(
+        'wine_summaries',
+        sa.sql.column('id', sa.Integer),
+        sa.sql.column('wine', sa.String),
+        sa.sql.column('wine_key', sa.String)
+    )
+    conn = op.get_bind()
+    newest_by_key = {}
+    duplicate_ids = []
+    after_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(wine_summaries_table.c.id, wine_summaries_table.c.wine)
+            .where(wine_summaries_table.c.id > after_id)
+            .order_by(wine_summaries_table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        for row_id, wine in rows:
+            key = canonical_wine_key(wine or "")
+            if not key:
+                continue
+            # Ids ascend, so the later row is the newer summary of this wine
+            if key in newest_by_key:
+                duplicate_ids.append(newest_by_key[key])
+            newest_by_key[key] = row_id
+        after_id = rows[-1][0]
+
+    # Step 3: Keep the newest row per key; older case/spacing duplicates are deleted
+    # (their food pairings go with them through ON DELETE CASCADE)
+    for start in range(0, len(duplicate_ids), BACKFILL_BATCH_SIZE):
+        conn.execute(
+            wine_summaries_table.delete()
+            .where(wine_summaries_table.c.id.in_(duplicate_ids[start:start + BACKFILL_BATCH_SIZE]))
+        )
+
+    # Step 4: Backfill the keys of the remaining rows
+    updates = [{"row_id": row_id, "key": key} for key, row_id in newest_by_key.items()]
+    for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+        conn.execute(
+            wine_summaries_table.update()
+            .where(wine_summaries_table.c.id == sa.bindparam('row_id'))
+            .values(wine_key=sa.bindparam('key')),
+            updates[start:start + BACKFILL_BATCH_SIZE]
+        )
+
+    # Step 5: Unique index for equality lookups
+    op.create_index(op.f('ix_wine_summaries_wine_key'), 'wine_summaries', ['wine_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema. Duplicate rows deleted by the upgrade are not restored."""
+    op.drop_index(op.f('ix_wine_summaries_wine_key'), table_name='wine_summaries')
+    op.drop_column('wine_summaries', 'wine_key')
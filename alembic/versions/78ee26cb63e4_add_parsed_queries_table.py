@@ -0,0 +1,47 @@
+"""add parsed_queries table
+
+Revision ID: 78ee26cb63e4
+Revises: fbf9a1dbee5a
+Create Date: 2026-10-19 01:09:41.508233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78ee26cb63e4'
+down_revision: Union[str, None] = 'fbf9a1dbee5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('parsed_queries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('query_key', sa.String(length=512), nullable=False),
+    sa.Column('raw_query', sa.Text(), nullable=False),
+    sa.Column('winery', sa.String(length=255), server_default='', nullable=False),
+    sa.Column('wine_name', sa.String(length=255), server_default='', nullable=False),
+    sa.Column('vintage', sa.String(length=20), server_default='', nullable=False),
+    sa.Column('canonical_key', sa.String(length=255), nullable=False),
+    sa.Column('prompt_version', sa.String(length=20), nullable=False),
+    sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parsed_queries_id'), 'parsed_queries', ['id'], unique=False)
+    op.create_index(op.f('ix_parsed_queries_query_key'), 'parsed_queries', ['query_key'], unique=True)
+    op.create_index(op.f('ix_parsed_queries_canonical_key'), 'parsed_queries', ['canonical_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_parsed_queries_canonical_key'), table_name='parsed_queries')
+    op.drop_index(op.f('ix_parsed_queries_query_key'), table_name='parsed_queries')
+    op.drop_index(op.f('ix_parsed_queries_id'), table_name='parsed_queries')
+    op.drop_table('parsed_queries')
@@ -0,0 +1,37 @@
+"""add trigram index on wine name
+
+Revision ID: 9b4e2d6f8a13
+Revises: 5e1a7c3d9b20
+Create Date: 2026-10-19 01:46:45.903118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e2d6f8a13'
+down_revision: Union[str, None] = '5e1a7c3d9b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_wine_summaries_wine_trgm',
+        'wine_summaries',
+        ['wine'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'wine': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wine_summaries_wine_trgm', table_name='wine_summaries', postgresql_using='gin')
+    # pg_trgm is left installed, other objects may depend on it
@@ -0,0 +1,29 @@
+"""add (created_at, id) index to wine_summaries
+
+Revision ID: c7a4e1f9d252
+Revises: 9b4e2d6f8a13
+Create Date: 2026-10-19 01:48:12.417630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a4e1f9d252'
+down_revision: Union[str, None] = '9b4e2d6f8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination of /api/wines, newest first
+    op.create_index('ix_wine_summaries_created_at_id', 'wine_summaries', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wine_summaries_created_at_id', table_name='wine_summaries')
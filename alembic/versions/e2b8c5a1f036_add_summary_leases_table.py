@@ -0,0 +1,34 @@
+"""add summary_leases table
+
+Revision ID: e2b8c5a1f036
+Revises: c7a4e1f9d252
+Create Date: 2026-10-19 02:09:40.228175
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c5a1f036'
+down_revision: Union[str, None] = 'c7a4e1f9d252'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'summary_leases',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('holder', sa.String(length=32), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('summary_leases')
@@ -0,0 +1,39 @@
+"""add wine_request_counts table
+
+Revision ID: f4d91b7e2c58
+Revises: e2b8c5a1f036
+Create Date: 2026-10-19 02:18:06.581342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4d91b7e2c58'
+down_revision: Union[str, None] = 'e2b8c5a1f036'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'wine_request_counts',
+        sa.Column('canonical_key', sa.String(length=255), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('winery', sa.String(length=255), server_default='', nullable=False),
+        sa.Column('wine_name', sa.String(length=255), server_default='', nullable=False),
+        sa.Column('vintage', sa.String(length=20), server_default='', nullable=False),
+        sa.Column('requests', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('canonical_key', 'day')
+    )
+    op.create_index(op.f('ix_wine_request_counts_day'), 'wine_request_counts', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_wine_request_counts_day'), table_name='wine_request_counts')
+    op.drop_table('wine_request_counts')
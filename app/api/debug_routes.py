@@ -12,4 +12,29 @@ async def debug_env():
         "DB_HOST",
         "LAST_UPDATED"
     ]
-    return {key: os.getenv(key, "[NOT SET]") for key in keys_to_check}
\ No newline at end of file
+    return {key: os.getenv(key, "[NOT SET]") for key in keys_to_check}
+
+@router.get("/query-parser", summary="Local query parser hit ratio and LLM time saved (dev only)")
+async def debug_query_parser():
+    from app.services.rules.local_query_parser import local_query_parser
+    return local_query_parser.stats()
+
+@router.get("/llm-cache", summary="LLM response cache hits, misses and tokens saved (dev only)")
+async def debug_llm_cache():
+    from app.services.llm.response_cache import llm_response_cache
+    return llm_response_cache.stats()
+
+@router.get("/llm-tasks", summary="Per-task Gemini model, call counts and latency (dev only)")
+async def debug_llm_tasks():
+    from app.services.llm.tasks import task_latency
+    return task_latency.snapshot()
+
+@router.get("/cache", summary="Per-namespace cache hits, misses and lookup latency (dev only)")
+async def debug_cache():
+    from app.utils.cache import cache
+    return cache.stats()
+
+@router.get("/summary-refresh", summary="Background refresh of stale wine summaries (dev only)")
+async def debug_summary_refresh():
+    from app.services.handlers.summary_refresher import summary_refresher
+    return summary_refresher.stats()
@@ -1,27 +1,38 @@
-import os, logging
+import base64, io, json, os, logging
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.crud.wine_summary import get_all_wine_summaries
-from app.db.session import get_async_session
+from app.db.crud.wine_summary import (
+    list_wine_summaries, search_similar_wines, LISTABLE_FIELDS, DEFAULT_LIST_FIELDS
+)
+from app.db.session import (
+    get_async_session, get_read_session, async_session, engine, replica_engine,
+    pool_stats, reset_pool_stats, reads_from_replica, use_primary
+)
 from app.exceptions import GoogleSearchApiError, GeminiApiError
-from app.models.mcp_model import WineMCPRequest, WineImageMCPRequest, MenuMCPRequest, FoodTextRequest
+from app.models.mcp_model import MCPContext, WineMCPRequest, WineImageMCPRequest, MenuMCPRequest, FoodTextRequest
 from app.services.handlers.wine_summary_handler import (
-    handle_wine_analysis_query, handle_mock_response, handle_cached_wine_summary, handle_fresh_summary
+    handle_wine_analysis_query, handle_mock_response, handle_cached_wine_summary, handle_summary_once
 )
 from app.services.handlers.food_pairing_handler import (
     handle_cached_pairings, handle_food_pairing
 )
 from app.services.handlers.image_analysis_handler import handle_image_analysis
 from app.services.handlers.menu_analysis_handler import handle_menu_analysis, handle_food_text_analysis
-from app.utils.cache import clear_all_cache
+from app.services.handlers.stream_handler import stream_analysis
+from app.services.llm.response_cache import llm_response_cache
+from app.utils.cache import cache, clear_all_cache
+from app.utils.metrics import lookup_metrics
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Extract user query, use Google Programmable Search Engine and Gemini to search and aggregate info
-@router.post("/analyze-wine", summary="Search wine info using LLM and return SAT-style analysis")
-async def analyze_wine(request: WineMCPRequest, session: AsyncSession = Depends(get_async_session)):
+# Response headers for Server-Sent Events (disable proxy buffering)
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+async def run_wine_analysis(request: WineMCPRequest, session: AsyncSession) -> dict:
     env = os.getenv("ENV", "prod")
     use_mock = request.context.model_dump().get("use_mock", False)
     
@@ -32,7 +43,7 @@ async def analyze_wine(request: WineMCPRequest, session: AsyncSession = Depends(
 
     # Parse user query into structured wine info
     try:
-        parsed = await handle_wine_analysis_query(request)
+        parsed = await handle_wine_analysis_query(request, session)
         wine_name = parsed["wine_name"]
         original_query = parsed["original_query"]
 
@@ -42,8 +53,8 @@ async def analyze_wine(request: WineMCPRequest, session: AsyncSession = Depends(
             logger.info(f"Found existing summary in DB.")
             return cached
 
-        # Summarize the wine info using smart search + LLM pipeline
-        return await handle_fresh_summary(session, wine_name, original_query, request)
+        # Summarize the wine info using smart search + LLM pipeline (deduplicated per wine)
+        return await handle_summary_once(session, wine_name, original_query, request)
 
     except GoogleSearchApiError as e:
         logger.exception("Google Search API failed.")
@@ -64,20 +75,9 @@ async def analyze_wine(request: WineMCPRequest, session: AsyncSession = Depends(
             "error": "Something went wrong while analyzing the wine. Please try again later."
         }
 
-@router.post("/analyze-wine-image", summary="Analyze wine from uploaded image")
-async def analyze_wine_image(
-    file: UploadFile = File(...),
-    context: str = Form(...),  # JSON string of MCPContext
-    session: AsyncSession = Depends(get_async_session)
-):
-    """
-    Analyze wine from uploaded image using Gemini Vision API.
-    """
+async def run_wine_image_analysis(file: UploadFile, context: str, session: AsyncSession) -> dict:
     try:
         # Parse context from form data
-        import json
-        from app.models.mcp_model import MCPContext
-        
         context_data = json.loads(context)
         mcp_context = MCPContext(**context_data)
         
@@ -99,6 +99,55 @@ async def analyze_wine_image(
             "error": f"Failed to process image: {str(e)}"
         }
 
+# Extract user query, use Google Programmable Search Engine and Gemini to search and aggregate info
+@router.post("/analyze-wine", summary="Search wine info using LLM and return SAT-style analysis")
+async def analyze_wine(request: WineMCPRequest, session: AsyncSession = Depends(get_async_session)):
+    return await run_wine_analysis(request, session)
+
+@router.post("/analyze-wine/stream", summary="Stream wine analysis progress as Server-Sent Events")
+async def analyze_wine_stream(request: WineMCPRequest):
+    """
+    Same pipeline as /analyze-wine, streamed as `stage` events followed by a final `result` event.
+    """
+    async def run():
+        # Own session: the stream outlives the request-scoped dependency
+        async with async_session() as session:
+            return await run_wine_analysis(request, session)
+
+    return StreamingResponse(stream_analysis(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.post("/analyze-wine-image", summary="Analyze wine from uploaded image")
+async def analyze_wine_image(
+    file: UploadFile = File(...),
+    context: str = Form(...),  # JSON string of MCPContext
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Analyze wine from uploaded image using Gemini Vision API.
+    """
+    return await run_wine_image_analysis(file, context, session)
+
+@router.post("/analyze-wine-image/stream", summary="Stream wine image analysis progress as Server-Sent Events")
+async def analyze_wine_image_stream(
+    file: UploadFile = File(...),
+    context: str = Form(...),  # JSON string of MCPContext
+):
+    """
+    Same pipeline as /analyze-wine-image, streamed as `stage` events followed by a final `result` event.
+    """
+    # Read the upload now, the original file is closed once this handler returns
+    buffered = UploadFile(
+        file=io.BytesIO(await file.read()),
+        filename=file.filename,
+        headers=file.headers
+    )
+
+    async def run():
+        async with async_session() as session:
+            return await run_wine_image_analysis(buffered, context, session)
+
+    return StreamingResponse(stream_analysis(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/analyze-menu-image", summary="Analyze menu from uploaded image and recommend wines")
 async def analyze_menu_image(
     file: UploadFile = File(...),
@@ -155,9 +204,13 @@ async def analyze_food_text(
         }
 
 @router.get("/pair-food", summary="Recommend food pairings for a wine")
-async def pair_food(wine_name: str, session: AsyncSession = Depends(get_async_session)):
+async def pair_food(wine_name: str, session: AsyncSession = Depends(get_read_session)):
     try:
         cached, wine = await handle_cached_pairings(session, wine_name)
+        if not cached and reads_from_replica(session):
+            # Pairings saved moments ago may not have replicated yet, don't generate them twice
+            await use_primary(session)
+            cached, wine = await handle_cached_pairings(session, wine_name)
         if cached:
             logger.info(f"Found existing pairing for '{wine_name}'")
             return cached
@@ -171,10 +224,75 @@ async def pair_food(wine_name: str, session: AsyncSession = Depends(get_async_se
             "error": "Something went wrong while generating food pairing. Please try again later."
         }
 
-@router.get("/wines", summary="Get all stored wine summaries")
-async def list_all_wines(session: AsyncSession = Depends(get_async_session)):
-    results = await get_all_wine_summaries(session)
-    return [wine.to_dict() for wine in results]
+def encode_wine_cursor(row: dict) -> str:
+    return base64.urlsafe_b64encode(f"{row['created_at'].isoformat()}|{row['id']}".encode()).decode()
+
+def decode_wine_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at, wine_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(created_at), int(wine_id)
+
+def format_wine_row(row: dict, fields: tuple[str, ...]) -> dict:
+    # Same empty defaults as WineSummary.to_dict
+    defaults = {"sat": {}, "reference_source": []}
+    item = {}
+    for name in fields:
+        value = row[name]
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif value is None and name not in ("created_at", "refreshed_at"):
+            value = defaults.get(name, "")
+        item[name] = value
+    return item
+
+@router.get("/wines", summary="List stored wine summaries, newest first")
+async def list_all_wines(
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Keyset-paginated: pass `next_cursor` from the previous page as `cursor` until it is null.
+    `fields` is a comma-separated projection, e.g. `fields=wine,region,sat`; by default the
+    large analysis and sat columns are left out.
+    """
+    selected = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip())) if fields else DEFAULT_LIST_FIELDS
+    unknown = [name for name in selected if name not in LISTABLE_FIELDS]
+    if unknown or not selected:
+        return {"status": "error", "error": f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(LISTABLE_FIELDS)}"}
+
+    try:
+        after = decode_wine_cursor(cursor) if cursor else None
+    except ValueError:
+        return {"status": "error", "error": "Invalid cursor."}
+
+    rows = await list_wine_summaries(session, limit=limit, after=after, fields=selected)
+    return {
+        "items": [format_wine_row(row, selected) for row in rows],
+        "next_cursor": encode_wine_cursor(rows[-1]) if len(rows) == limit and rows[-1]["created_at"] else None
+    }
+
+@router.get("/wines/search", summary="Fuzzy search stored wines by name")
+async def search_wines(
+    q: str = Query(..., min_length=2),
+    limit: int = Query(default=5, ge=1, le=50),
+    min_similarity: float = Query(default=0.3, ge=0.0, le=1.0),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Stored wines with a trigram-similar name, best match first, tolerant of typos and
+    missing accents, e.g. `chateau margaux 2015` or `opus 1 2015`.
+    """
+    try:
+        matches = await search_similar_wines(session, q.strip(), limit=limit, min_similarity=min_similarity)
+    except Exception:
+        logger.exception("Fuzzy wine search failed.")
+        return {"status": "error", "error": "Wine search is unavailable. Please try again later."}
+
+    return [
+        {"wine": wine.wine, "region": wine.region, "similarity": round(similarity, 3)}
+        for wine, similarity in matches
+    ]
 
 @router.api_route("/healthcheck", methods=["GET", "HEAD"], summary="Healthcheck endpoints")
 async def healthcheck(
@@ -202,14 +320,56 @@ async def get_metadata():
         "last_updated": LAST_UPDATED,
     }
 
+@router.get("/metrics", summary="Cache hit/miss counters and lookup latency per namespace")
+async def get_cache_metrics():
+    """
+    Counters since startup or the last /metrics/reset (or /clear-cache):
+    `caches` are the tiered cache namespaces (search, html, menu, pairing, llm),
+    `db` the stored summary and pairing lookups, `llm` the Gemini response cache,
+    `db_pool` the live connection pool and checkout wait times (`db_replica_pool` too
+    when a read replica is configured).
+    """
+    metrics = {
+        "caches": cache.stats(),
+        "db": lookup_metrics.snapshot(),
+        "llm": llm_response_cache.stats(),
+        "db_pool": pool_stats(engine),
+    }
+    if replica_engine is not None:
+        metrics["db_replica_pool"] = pool_stats(replica_engine)
+    return metrics
+
+def reset_all_metrics() -> None:
+    cache.reset_stats()
+    lookup_metrics.reset()
+    llm_response_cache.reset_stats()
+    reset_pool_stats(engine)
+    if replica_engine is not None:
+        reset_pool_stats(replica_engine)
+
+@router.post("/metrics/reset", summary="Reset the /metrics counters")
+async def reset_metrics_counters():
+    """
+    Zero the /metrics counters without touching cached data, so it works in production
+    where /clear-cache is disabled.
+    """
+    reset_all_metrics()
+    logger.info("Metrics counters reset via API")
+    return {"status": "success", "metrics_reset": True}
+
 @router.post("/clear-cache", summary="Clear all application cache")
-async def clear_application_cache():
+async def clear_application_cache(reset_metrics: bool = Query(default=True)):
     """
-    Clear all cached data including wine recommendations, menu analysis, 
-    search results, and HTML cache. This affects the current session only.
+    Clear every cache tier (memory and disk) for all users: search results, crawled
+    pages, menu/label analysis, wine recommendations and LLM responses.
+    Also resets the /metrics counters unless reset_metrics=false. Disabled in production,
+    use /metrics/reset there to reset the counters alone.
     """
     try:
         result = clear_all_cache()
+        if reset_metrics and result.get("status") != "disabled":
+            reset_all_metrics()
+            result["metrics_reset"] = True
         logger.info(f"Cache clearing requested via API: {result}")
         return result
     except Exception as e:
@@ -13,6 +13,8 @@ DEBUG_LOG = ENV == "dev"
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Set to the local stand-in (e.g. http://localhost:8090) to run without the live Gemini API
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_CX = os.getenv("GOOGLE_CX")
@@ -37,6 +39,63 @@ MAX_SYMBOLIC_THRESHOLD = 5  # max allowed symbolic chars in a row
 # Cache behavior
 EMBEDDING_CACHE_SIZE = 1024
 
+# Tiered cache (app/utils/cache.py): in-memory LRU per namespace in front of local disk
+CACHE_ROOT = os.getenv("CACHE_ROOT", "cache")
+CACHE_NAMESPACES = {
+    "search": {"ttl_seconds": 7 * 24 * 3600, "max_entries": 512},   # Google search result links
+    "html": {"ttl_seconds": 7 * 24 * 3600, "max_entries": 128},     # relevant crawled page text
+    "menu": {"ttl_seconds": 15 * 60, "max_entries": 64},            # menu image analysis
+    "label": {"ttl_seconds": 24 * 3600, "max_entries": 128},        # wine label vision results
+    "pairing": {"ttl_seconds": 15 * 60, "max_entries": 256},        # menu wine recommendations
+    "llm": {"ttl_seconds": 24 * 3600, "max_entries": 512},          # Gemini responses, TTL set per task
+    "negative": {"ttl_seconds": 30 * 60, "max_entries": 1024},      # failed/irrelevant URLs and empty searches
+}
+NEGATIVE_CACHE_TTLS = {             # seconds per reason, kept short so transient failures are retried soon
+    "timeout": 15 * 60,
+    "error": 15 * 60,
+    "no_content": 30 * 60,          # non-HTML, too short or unreadable page
+    "irrelevant": 24 * 3600,        # page fetched fine but below WINE_NAME_SIM_THRESHOLD for this wine
+    "empty_search": 6 * 3600,       # Google returned no items for the query
+}
+CACHE_DEFAULT_NAMESPACE = {"ttl_seconds": 24 * 3600, "max_entries": 256}
+# Disk tier budget, LRU-evicted past this. On Cloud Run the filesystem is in-memory, so
+# this counts against the instance memory limit (1Gi in deploy.yml) next to the model.
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+CACHE_SWEEP_INTERVAL_SECONDS = 300      # how often writes trigger an expiry sweep
+
+# Near-duplicate image reuse (app/services/image/perceptual_hash.py)
+IMAGE_HASH_SIZE = 16                # dHash grid, 16 → 256-bit hash
+IMAGE_NEAR_DUPLICATE_DISTANCE = {   # max Hamming distance (of 256 bits) to reuse an earlier result
+    "menu": int(os.getenv("MENU_IMAGE_MAX_DISTANCE", 10)),      # strict: menus sharing a layout look alike
+    "label": int(os.getenv("LABEL_IMAGE_MAX_DISTANCE", 16)),
+}
+LABEL_CACHE_MIN_CONFIDENCE = float(os.getenv("LABEL_CACHE_MIN_CONFIDENCE", 0.7))  # weaker label readings are not reused
+
+# Prompt assembly: token budget for crawled content sent to the SAT summary prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", 12000))
+PROMPT_PARAGRAPH_MAX_TOKENS = 300   # longer blocks are split before ranking
+PROMPT_NAME_MATCH_WEIGHT = 0.6      # weight of wine-name mentions in paragraph score
+PROMPT_SIMILARITY_WEIGHT = 0.4      # weight of embedding similarity to the wine name
+
+# LLM response cache: deterministic Gemini calls keyed on (model, prompt, config), on in every ENV
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTLS = {                  # seconds per task, tasks not listed are never cached
+    "query_parse": int(os.getenv("LLM_CACHE_TTL_QUERY_PARSE", 7 * 24 * 3600)),
+    "menu_pairing": int(os.getenv("LLM_CACHE_TTL_MENU_PAIRING", 24 * 3600)),
+    "item_pairing": int(os.getenv("LLM_CACHE_TTL_ITEM_PAIRING", 24 * 3600)),
+}
+
+# Async DB engine (app/db/session.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))                  # connections kept open per process
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))            # extra connections under burst, closed when returned
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 10))   # wait for a free connection before failing
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+DB_POOL_WARM_CONNECTIONS = int(os.getenv("DB_POOL_WARM_CONNECTIONS", DB_POOL_SIZE))   # opened at startup
+DB_POOL_WARM_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_WARM_TIMEOUT_SECONDS", 5))   # startup never waits longer on warmup
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))    # asyncpg prepared statements per connection, 0 behind pgbouncer
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 15000))  # server-side cap per statement, 0 disables
+DB_ECHO = os.getenv("DB_ECHO", str(ENV == "dev")).lower() == "true"        # log every SQL statement
+
 # Wine domain reference corpus (for semantic embedding)
 WINE_REFERENCE_TEXT = (
     "Wine labels often list grape varieties such as Pinot Noir, Cabernet Sauvignon, Merlot, Syrah, Grenache, Tempranillo, Chardonnay, Riesling, and Chenin Blanc. "
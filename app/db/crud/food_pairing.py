@@ -1,40 +1,48 @@
 from app.db.models.food_pairing import FoodPairingCategory, FoodPairingExample
 from app.db.models.wine_summary import WineSummary
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import insert, select
+from sqlalchemy.orm import raiseload, selectinload
 from typing import Optional
+from app.utils.normalize import canonical_wine_key
 
 async def save_food_pairings(session, wine_id: int, data: list[dict]):
     # data = [{"category": "Beef", "examples": [{"food": "...", "reason": "..."}, ...]}, ...]
-    for group in data:
-        cat = FoodPairingCategory(
-            wine_id=wine_id,
-            category=group["category"],
-            base_category=group["base_category"]
+    # Two statements regardless of size: all categories with INSERT ... RETURNING id,
+    # then all examples as one executemany, committed together.
+    if data:
+        result = await session.execute(
+            insert(FoodPairingCategory).returning(FoodPairingCategory.id, sort_by_parameter_order=True),
+            [
+                {"wine_id": wine_id, "category": group["category"], "base_category": group["base_category"]}
+                for group in data
+            ]
         )
-        session.add(cat)
-        await session.flush()  # Get cat.id
+        category_ids = result.scalars().all()
 
-        for item in group["examples"]:
-            example = FoodPairingExample(
-                category_id=cat.id,
-                food=item["food"],
-                reason=item["reason"]
-            )
-            session.add(example)
+        examples = [
+            {"category_id": category_id, "food": item["food"], "reason": item["reason"]}
+            for category_id, group in zip(category_ids, data)
+            for item in group["examples"]
+        ]
+        if examples:
+            await session.execute(insert(FoodPairingExample), examples)
 
     await session.commit()
 
 # Retrieve wine summary and its pairings for a given wine
 async def get_wine_and_pairings(session: AsyncSession, wine_name: str) -> tuple[Optional[WineSummary], list[FoodPairingCategory]]:
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
+    # 3 statements: the wine, its categories, their examples. Category.wine_summary
+    # resolves from the identity map, so it must never emit SQL of its own.
     result = await session.execute(
         select(WineSummary)
-        .options(selectinload(WineSummary.food_pairing_categories).selectinload(FoodPairingCategory.examples))
-        .where(WineSummary.wine.ilike(wine_name))
+        .options(
+            selectinload(WineSummary.food_pairing_categories).options(
+                selectinload(FoodPairingCategory.examples),
+                raiseload(FoodPairingCategory.wine_summary, sql_only=True)
+            )
+        )
+        .where(WineSummary.wine_key == canonical_wine_key(wine_name))
     )
     wine = result.scalar_one_or_none()
     categories = wine.food_pairing_categories if wine else []
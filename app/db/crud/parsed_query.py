@@ -0,0 +1,54 @@
+from sqlalchemy import bindparam, select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import ParsedQuery
+
+async def get_parsed_query(session: AsyncSession, query_key: str, prompt_version: str) -> ParsedQuery | None:
+    """
+    Look up a memoized parse; entries parsed with another prompt version are treated as missing.
+    Read-only: usage stats are bumped in batches by record_parsed_query_hits.
+    """
+    result = await session.execute(
+        select(ParsedQuery).where(ParsedQuery.query_key == query_key, ParsedQuery.prompt_version == prompt_version)
+    )
+    return result.scalars().first()
+
+async def record_parsed_query_hits(session: AsyncSession, hits: dict[str, int]):
+    """
+    Add hits (query_key → count) to hit_count and stamp last_used_at, one executemany.
+    """
+    table = ParsedQuery.__table__
+    await session.execute(
+        update(table)
+        .where(table.c.query_key == bindparam("key"))
+        .values(hit_count=table.c.hit_count + bindparam("hits"), last_used_at=func.now()),
+        [{"key": key, "hits": count} for key, count in hits.items()]
+    )
+    await session.commit()
+
+async def save_parsed_query(session: AsyncSession, data: dict):
+    stmt = insert(ParsedQuery).values(**data)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ParsedQuery.query_key],
+            set_={
+                key: stmt.excluded[key]
+                for key in ("raw_query", "winery", "wine_name", "vintage", "canonical_key", "prompt_version")
+            }
+        )
+    )
+    await session.commit()
+
+async def get_stale_parsed_queries(
+    session: AsyncSession,
+    prompt_version: str,
+    after_id: int = 0,
+    limit: int = 100
+) -> list[ParsedQuery]:
+    result = await session.execute(
+        select(ParsedQuery)
+        .where(ParsedQuery.prompt_version != prompt_version, ParsedQuery.id > after_id)
+        .order_by(ParsedQuery.id)
+        .limit(limit)
+    )
+    return result.scalars().all()
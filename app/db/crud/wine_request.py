@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import WineRequestCount
+
+async def record_wine_requests(session: AsyncSession, requests: dict[str, dict]):
+    """
+    Add today's request counts, canonical_key → {winery, wine_name, vintage, requests}, one executemany.
+    """
+    today = datetime.now(timezone.utc).date()
+    stmt = insert(WineRequestCount)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[WineRequestCount.canonical_key, WineRequestCount.day],
+            set_={"requests": WineRequestCount.requests + stmt.excluded.requests}
+        ),
+        [{"canonical_key": key, "day": today, **row} for key, row in requests.items()]
+    )
+    await session.commit()
+
+async def get_popular_wines(session: AsyncSession, since: datetime, limit: int = 20) -> list[tuple[str, str, str, int]]:
+    """
+    Most requested wines since `since`, as (winery, wine_name, vintage, requests).
+    """
+    requests = func.sum(WineRequestCount.requests).label("requests")
+    result = await session.execute(
+        select(
+            func.max(WineRequestCount.winery),
+            func.max(WineRequestCount.wine_name),
+            func.max(WineRequestCount.vintage),
+            requests
+        )
+        .where(WineRequestCount.day >= since.date())
+        .group_by(WineRequestCount.canonical_key)
+        .order_by(requests.desc())
+        .limit(limit)
+    )
+    return [tuple(row) for row in result.all()]
@@ -1,18 +1,83 @@
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, tuple_
+from sqlalchemy.orm import raiseload
 from app.db.models import WineSummary
+from app.utils.normalize import canonical_wine_key
 
 async def get_wine_summary_by_name(session: AsyncSession, wine_name: str) -> WineSummary | None:
     result = await session.execute(
-        select(WineSummary).where(WineSummary.wine.ilike(wine_name))
+        select(WineSummary)
+        .options(raiseload(WineSummary.food_pairing_categories))
+        .where(WineSummary.wine_key == canonical_wine_key(wine_name))
     )
     return result.scalars().first()
 
+async def search_similar_wines(
+    session: AsyncSession,
+    query: str,
+    limit: int = 5,
+    min_similarity: float = 0.3
+) -> list[tuple[WineSummary, float]]:
+    """
+    Stored wines whose name is trigram-similar to query (pg_trgm), best match first.
+    The % operator uses the GIN trigram index; its cutoff is set to min_similarity for this transaction.
+    """
+    await session.execute(select(func.set_config("pg_trgm.similarity_threshold", str(min_similarity), True)))
+    score = func.similarity(WineSummary.wine, query).label("score")
+    result = await session.execute(
+        select(WineSummary, score)
+        .options(raiseload(WineSummary.food_pairing_categories))
+        .where(WineSummary.wine.op("%")(query))
+        .order_by(score.desc(), WineSummary.id)
+        .limit(limit)
+    )
+    return [(wine, float(similarity)) for wine, similarity in result.all()]
+
 async def save_wine_summary(session: AsyncSession, data: dict):
-    db_entry = WineSummary(**data)
+    db_entry = WineSummary(**data, wine_key=canonical_wine_key(data["wine"]))
     session.add(db_entry)
     await session.commit()
 
-async def get_all_wine_summaries(session: AsyncSession) -> list[WineSummary]:
-    result = await session.execute(select(WineSummary))
-    return result.unique().scalars().all()
\ No newline at end of file
+async def refresh_wine_summary(session: AsyncSession, wine_id: int, data: dict):
+    """
+    Overwrite a stored summary with a newly generated one and stamp refreshed_at.
+    """
+    await session.execute(
+        update(WineSummary)
+        .where(WineSummary.id == wine_id)
+        .values(**data, refreshed_at=func.now())
+    )
+    await session.commit()
+
+# Columns list_wine_summaries can project, and the default light projection without analysis/sat
+LISTABLE_FIELDS = (
+    "id", "wine", "query_text", "region", "grape_varieties", "appearance", "nose", "palate",
+    "aging", "average_price", "quality", "analysis", "sat", "reference_source", "created_at", "refreshed_at"
+)
+DEFAULT_LIST_FIELDS = ("id", "wine", "region", "grape_varieties", "average_price", "quality", "created_at")
+
+async def list_wine_summaries(
+    session: AsyncSession,
+    limit: int = 50,
+    after: tuple[datetime, int] | None = None,
+    fields: tuple[str, ...] = DEFAULT_LIST_FIELDS
+) -> list[dict]:
+    """
+    One page of stored wines, newest first, with only the requested columns.
+
+    Keyset pagination on (created_at, id): pass the last row's (created_at, id) as after
+    to get the next page, served from ix_wine_summaries_created_at_id at any depth.
+    Selecting columns instead of the entity also skips the food pairing join.
+    """
+    columns = [getattr(WineSummary, name) for name in dict.fromkeys(("created_at", "id", *fields))]
+    stmt = select(*columns).order_by(WineSummary.created_at.desc(), WineSummary.id.desc()).limit(limit)
+    if after is not None:
+        stmt = stmt.where(tuple_(WineSummary.created_at, WineSummary.id) < tuple_(*after))
+
+    result = await session.execute(stmt)
+    return [dict(row) for row in result.mappings().all()]
+
+async def get_all_wine_names(session: AsyncSession) -> list[str]:
+    result = await session.execute(select(WineSummary.wine))
+    return [name for name in result.scalars().all() if name]
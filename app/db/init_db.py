@@ -1,9 +1,11 @@
 import asyncio
+from sqlalchemy import text
 from app.db.session import engine
 from app.db.models import Base
 
 async def init_db():
     async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))   # for ix_wine_summaries_wine_trgm
         await conn.run_sync(Base.metadata.create_all)
 
 if __name__ == "__main__":
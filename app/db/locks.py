@@ -0,0 +1,26 @@
+from datetime import timedelta
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import SummaryLease
+
+async def try_acquire_lease(session: AsyncSession, key: str, holder: str, ttl_seconds: float) -> bool:
+    """
+    Take the lease on key for ttl_seconds unless someone else holds an unexpired one.
+    Committed immediately, so no transaction or connection is held while the lease is.
+    """
+    stmt = insert(SummaryLease).values(key=key, holder=holder, expires_at=func.now() + timedelta(seconds=ttl_seconds))
+    result = await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SummaryLease.key],
+            set_={"holder": stmt.excluded.holder, "expires_at": stmt.excluded.expires_at},
+            where=SummaryLease.expires_at < func.now()
+        ).returning(SummaryLease.holder)
+    )
+    acquired = result.scalar() is not None
+    await session.commit()
+    return acquired
+
+async def release_lease(session: AsyncSession, key: str, holder: str) -> None:
+    await session.execute(delete(SummaryLease).where(SummaryLease.key == key, SummaryLease.holder == holder))
+    await session.commit()
@@ -1,5 +1,8 @@
 from .base import Base
 from .wine_summary import WineSummary
 from .food_pairing import FoodPairingCategory, FoodPairingExample
+from .parsed_query import ParsedQuery
+from .summary_lease import SummaryLease
+from .wine_request import WineRequestCount
 
-__all__ = ["Base", "WineSummary", "FoodPairingCategory", "FoodPairngExampele"]
\ No newline at end of file
+__all__ = ["Base", "WineSummary", "FoodPairingCategory", "FoodPairngExampele", "ParsedQuery", "SummaryLease", "WineRequestCount"]
\ No newline at end of file
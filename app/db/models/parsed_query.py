@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, func
+from app.db.models import Base
+
+class ParsedQuery(Base):
+    __tablename__ = "parsed_queries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    query_key = Column(String(512), unique=True, index=True, nullable=False)   # normalized raw query
+    raw_query = Column(Text, nullable=False)
+    winery = Column(String(255), nullable=False, server_default="")
+    wine_name = Column(String(255), nullable=False, server_default="")
+    vintage = Column(String(20), nullable=False, server_default="")
+    canonical_key = Column(String(255), index=True, nullable=False)   # canonical joined wine name
+    prompt_version = Column(String(20), nullable=False)
+    hit_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def to_dict(self):
+        return {
+            "winery": self.winery or "",
+            "wine_name": self.wine_name or "",
+            "vintage": self.vintage or "",
+            "canonical_key": self.canonical_key,
+            "prompt_version": self.prompt_version,
+        }
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String, DateTime
+from app.db.models import Base
+
+class SummaryLease(Base):
+    __tablename__ = "summary_leases"
+
+    key = Column(String(255), primary_key=True)     # canonical wine key being summarized
+    holder = Column(String(32), nullable=False)     # random id of the worker holding it
+    expires_at = Column(DateTime(timezone=True), nullable=False)   # a crashed holder's lease lapses here
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer, Date
+from app.db.models import Base
+
+class WineRequestCount(Base):
+    __tablename__ = "wine_request_counts"
+
+    # One row per wine per day, whichever parser path resolved the query
+    canonical_key = Column(String(255), primary_key=True)    # canonical joined wine name
+    day = Column(Date, primary_key=True, index=True)
+    winery = Column(String(255), nullable=False, server_default="")
+    wine_name = Column(String(255), nullable=False, server_default="")
+    vintage = Column(String(20), nullable=False, server_default="")
+    requests = Column(Integer, nullable=False, server_default="0")
@@ -1,13 +1,20 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, func
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.db.models import Base
 
 class WineSummary(Base):
     __tablename__ = "wine_summaries"
+    __table_args__ = (
+        # Fuzzy name search (pg_trgm), see search_similar_wines
+        Index("ix_wine_summaries_wine_trgm", "wine", postgresql_using="gin", postgresql_ops={"wine": "gin_trgm_ops"}),
+        # Keyset pagination, see list_wine_summaries
+        Index("ix_wine_summaries_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     wine = Column(String(255), index=True, nullable=False)
+    wine_key = Column(String(255), unique=True, index=True)   # canonical_wine_key(wine), used for lookups
     query_text = Column(Text, nullable=False)
     region = Column(String(255), nullable=False, server_default="")
     grape_varieties = Column(String(255), nullable=False, server_default="")
@@ -21,12 +28,13 @@ class WineSummary(Base):
     sat = Column(JSONB, nullable=True)
     reference_source = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())   # last re-summarized
 
     food_pairing_categories = relationship(
         "FoodPairingCategory",
         back_populates="wine_summary",
         cascade="all, delete",
-        lazy="joined"  # or "selectin" if preferred
+        lazy="select"  # loaded per query with selectinload/raiseload, see app/db/crud
     )
 
     def to_dict(self):
@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+import logging
+import os
+from app.db.crud.parsed_query import record_parsed_query_hits
+from app.db.crud.wine_request import record_wine_requests
+from app.db.session import async_session
+
+logger = logging.getLogger(__name__)
+
+USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", 30))
+
+class UsageRecorder:
+    """
+    Counts usage in memory and writes it in one batch every flush_seconds, so read paths
+    (query memo hits, wine requests) never write to the database themselves. Counts still pending
+    when a process dies are lost; they only feed stats and popularity ranking.
+    """
+
+    def __init__(self, flush_seconds: float = USAGE_FLUSH_SECONDS, session_factory=async_session):
+        self.flush_seconds = flush_seconds
+        self.session_factory = session_factory
+        self._memo_hits: dict[str, int] = {}
+        self._wine_requests: dict[str, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    def memo_hit(self, query_key: str) -> None:
+        self._memo_hits[query_key] = self._memo_hits.get(query_key, 0) + 1
+        self._ensure_flusher()
+
+    def wine_requested(self, canonical_key: str, winery: str, wine_name: str, vintage: str) -> None:
+        if not canonical_key:
+            return
+        row = self._wine_requests.setdefault(
+            canonical_key,
+            {"winery": winery or "", "wine_name": wine_name or "", "vintage": vintage or "", "requests": 0}
+        )
+        row["requests"] += 1
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._flush_periodically(), context=contextvars.Context())
+        except RuntimeError:
+            pass    # no running loop (scripts), flushed by an explicit flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write everything pending. Never raises; a failed batch is dropped.
+        """
+        memo_hits, self._memo_hits = self._memo_hits, {}
+        wine_requests, self._wine_requests = self._wine_requests, {}
+        batches = [
+            ("query memo hits", record_parsed_query_hits, memo_hits),
+            ("wine requests", record_wine_requests, wine_requests),
+        ]
+        for name, record, pending in batches:
+            if not pending:
+                continue
+            try:
+                async with self.session_factory() as session:
+                    await record(session, pending)
+            except Exception as e:
+                logger.warning(f"[USAGE] Failed to record {len(pending)} {name}: {e}")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        await self.flush()
+
+usage_recorder = UsageRecorder()
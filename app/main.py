@@ -1,7 +1,12 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.routes import router as api_router
+from app.db.session import engine, replica_engine, warm_pool
+from app.db.usage_recorder import usage_recorder
+from app.services.handlers.cache_warmer import WARM_ON_STARTUP, warm_on_startup
 from app.utils import env
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
 import logging
 import os
 
@@ -9,8 +14,29 @@ logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 )
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled DB connections before the first request needs one
+    opened = await warm_pool(engine)
+    logger.info(f"DB pool warmed with {opened} connections")
+    if replica_engine is not None:
+        opened = await warm_pool(replica_engine)
+        logger.info(f"DB replica pool warmed with {opened} connections")
+
+    # Pre-compute popular wines in the background, opt-in with WARM_ON_STARTUP=true
+    warm_task = asyncio.create_task(warm_on_startup()) if WARM_ON_STARTUP else None
+    yield
+    if warm_task:
+        warm_task.cancel()
+    await usage_recorder.close()   # write pending usage counts before the pool closes
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Wine Intelligence Analyzer",
     version="1.0",
     description="App to analyze wine with WSET SAT (Systematic Approach to Tasting)",
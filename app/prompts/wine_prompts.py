@@ -1,3 +1,6 @@
+# Bump when get_wine_from_query_prompt changes, so memoized query parses get re-parsed
+QUERY_PARSE_PROMPT_VERSION = "1"
+
 def get_sat_prompt(
   wine_name: str,
   content: str,
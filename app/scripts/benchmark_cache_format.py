@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import time
+from app.config import CACHE_ROOT
+from app.utils.cache_codec import encode_entry, decode_entry, CODEC_RAW, CODEC_GZIP, CODEC_ZSTD, zstandard
+
+def load_entries(root: str) -> list[dict]:
+    entries = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if not filename.endswith((".json", ".bin")):
+                continue
+            try:
+                with open(os.path.join(dirpath, filename), "rb") as f:
+                    entry = decode_entry(f)
+            except Exception:
+                continue
+            # Oldest layout stored the bare value
+            entries.append(entry if "value" in entry else {"key": filename, "expires_at": 0, "value": entry})
+    return entries
+
+def legacy_json(entry: dict) -> bytes:
+    return json.dumps(entry, indent=2).encode()
+
+def bench_format(entries: list[dict], encode) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"{i}.entry") for i in range(len(entries))]
+
+        start = time.perf_counter()
+        for path, entry in zip(paths, entries):
+            with open(path, "wb") as f:
+                f.write(encode(entry))
+        write_seconds = time.perf_counter() - start
+
+        size = sum(os.path.getsize(p) for p in paths)
+
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, "rb") as f:
+                decode_entry(f)
+        read_seconds = time.perf_counter() - start
+
+    n = max(len(entries), 1)
+    return {"bytes": size, "write_ms": write_seconds * 1000 / n, "read_ms": read_seconds * 1000 / n}
+
+def benchmark_cache_format(root: str = CACHE_ROOT):
+    """
+    Compare disk usage and per-entry read/write latency of cache formats on a real cache directory.
+    Run: python -m app.scripts.benchmark_cache_format [cache_root]
+    """
+    entries = load_entries(root)
+    if not entries:
+        print(f"No cache entries found under {root}.")
+        return
+
+    formats = {
+        "json indent=2 (old)": legacy_json,
+        "compact json": lambda e: encode_entry(e, CODEC_RAW),
+        "gzip": lambda e: encode_entry(e, CODEC_GZIP),
+    }
+    if zstandard is not None:
+        formats["zstd"] = lambda e: encode_entry(e, CODEC_ZSTD)
+
+    print(f"{len(entries)} entries from {root}\n")
+    print(f"{'format':<22}{'disk bytes':>14}{'ratio':>8}{'write ms':>11}{'read ms':>10}")
+    baseline = None
+    for name, encode in formats.items():
+        result = bench_format(entries, encode)
+        baseline = baseline or result["bytes"]
+        print(
+            f"{name:<22}{result['bytes']:>14,}{result['bytes'] / baseline:>8.2f}"
+            f"{result['write_ms']:>11.3f}{result['read_ms']:>10.3f}"
+        )
+
+if __name__ == "__main__":
+    benchmark_cache_format(sys.argv[1] if len(sys.argv) > 1 else CACHE_ROOT)
@@ -0,0 +1,80 @@
+import asyncio
+import statistics
+import sys
+import time
+from sqlalchemy import event, select
+from app.db.crud.food_pairing import save_food_pairings
+from app.db.crud.wine_summary import save_wine_summary
+from app.db.models.food_pairing import FoodPairingCategory, FoodPairingExample
+from app.db.models.wine_summary import WineSummary
+from app.db.session import async_session, engine
+
+BENCH_WINE = "Pairing Write Benchmark 1999"
+
+def sample_pairings(categories: int, examples: int) -> list[dict]:
+    return [
+        {
+            "category": f"Category {i}",
+            "base_category": "Other",
+            "examples": [{"food": f"Dish {i}.{j}", "reason": "Benchmark pairing"} for j in range(examples)]
+        }
+        for i in range(categories)
+    ]
+
+async def save_food_pairings_per_category(session, wine_id: int, data: list[dict]):
+    # Previous writer: one flush per category to get its id
+    for group in data:
+        cat = FoodPairingCategory(wine_id=wine_id, category=group["category"], base_category=group["base_category"])
+        session.add(cat)
+        await session.flush()
+        for item in group["examples"]:
+            session.add(FoodPairingExample(category_id=cat.id, food=item["food"], reason=item["reason"]))
+    await session.commit()
+
+async def bench_writer(writer, wine_id: int, data: list[dict], runs: int) -> dict:
+    statements = 0
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    timings = []
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        for _ in range(runs):
+            async with async_session() as session:
+                start = time.perf_counter()
+                await writer(session, wine_id, data)
+                timings.append((time.perf_counter() - start) * 1000)
+                await session.execute(FoodPairingCategory.__table__.delete().where(FoodPairingCategory.wine_id == wine_id))
+                await session.commit()
+                statements -= 1     # the cleanup delete
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    return {"median_ms": statistics.median(timings), "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1], "statements": statements / runs}
+
+async def benchmark_pairing_writes(runs: int = 50, categories: int = 8, examples: int = 3):
+    """
+    Compare per-category flushes with the bulk INSERT ... RETURNING writer on a real database.
+    Writes under a throwaway wine that is deleted afterwards.
+    Run: python -m app.scripts.benchmark_pairing_writes [runs] [categories] [examples]
+    """
+    data = sample_pairings(categories, examples)
+    async with async_session() as session:
+        await save_wine_summary(session, {"wine": BENCH_WINE, "query_text": "benchmark"})
+        wine_id = await session.scalar(select(WineSummary.id).where(WineSummary.wine == BENCH_WINE))
+
+    try:
+        print(f"{runs} runs, {categories} categories x {examples} examples\n")
+        print(f"{'writer':<16}{'median ms':>11}{'p95 ms':>9}{'statements':>12}")
+        for name, writer in (("per-category", save_food_pairings_per_category), ("bulk", save_food_pairings)):
+            result = await bench_writer(writer, wine_id, data, runs)
+            print(f"{name:<16}{result['median_ms']:>11.2f}{result['p95_ms']:>9.2f}{result['statements']:>12.1f}")
+    finally:
+        async with async_session() as session:
+            await session.execute(WineSummary.__table__.delete().where(WineSummary.id == wine_id))
+            await session.commit()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(benchmark_pairing_writes(*(int(arg) for arg in sys.argv[1:4])))
@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import time
+from app.config import CACHE_ROOT
+from app.utils.cache import TieredCache
+
+def find_legacy_files(root: str) -> list[tuple[str, str]]:
+    legacy = []
+    for namespace in sorted(os.listdir(root)):
+        namespace_path = os.path.join(root, namespace)
+        if not os.path.isdir(namespace_path):
+            continue
+        for dirpath, _, filenames in os.walk(namespace_path):
+            legacy.extend((namespace, os.path.join(dirpath, f)) for f in filenames if f.endswith(".json"))
+    return legacy
+
+def migrate_cache_format(root: str = CACHE_ROOT):
+    """
+    One-time rewrite of plain-JSON cache files into the compressed format (app/utils/cache_codec.py).
+    Files from the oldest layout store no key or expiry and cannot be looked up again, so they are removed.
+    Run: python -m app.scripts.migrate_cache_format [cache_root]
+    """
+    if not os.path.isdir(root):
+        print(f"No cache directory at {root}.")
+        return
+
+    # Collect before opening the store: building its index skips .json files
+    legacy = find_legacy_files(root)
+    store = TieredCache(root=root)
+    now = time.time()
+    migrated = expired = removed = 0
+    bytes_before = bytes_after = 0
+
+    for namespace, path in legacy:
+        bytes_before += os.path.getsize(path)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except Exception:
+            entry = {}
+
+        if "key" not in entry or "expires_at" not in entry:
+            removed += 1
+        elif entry["expires_at"] <= now:
+            expired += 1
+        else:
+            store.set(namespace, entry["key"], entry["value"], ttl_seconds=entry["expires_at"] - now)
+            bytes_after += os.path.getsize(store._path(namespace, entry["key"]))
+            migrated += 1
+        os.remove(path)
+
+    print(
+        f"Migrated {migrated} cache files ({bytes_before:,} → {bytes_after:,} bytes), "
+        f"dropped {expired} expired and {removed} unkeyed legacy files."
+    )
+
+if __name__ == "__main__":
+    migrate_cache_format(sys.argv[1] if len(sys.argv) > 1 else CACHE_ROOT)
@@ -0,0 +1,44 @@
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import async_session
+from app.db.crud.parsed_query import get_stale_parsed_queries, save_parsed_query
+from app.prompts.wine_prompts import QUERY_PARSE_PROMPT_VERSION
+from app.services.llm.gemini_engine import parse_wine_query_with_gemini
+from app.services.llm.query_memo import build_parsed_query_entry
+from app.utils.normalize import join_wine_name
+
+BATCH_SIZE = 100
+
+async def reparse_parsed_queries():
+    """
+    Re-parse memoized queries stored under an older QUERY_PARSE_PROMPT_VERSION.
+    Run after changing the query parsing prompt: python -m app.scripts.reparse_parsed_queries
+    """
+    async with async_session() as session:  # type: AsyncSession
+        after_id, updated, failed = 0, 0, 0
+
+        while True:
+            entries = await get_stale_parsed_queries(
+                session, QUERY_PARSE_PROMPT_VERSION, after_id=after_id, limit=BATCH_SIZE
+            )
+            if not entries:
+                break
+
+            for entry in entries:
+                after_id = entry.id
+                try:
+                    parsed = parse_wine_query_with_gemini(entry.raw_query)
+                except Exception as e:
+                    failed += 1
+                    print(f"Failed to re-parse '{entry.raw_query}': {e}")
+                    continue
+
+                wine_name = join_wine_name(parsed["winery"], parsed["wine_name"], parsed["vintage"])
+                await save_parsed_query(session, build_parsed_query_entry(entry.raw_query, parsed, wine_name))
+                updated += 1
+                print(f"Re-parsed '{entry.raw_query}' → {wine_name}")
+
+        print(f"Re-parsed {updated} queries to prompt version {QUERY_PARSE_PROMPT_VERSION} ({failed} failed).")
+
+if __name__ == "__main__":
+    asyncio.run(reparse_parsed_queries())
@@ -0,0 +1,18 @@
+import asyncio
+import sys
+from app.services.handlers.cache_warmer import CacheWarmer, WARM_TOP_N, WARM_LOOKBACK_DAYS
+
+async def warm_cache(top_n: int = WARM_TOP_N, lookback_days: int = WARM_LOOKBACK_DAYS):
+    """
+    Pre-compute summaries and food pairings for the most requested wines.
+    Run after a deploy or cache wipe: python -m app.scripts.warm_cache [top_n] [lookback_days]
+    """
+    report = await CacheWarmer().run(top_n=top_n, lookback_days=lookback_days)
+    print(
+        f"Warmed {report['wines']} wines in {report['seconds']}s — "
+        f"summaries {report['summaries']}, pairings {report['pairings']}"
+    )
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(warm_cache(*args))
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from app.db.crud.wine_request import get_popular_wines
+from app.db.session import async_session
+from app.models.mcp_model import MCPContext, WineMCPRequest
+from app.services.handlers.food_pairing_handler import handle_cached_pairings, handle_food_pairing
+from app.services.handlers.wine_summary_handler import handle_cached_wine_summary, handle_summary_once
+from app.utils.normalize import join_wine_name
+
+logger = logging.getLogger(__name__)
+
+WARM_TOP_N = int(os.getenv("WARM_TOP_N", 20))
+WARM_LOOKBACK_DAYS = int(os.getenv("WARM_LOOKBACK_DAYS", 7))
+WARM_MIN_INTERVAL_SECONDS = float(os.getenv("WARM_MIN_INTERVAL_SECONDS", 10))   # gap between uncached pipeline runs
+WARM_ON_STARTUP = os.getenv("WARM_ON_STARTUP", "false").lower() == "true"
+WARM_STARTUP_DELAY_SECONDS = float(os.getenv("WARM_STARTUP_DELAY_SECONDS", 60))
+
+async def popular_wine_names(session, top_n: int = WARM_TOP_N, lookback_days: int = WARM_LOOKBACK_DAYS) -> list[str]:
+    since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    rows = await get_popular_wines(session, since, limit=top_n)
+    return [join_wine_name(winery, wine, vintage) for winery, wine, vintage, _ in rows]
+
+class CacheWarmer:
+    """
+    Pre-compute summaries and food pairings for the most requested wines through the
+    normal handlers, so the first users after a deploy or cache wipe don't pay for them.
+
+    Runs one wine at a time and waits min_interval seconds after every step that had to
+    run the pipeline; wines already stored cost only a DB lookup.
+    """
+
+    def __init__(self, min_interval: float = WARM_MIN_INTERVAL_SECONDS, session_factory=async_session):
+        self.min_interval = min_interval
+        self.session_factory = session_factory
+        self._last_run = 0.0
+
+    async def _throttle(self) -> None:
+        wait = self._last_run + self.min_interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_run = time.monotonic()
+
+    async def warm_summary(self, session, wine_name: str) -> str:
+        request = WineMCPRequest(
+            input={"query": wine_name},
+            context=MCPContext(model="cache-warmer", timestamp=datetime.now(timezone.utc))
+        )
+        if await handle_cached_wine_summary(session, wine_name, request):
+            return "cached"
+
+        await self._throttle()
+        result = await handle_summary_once(session, wine_name, wine_name, request)
+        return "warmed" if result.get("status") == "analyzed" else "failed"
+
+    async def warm_pairings(self, session, wine_name: str) -> str:
+        cached, wine = await handle_cached_pairings(session, wine_name)
+        if cached:
+            return "cached"
+        if wine is None:
+            return "skipped"
+
+        await self._throttle()
+        result = await handle_food_pairing(session, wine_name, wine)
+        return "failed" if result.get("status") == "error" else "warmed"
+
+    async def run(self, top_n: int = WARM_TOP_N, lookback_days: int = WARM_LOOKBACK_DAYS, pairings: bool = True) -> dict:
+        steps = [("summaries", self.warm_summary)]
+        if pairings:
+            steps.append(("pairings", self.warm_pairings))
+        report = {kind: {} for kind, _ in steps}
+        started = time.perf_counter()
+
+        async with self.session_factory() as session:
+            names = await popular_wine_names(session, top_n, lookback_days)
+            logger.info(f"[WARM] Warming {len(names)} popular wines from the last {lookback_days} days")
+
+            for name in names:
+                for kind, warm in steps:
+                    try:
+                        outcome = await warm(session, name)
+                    except Exception as e:
+                        logger.error(f"[WARM] Failed to warm {kind} for '{name}': {e}")
+                        await session.rollback()
+                        outcome = "failed"
+                    report[kind][outcome] = report[kind].get(outcome, 0) + 1
+
+        report["wines"] = len(names)
+        report["seconds"] = round(time.perf_counter() - started, 1)
+        logger.info(f"[WARM] Done: {report}")
+        return report
+
+async def warm_on_startup(delay_seconds: float = WARM_STARTUP_DELAY_SECONDS) -> None:
+    """
+    Startup hook: wait for the app to settle, then warm in the background. Never raises.
+    """
+    await asyncio.sleep(delay_seconds)
+    try:
+        await CacheWarmer().run()
+    except Exception as e:
+        logger.error(f"[WARM] Startup warming failed: {e}")
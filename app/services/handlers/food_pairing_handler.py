@@ -5,17 +5,23 @@ from app.models.mcp_model import FoodPairingMCPOutput, FoodPairingCategory
 from app.prompts.food_pairing_prompt import generate_food_pairing_prompt
 from app.services.embedding.food_classifier import find_base_category
 from app.services.llm.gemini_engine import call_gemini_sync_with_retry
+from app.services.llm.tasks import LLMTask
 from app.utils.llm_parsing import parse_json_from_text
+from app.utils.metrics import lookup_metrics
 from pydantic import ValidationError
 from typing import Optional
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 async def handle_cached_pairings(session, wine_name: str) -> tuple[dict | None, object | None]:
+    start = time.perf_counter()
     wine, categories = await get_wine_and_pairings(session, wine_name)
+    hit = bool(wine and wine.food_pairing_categories)
+    lookup_metrics.record("db_pairing", hit, time.perf_counter() - start)
 
-    if wine and wine.food_pairing_categories:
+    if hit:
         return {
             "status": "cached",
             "input": {"wine_name": wine_name},
@@ -40,7 +46,7 @@ async def handle_food_pairing(session, wine_name: str, wine: Optional[WineSummar
     prompt = generate_food_pairing_prompt(profile)
 
     try:
-        raw_text = call_gemini_sync_with_retry(prompt)
+        raw_text = call_gemini_sync_with_retry(prompt, LLMTask.FOOD_PAIRING)
         logger.info(f"Gemini raw output:\n{raw_text}")
         parsed = parse_json_from_text(raw_text)
         if not isinstance(parsed, list):
@@ -1,14 +1,19 @@
 from fastapi import UploadFile
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from typing import Dict, Any
 
 from app.services.image.image_validator import validate_image_file, sanitize_filename, ImageValidationError
 from app.services.image.image_processor import ImageProcessor
+from app.services.image.perceptual_hash import compute_perceptual_hash, find_near_duplicate, label_image_index
 from app.services.vision.gemini_vision import GeminiVisionAnalyzer
-from app.services.handlers.wine_summary_handler import handle_fresh_summary
+from app.services.handlers.wine_summary_handler import handle_summary_once
 from app.models.mcp_model import WineImageMCPRequest, ImageAnalysisResult
 from app.exceptions import GeminiApiError
+from app.config import LABEL_CACHE_MIN_CONFIDENCE
+from app.utils.cache import cache, generate_image_hash
+from app.utils.progress import report_stage
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +52,7 @@ async def handle_image_analysis(
             }
         
         # Step 2: Process image for analysis
+        report_stage("processing_image")
         processor = ImageProcessor()
         try:
             base64_image, image_metadata = processor.process_for_analysis(file_content)
@@ -58,6 +64,7 @@ async def handle_image_analysis(
             }
         
         # Step 3: Analyze with Gemini Vision (or use mock if enabled)
+        report_stage("extracting_info")
         use_mock = request.context.use_mock if hasattr(request.context, 'use_mock') else False
         
         if use_mock:
@@ -74,6 +81,18 @@ async def handle_image_analysis(
                 "analysis_method": "mock_response"
             }
         else:
+            # Reuse the label reading of this photo, or a near-identical one, if we have it
+            image_hash = generate_image_hash(file_content)
+            perceptual_hash = compute_perceptual_hash(file_content)
+            vision_result = (
+                cache.get("label", image_hash)
+                or find_near_duplicate(label_image_index, "label", perceptual_hash)
+            )
+            if vision_result is not None:
+                vision_result = {**vision_result, "image_metadata": image_metadata}
+
+        fresh_reading = not use_mock and vision_result is None
+        if fresh_reading:
             vision_analyzer = GeminiVisionAnalyzer()
             try:
                 vision_result = vision_analyzer.analyze_wine_label(base64_image, image_metadata)
@@ -86,6 +105,12 @@ async def handle_image_analysis(
         
         # Step 4: Extract wine information and create query
         wine_info = extract_wine_query_from_vision(vision_result)
+
+        # Only confident, fully parsed readings are reused for later uploads
+        if fresh_reading and is_reusable_label_reading(vision_result, wine_info):
+            cache.set("label", image_hash, vision_result)
+            if perceptual_hash is not None:
+                label_image_index.add(perceptual_hash, image_hash)
         
         if not wine_info["wine_query"]:
             return {
@@ -98,13 +123,14 @@ async def handle_image_analysis(
         
         # Create a mock request for the wine analysis pipeline
         from app.models.mcp_model import WineMCPRequest
+        # exact: the label was read as a name, so a close match is never offered as did_you_mean
         wine_request = WineMCPRequest(
-            input={"query": wine_info["wine_query"]},
+            input={"query": wine_info["wine_query"], "exact": True},
             context=request.context
         )
         
-        # Use the existing wine analysis pipeline
-        wine_analysis = await handle_fresh_summary(
+        # Use the existing wine analysis pipeline (deduplicated per wine)
+        wine_analysis = await handle_summary_once(
             session, 
             wine_info["wine_query"], 
             wine_info['wine_query'], 
@@ -112,11 +138,21 @@ async def handle_image_analysis(
         )
         
         # Add image analysis metadata to the response
-        if wine_analysis.get("status") == "success" and "output" in wine_analysis:
-            wine_analysis["output"]["image_analysis"] = {
-                "extracted_info": vision_result,
-                "confidence": vision_result.get("confidence", 0),
-                "analysis_method": "gemini_vision"
+        if wine_analysis.get("status") == "analyzed" and "output" in wine_analysis:
+            # Output is a WineMCPOutput model and may be shared with concurrent requests, so copy it
+            output = wine_analysis["output"]
+            if isinstance(output, BaseModel):
+                output = output.model_dump()
+            wine_analysis = {
+                **wine_analysis,
+                "output": {
+                    **output,
+                    "image_analysis": {
+                        "extracted_info": vision_result,
+                        "confidence": vision_result.get("confidence", 0),
+                        "analysis_method": "gemini_vision"
+                    }
+                }
             }
         
         return wine_analysis
@@ -128,6 +164,19 @@ async def handle_image_analysis(
             "error": f"Analysis failed: {str(e)}"
         }
 
+def is_reusable_label_reading(vision_result: Dict[str, Any], wine_info: Dict[str, str]) -> bool:
+    """
+    True when a label reading is worth caching: Gemini returned parseable JSON,
+    it yields a wine query and its confidence is at least LABEL_CACHE_MIN_CONFIDENCE.
+    """
+    if "raw_output" in vision_result or vision_result.get("parsing_method") == "text_fallback":
+        return False
+    try:
+        confidence = float(vision_result.get("confidence", 0))
+    except (TypeError, ValueError):
+        return False
+    return bool(wine_info["wine_query"]) and confidence >= LABEL_CACHE_MIN_CONFIDENCE
+
 def extract_wine_query_from_vision(vision_result: Dict[str, Any]) -> Dict[str, str]:
     """
     Extract a searchable wine query from vision analysis result.
@@ -4,9 +4,10 @@ from typing import Dict, Any
 from fastapi import UploadFile
 from app.services.image.image_validator import validate_image_file
 from app.services.image.image_processor import ImageProcessor
+from app.services.image.perceptual_hash import compute_perceptual_hash, find_near_duplicate, menu_image_index
 from app.services.vision.gemini_vision import GeminiVisionAnalyzer
 from app.services.pairing.wine_recommender import WineRecommender
-from app.utils.cache import cache_menu_analysis, get_cached_menu_analysis, generate_image_hash
+from app.utils.cache import cache, generate_image_hash
 from app.exceptions import GeminiApiError, ImageValidationError
 from app.models.mcp_model import MenuMCPRequest, FoodTextRequest
 
@@ -55,10 +56,16 @@ async def handle_menu_analysis(file: UploadFile, request: MenuMCPRequest) -> Dic
         logger.info(f"Generated image hash: {image_hash}")
         
         # Step 2: Check cache for existing menu analysis
-        cached_result = get_cached_menu_analysis(image_hash)
+        cached_result = cache.get("menu", image_hash)
         if cached_result:
             logger.info("Using cached menu analysis result")
             return cached_result
+
+        # A re-taken photo of a recently analyzed menu reuses that analysis
+        perceptual_hash = compute_perceptual_hash(file_content)
+        cached_result = find_near_duplicate(menu_image_index, "menu", perceptual_hash)
+        if cached_result:
+            return cached_result
         
         # Step 3: Process image for analysis
         image_processor = ImageProcessor()
@@ -183,7 +190,9 @@ async def handle_menu_analysis(file: UploadFile, request: MenuMCPRequest) -> Dic
         }
         
         # Step 7: Cache the results
-        cache_menu_analysis(image_hash, final_result, ttl_minutes=15)
+        cache.set("menu", image_hash, final_result, ttl_seconds=15 * 60)
+        if perceptual_hash is not None:
+            menu_image_index.add(perceptual_hash, image_hash)
         
         return final_result
         
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable
+from fastapi.encoders import jsonable_encoder
+from app.utils.progress import ProgressReporter, set_progress_reporter, reset_progress_reporter
+
+logger = logging.getLogger(__name__)
+
+# Comment lines sent while a stage is running, keeps proxies from dropping idle connections
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", 10))
+
+def format_sse(event: str, data: Any) -> str:
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+async def stream_analysis(
+    run: Callable[[], Awaitable[dict]],
+    heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS
+) -> AsyncIterator[str]:
+    """
+    Run an analysis pipeline and yield Server-Sent Events as it progresses.
+
+    Emits `stage` events (stage name plus timings) while the pipeline runs,
+    then a final `result` event carrying the same payload as the non-streaming endpoint.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    reporter = ProgressReporter(queue)
+
+    async def runner():
+        token = set_progress_reporter(reporter)
+        try:
+            result = await run()
+        except Exception:
+            logger.exception("Streamed analysis failed.")
+            result = {
+                "status": "error",
+                "error": "Something went wrong while analyzing the wine. Please try again later."
+            }
+        finally:
+            reset_progress_reporter(token)
+
+        reporter.stage("completed")
+        queue.put_nowait(("result", {**result, "timings": reporter.finish()}))
+
+    task = asyncio.create_task(runner())
+    try:
+        yield ": stream opened\n\n"
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_sse(event, data)
+            if event == "result":
+                break
+    finally:
+        # Client went away before the result: stop the pipeline
+        if not task.done():
+            task.cancel()
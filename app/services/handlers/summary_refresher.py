@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from app.db.crud.wine_summary import get_wine_summary_by_name, refresh_wine_summary
+from app.db.locks import try_acquire_lease, release_lease
+from app.db.session import async_session
+from app.services.llm.search_and_summarize import summarize_wine_info
+from app.utils.normalize import canonical_wine_key
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FRESHNESS_DAYS = float(os.getenv("SUMMARY_FRESHNESS_DAYS", 30))
+SUMMARY_REFRESH_CONCURRENCY = int(os.getenv("SUMMARY_REFRESH_CONCURRENCY", 2))
+SUMMARY_REFRESH_MAX_PENDING = int(os.getenv("SUMMARY_REFRESH_MAX_PENDING", 50))
+SUMMARY_REFRESH_RETRY_SECONDS = 3600    # wait before retrying a wine whose refresh failed
+
+class SummaryRefresher:
+    """
+    Stale-while-revalidate for stored wine summaries.
+
+    Requests always get the stored summary. When it is older than the freshness window,
+    a background task re-summarizes the wine and overwrites the row. At most `concurrency`
+    refreshes run at once, each wine is queued once, and the summary lease keeps
+    instances from refreshing the same wine twice.
+    """
+
+    def __init__(
+        self,
+        freshness: timedelta = timedelta(days=SUMMARY_FRESHNESS_DAYS),
+        concurrency: int = SUMMARY_REFRESH_CONCURRENCY,
+        max_pending: int = SUMMARY_REFRESH_MAX_PENDING,
+        retry_seconds: float = SUMMARY_REFRESH_RETRY_SECONDS,
+        session_factory=async_session,
+    ):
+        self.freshness = freshness
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.retry_seconds = retry_seconds
+        self.session_factory = session_factory
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._failed_at: dict[str, float] = {}
+        self.scheduled = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def is_stale(self, summary) -> bool:
+        stamp = summary.refreshed_at or summary.created_at
+        if stamp is None:
+            return True
+        if stamp.tzinfo is None:
+            stamp = stamp.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - stamp > self.freshness
+
+    def maybe_schedule(self, summary) -> bool:
+        """
+        Queue a background refresh if summary is stale. Never blocks the caller.
+        Returns True if a refresh was scheduled.
+        """
+        if not self.is_stale(summary):
+            return False
+
+        key = canonical_wine_key(summary.wine)
+        if key in self._tasks:
+            return False
+
+        failed_at = self._failed_at.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < self.retry_seconds:
+            return False
+
+        if len(self._tasks) >= self.max_pending:
+            logger.info(f"[REFRESH] Queue full ({self.max_pending}), not refreshing '{summary.wine}' this time")
+            self.skipped += 1
+            return False
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        # Fresh context so the refresh never reports progress into the request's stream
+        task = asyncio.create_task(self._refresh(key, summary.wine), context=contextvars.Context())
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        self.scheduled += 1
+        logger.info(f"[REFRESH] Scheduled refresh of stale summary: '{summary.wine}'")
+        return True
+
+    async def _refresh(self, key: str, wine_name: str) -> None:
+        async with self._semaphore:
+            try:
+                if await self._run(key, wine_name):
+                    self.refreshed += 1
+                    self._failed_at.pop(key, None)
+                else:
+                    self.skipped += 1
+            except Exception as e:
+                logger.error(f"[REFRESH] Failed to refresh '{wine_name}': {e}")
+                self.failed += 1
+                self._failed_at[key] = time.monotonic()
+
+    async def _run(self, key: str, wine_name: str) -> bool:
+        # Imported here: the handler module imports this one
+        from app.services.handlers.wine_summary_handler import prepare_summary, SUMMARY_LEASE_SECONDS
+
+        async with self.session_factory() as session:
+            holder = uuid.uuid4().hex
+            try:
+                if not await try_acquire_lease(session, key, holder, SUMMARY_LEASE_SECONDS):
+                    logger.info(f"[REFRESH] '{wine_name}' is being summarized elsewhere, skipping")
+                    return False
+            except Exception as e:
+                logger.warning(f"[REFRESH] Summary lease unavailable for '{key}', continuing without it: {e}")
+                await session.rollback()
+                holder = None
+
+            try:
+                # Another instance may have refreshed it since the request read it
+                current = await get_wine_summary_by_name(session, wine_name)
+                await session.commit()      # don't hold a transaction open through the pipeline
+                if current is None or not self.is_stale(current):
+                    return False
+
+                started = time.perf_counter()
+                summary, error = prepare_summary(await summarize_wine_info(current.wine))
+                if error:
+                    raise RuntimeError(error)
+
+                # Keep the stored name, it's what lookups match on
+                summary.pop("wine", None)
+                await refresh_wine_summary(session, current.id, summary)
+                logger.info(f"[REFRESH] Refreshed '{current.wine}' in {time.perf_counter() - started:.1f}s")
+                return True
+            finally:
+                if holder:
+                    try:
+                        await release_lease(session, key, holder)
+                    except Exception as e:
+                        logger.warning(f"[REFRESH] Failed to release summary lease for '{key}': {e}")
+
+    def stats(self) -> dict:
+        return {
+            "freshness_days": self.freshness.total_seconds() / 86400,
+            "concurrency": self.concurrency,
+            "pending": sorted(self._tasks),
+            "scheduled": self.scheduled,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+summary_refresher = SummaryRefresher()
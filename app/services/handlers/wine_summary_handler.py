@@ -1,44 +1,83 @@
-from app.db.crud.wine_summary import get_wine_summary_by_name, save_wine_summary
+from app.db.crud.wine_summary import get_wine_summary_by_name, save_wine_summary, search_similar_wines
+from app.db.locks import try_acquire_lease, release_lease
+from app.db.session import async_session
+from app.db.usage_recorder import usage_recorder
 from app.models.mcp_model import WineMCPOutput
 from app.services.llm.gemini_engine import parse_wine_query_with_gemini
+from app.services.llm.query_memo import query_memo
 from app.services.llm.search_and_summarize import summarize_wine_info
+from app.services.handlers.summary_refresher import summary_refresher
+from app.services.rules.local_query_parser import local_query_parser, split_vintage
 from app.services.rules.sat_analyzer import analyze_wine_profile
+from app.utils.metrics import lookup_metrics
 from app.utils.mock import generate_mock_summary
-from app.utils.normalize import to_title_case_wine_name
+from app.utils.progress import report_stage
+from app.utils.normalize import to_title_case_wine_name, canonical_wine_key, join_wine_name, strip_accents, edit_distance
+from app.utils.single_flight import SingleFlight
 from pydantic import ValidationError
+import asyncio
 import json
 import logging
+import os
 import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Cross-instance wait for another instance already summarizing the same wine
+SUMMARY_LOCK_WAIT_SECONDS = float(os.getenv("SUMMARY_LOCK_WAIT_SECONDS", 30))
+SUMMARY_LOCK_POLL_SECONDS = 0.5
+# Longer than a pipeline run; a crashed holder's lease expires after this
+SUMMARY_LEASE_SECONDS = float(os.getenv("SUMMARY_LEASE_SECONDS", 120))
+
+# Trigram similarity above which a stored summary is offered instead of running the pipeline
+FUZZY_MATCH_MIN_SIMILARITY = float(os.getenv("FUZZY_MATCH_MIN_SIMILARITY", 0.7))
+# Served without asking only when the names differ by at most this many edits (after accent folding)
+FUZZY_MATCH_MAX_EDITS = int(os.getenv("FUZZY_MATCH_MAX_EDITS", 2))
+
+# In-process dedup of concurrent summaries, keyed on canonical wine name
+_summary_flight = SingleFlight()
+
 EXPECTED_SUMMARY_KEYS = {
     "wine", "region", "grape_varieties", "appearance", "nose", "palate", "aging",
     "average_price", "quality", "analysis", "reference_source"
 }
 
-async def handle_wine_analysis_query(request):
+async def handle_wine_analysis_query(request, session=None):
     # Grab user's free-text query
     query = request.input.get("query", "").strip()
     if not query:
         return {"status": "error", "error": "Query is empty."}
 
     logger.info(f"Query received: '{query}'")
+    report_stage("parsing_query")
+
+    # Fast path: resolve wines already stored in DB without an LLM round trip
+    result = await local_query_parser.parse(session, query) if session is not None else None
+
+    # Then a query parsed by Gemini before (same prompt version)
+    if result is None and session is not None:
+        result = await query_memo.get(session, query)
+
+    parsed_by_llm = result is None
+    if parsed_by_llm:
+        t0 = time.perf_counter()
+        result = parse_wine_query_with_gemini(query)
+        local_query_parser.record_llm_parse(time.perf_counter() - t0)
 
-    result = parse_wine_query_with_gemini(query)
     winery, wine, vintage = result["winery"], result["wine_name"], result["vintage"]
     logger.info(f"Parsed wine info - winery: {winery}, wine: {wine}, vintage: {vintage}")
 
-    wine_name = ""
-    if wine.casefold() in winery.casefold():
-        wine_name = f"{winery} {vintage}"
-    elif winery.casefold() in wine.casefold():
-        wine_name = f"{wine} {vintage}"
-    else:
-        wine_name = f"{winery} {wine} {vintage}"
+    wine_name = result.get("matched_wine") or join_wine_name(winery, wine, vintage)
+
+    if parsed_by_llm and session is not None:
+        await query_memo.put(session, query, result, wine_name)
+
+    # Popularity for the cache warmer, counted whichever parser resolved the query
+    usage_recorder.wine_requested(canonical_wine_key(wine_name), winery, wine, vintage)
 
     return {
-        "wine_name": wine_name.strip(),
+        "wine_name": wine_name,
         "parsed_winery": winery,
         "parsed_wine": wine,
         "parsed_vinage": vintage,
@@ -55,8 +94,12 @@ async def handle_mock_response(request):
     }
 
 async def handle_cached_wine_summary(session, wine_name, request):
+    start = time.perf_counter()
     existing = await get_wine_summary_by_name(session, wine_name)
+    lookup_metrics.record("db_summary", existing is not None, time.perf_counter() - start)
     if existing:
+        # Serve the stored summary now, re-summarize in the background if it's past the freshness window
+        summary_refresher.maybe_schedule(existing)
         return {
             "status": "analyzed",
             "input": request.input,
@@ -65,6 +108,60 @@ async def handle_cached_wine_summary(session, wine_name, request):
         }
     return None
 
+def is_spelling_variant(wine_name: str, stored_name: str) -> bool:
+    """
+    True when two names differ only by case, accents, spacing or a couple of typos.
+    Example: 'Chateau Leoville Barton 2010' and 'Château Léoville-Barton 2010'
+    """
+    a = canonical_wine_key(strip_accents(wine_name))
+    b = canonical_wine_key(strip_accents(stored_name))
+    return a == b or edit_distance(a, b) <= FUZZY_MATCH_MAX_EDITS
+
+async def handle_similar_wine_summary(session, wine_name, request):
+    """
+    Look for a stored summary under a near-identical wine name before starting the search pipeline.
+    Spelling variants are served directly; other close matches (often a sibling cuvée of the
+    same winery) are returned as a did_you_mean suggestion for the client to confirm.
+    Sending input "exact": true skips the suggestion and analyzes the name as given.
+    """
+    try:
+        # Savepoint: a failed lookup must not end the transaction we are in
+        async with session.begin_nested():
+            matches = await search_similar_wines(session, wine_name, limit=1, min_similarity=FUZZY_MATCH_MIN_SIMILARITY)
+    except Exception as e:
+        logger.warning(f"Fuzzy wine lookup failed for '{wine_name}': {e}")
+        return None
+
+    if not matches:
+        return None
+
+    existing, similarity = matches[0]
+    if split_vintage(existing.wine)[1] != split_vintage(wine_name)[1]:
+        logger.info(f"Similar wine '{existing.wine}' ({similarity:.2f}) has a different vintage, not reusing it")
+        return None
+
+    match = {"wine": existing.wine, "similarity": round(similarity, 3)}
+    if not is_spelling_variant(wine_name, existing.wine):
+        if request.input.get("exact"):
+            return None
+        logger.info(f"Suggesting '{existing.wine}' for '{wine_name}' (similarity {similarity:.2f})")
+        return {
+            "status": "did_you_mean",
+            "input": request.input,
+            "did_you_mean": match,
+            "context": request.context.model_dump()
+        }
+
+    logger.info(f"Reusing stored summary of '{existing.wine}' for '{wine_name}' (similarity {similarity:.2f})")
+    summary_refresher.maybe_schedule(existing)
+    return {
+        "status": "analyzed",
+        "input": request.input,
+        "output": WineMCPOutput(**existing.to_dict()),
+        "context": request.context.model_dump(),
+        "matched": match
+    }
+
 async def handle_invalid_summary(summary, request, error_message: str = "An unknown error occurred"):
     return {
         "status": "error",
@@ -73,27 +170,19 @@ async def handle_invalid_summary(summary, request, error_message: str = "An unkn
         "context": request.context.model_dump()
     }
 
-async def handle_fresh_summary(session, wine_name, query, request):
-    try:
-        summary = await summarize_wine_info(wine_name)
-    except Exception as e:
-        logger.error(f"Error during wine summary: {e}")
-        return await handle_invalid_summary(
-            {"error": "Failed to summarize wine information. Please try again later."},
-            request
-        )
-
+def prepare_summary(summary: dict) -> tuple[dict | None, str | None]:
+    """
+    Validate a generated summary and add the rule-based SAT analysis.
+    Returns (record ready to store, None) or (None, error message).
+    """
     if "error" in summary:
         logger.error(f"Summarization returned error: {summary['error']}")
-        return await handle_invalid_summary(summary, request)
+        return None, summary["error"]
 
     missing_keys = EXPECTED_SUMMARY_KEYS - summary.keys()
     if missing_keys:
         logger.error(f"Missing key attributes from Gemini summary: {missing_keys}")
-        return await handle_invalid_summary(
-            {"error": "Incomplete wine analysis generated. Please retry."},
-            request
-        )
+        return None, "Incomplete wine analysis generated. Please retry."
 
     # Ensure 'region' is not None before saving, default to "Unknown" if it is.
     # An empty string "" is acceptable.
@@ -101,22 +190,39 @@ async def handle_fresh_summary(session, wine_name, query, request):
         summary['region'] = "Unknown"
 
     # SAT Rule-based analysis
-    sat_result = analyze_wine_profile(summary)
-    summary["sat"] = sat_result
-
-    # Save to DB
-    logger.info(f"Saving to DB: '{wine_name}'")
+    summary["sat"] = analyze_wine_profile(summary)
 
     summary_cleaned = summary.copy()   # Before changing schema, don't save aroma column to DB since it's in sat 
     summary_cleaned.pop("aroma", None)
+    return summary_cleaned, None
+
+async def handle_fresh_summary(session, wine_name, query, request):
+    try:
+        summary = await summarize_wine_info(wine_name)
+    except Exception as e:
+        logger.error(f"Error during wine summary: {e}")
+        return await handle_invalid_summary(
+            {"error": "Failed to summarize wine information. Please try again later."},
+            request
+        )
+
+    report_stage("finalizing_results")
+    summary_cleaned, error = prepare_summary(summary)
+    if error:
+        return await handle_invalid_summary({"error": error}, request)
+
+    # Save to DB
+    logger.info(f"Saving to DB: '{wine_name}'")
 
     try:
         await save_wine_summary(session, {
             **summary_cleaned,
             "query_text": query
         })
+        local_query_parser.add_name(summary_cleaned["wine"])
     except Exception as e:
         logger.error(f"Failed to save summary to DB: {e}")
+        await session.rollback()    # e.g. wine_key taken by a concurrent save, keep the session usable
         # Non-blocking, still return successful response
 
     return {
@@ -125,3 +231,85 @@ async def handle_fresh_summary(session, wine_name, query, request):
         "output": WineMCPOutput(**summary_cleaned),
         "context": request.context.model_dump() # Ensure dict for JSON serialization
     }
+
+async def acquire_summary_lock(key: str) -> str | None:
+    """
+    Poll for the summary lease on key, so only one instance runs the pipeline for a wine.
+    Returns the holder id to release it with, or None (proceed without it) on timeout or
+    if the lease table is unavailable. Uses its own short session, the caller's is untouched.
+    """
+    holder = uuid.uuid4().hex
+    deadline = time.monotonic() + SUMMARY_LOCK_WAIT_SECONDS
+    async with async_session() as session:
+        while True:
+            try:
+                if await try_acquire_lease(session, key, holder, SUMMARY_LEASE_SECONDS):
+                    return holder
+            except Exception as e:
+                logger.warning(f"Summary lease unavailable for '{key}', continuing without it: {e}")
+                return None
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting {SUMMARY_LOCK_WAIT_SECONDS}s for summary lease: '{key}'")
+                return None
+
+            await asyncio.sleep(SUMMARY_LOCK_POLL_SECONDS)
+
+async def release_summary_lock(key: str, holder: str) -> None:
+    try:
+        async with async_session() as session:
+            await release_lease(session, key, holder)
+    except Exception as e:
+        # The lease expires on its own
+        logger.warning(f"Failed to release summary lease for '{key}': {e}")
+
+async def _lead_fresh_summary(session, key: str, wine_name, query, request):
+    """
+    Re-check the DB under the summary lease, then run the fresh summary pipeline.
+    Commits the caller's session before the pipeline so no pooled connection is held
+    during search + LLM: callers must not leave uncommitted work on it.
+    """
+    holder = await acquire_summary_lock(key)
+    try:
+        # Another instance may have saved this wine while we were waiting for the lease
+        cached = await handle_cached_wine_summary(session, wine_name, request)
+        if cached:
+            logger.info(f"Summary for '{wine_name}' was stored by another worker.")
+            return cached
+
+        # Or under a slightly different spelling of the same wine
+        similar = await handle_similar_wine_summary(session, wine_name, request)
+        if similar:
+            return similar
+
+        # End the read transaction, no pooled connection is held during search + LLM
+        await session.commit()
+        return await handle_fresh_summary(session, wine_name, query, request)
+    finally:
+        if holder:
+            await release_summary_lock(key, holder)
+
+async def handle_summary_once(session, wine_name, query, request):
+    """
+    Run the fresh summary pipeline at most once per wine across concurrent requests.
+    Followers wait for the leader's result and get it back with their own input/context.
+    The leader commits session before the pipeline runs, see _lead_fresh_summary.
+    """
+    key = canonical_wine_key(wine_name)
+    # An exact request must not be handed a did_you_mean from a concurrent non-exact one
+    flight_key = f"{key}|exact" if request.input.get("exact") else key
+    result, shared = await _summary_flight.do(
+        flight_key,
+        lambda: _lead_fresh_summary(session, key, wine_name, query, request)
+    )
+
+    if shared:
+        logger.info(f"Reusing in-flight summary result for '{wine_name}'")
+        return {
+            **result,
+            "input": request.input,
+            "context": request.context.model_dump()
+        }
+
+    return result
+
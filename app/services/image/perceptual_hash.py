@@ -0,0 +1,135 @@
+import io
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+from PIL import Image, ImageOps
+from app.config import IMAGE_HASH_SIZE, IMAGE_NEAR_DUPLICATE_DISTANCE
+from app.utils.cache import cache
+
+logger = logging.getLogger(__name__)
+
+def dhash(image_bytes: bytes, hash_size: int = IMAGE_HASH_SIZE) -> int:
+    """
+    Difference hash of the downscaled grayscale image: one bit per horizontally adjacent
+    pixel pair. Re-taken photos, re-encodes and resizes of the same image land a few bits apart.
+    """
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+    pixels = list(image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS).getdata())
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+class BKTree:
+    """
+    Burkhard-Keller tree over Hamming distance: finds every hash within max_distance
+    of a query without comparing against all stored hashes.
+    """
+
+    def __init__(self):
+        self._root: Optional[list] = None     # [hash, value, {distance: child}]
+        self.size = 0
+
+    def add(self, hash_value: int, value) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [hash_value, value, {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(hash_value, node[0])
+            if distance == 0:
+                node[1] = value
+                self.size -= 1
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, value, {}]
+                return
+            node = child
+
+    def search(self, hash_value: int, max_distance: int) -> list[tuple[int, object]]:
+        """
+        (distance, value) of every entry within max_distance, closest first.
+        """
+        if self._root is None:
+            return []
+
+        matches, stack = [], [self._root]
+        while stack:
+            node_hash, value, children = stack.pop()
+            distance = hamming(hash_value, node_hash)
+            if distance <= max_distance:
+                matches.append((distance, value))
+            # Triangle inequality: only subtrees in [d - max, d + max] can hold matches
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(matches, key=lambda match: match[0])
+
+class NearDuplicateIndex:
+    """
+    Recent image hashes → cache key, for reusing results of near-identical uploads.
+
+    BK-trees don't support deletion, so when the index exceeds max_entries the oldest
+    half is dropped and the tree rebuilt. In-process only; the results themselves live
+    in the tiered cache and expire there.
+    """
+
+    def __init__(self, max_distance: int, max_entries: int = 2048):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, str] = OrderedDict()
+        self._tree = BKTree()
+
+    def add(self, hash_value: int, key: str) -> None:
+        with self._lock:
+            self._entries[hash_value] = key
+            self._entries.move_to_end(hash_value)
+            self._tree.add(hash_value, key)
+            if len(self._entries) > self.max_entries:
+                for _ in range(len(self._entries) // 2):
+                    self._entries.popitem(last=False)
+                self._tree = BKTree()
+                for stored_hash, stored_key in self._entries.items():
+                    self._tree.add(stored_hash, stored_key)
+
+    def find(self, hash_value: int) -> Optional[tuple[str, int]]:
+        """
+        (cache key, distance) of the closest stored image within max_distance, or None.
+        """
+        with self._lock:
+            matches = self._tree.search(hash_value, self.max_distance)
+        return (matches[0][1], matches[0][0]) if matches else None
+
+def compute_perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    try:
+        return dhash(image_bytes)
+    except Exception as e:
+        logger.warning(f"Perceptual hash failed, near-duplicate lookup skipped: {e}")
+        return None
+
+def find_near_duplicate(index: NearDuplicateIndex, namespace: str, hash_value: Optional[int]):
+    """
+    Cached result of the closest recent image within the index's distance, or None.
+    """
+    if hash_value is None or (match := index.find(hash_value)) is None:
+        return None
+
+    key, distance = match
+    cached = cache.get(namespace, key)
+    if cached is not None:
+        logger.info(f"Reusing {namespace} result of near-duplicate image {key} (distance {distance})")
+    return cached
+
+menu_image_index = NearDuplicateIndex(IMAGE_NEAR_DUPLICATE_DISTANCE["menu"])
+label_image_index = NearDuplicateIndex(IMAGE_NEAR_DUPLICATE_DISTANCE["label"])
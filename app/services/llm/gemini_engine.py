@@ -2,39 +2,73 @@ import google.generativeai as genai
 import logging
 import os
 import time
+from typing import Callable, Optional
 from app.exceptions import GeminiApiError
 from app.constants.aroma_lexicons import AROMA_LEXICONS
-from app.utils.env import setup_gemini_env
+from app.utils.env import get_gemini_model
+from app.services.llm.response_cache import llm_response_cache, llm_cache_key, response_token_count
+from app.services.llm.tasks import LLMTask, TASK_PROFILES, task_latency
 from app.utils.llm_parsing import parse_json_from_text
 from app.prompts.wine_prompts import get_sat_prompt, get_wine_from_query_prompt
 
 logger = logging.getLogger(__name__)
 
+def generate_for_task(task: LLMTask, contents, model=None):
+    """
+    Single Gemini call with the task's model, generation config and timeout.
+    contents is a prompt string or a [prompt, image] list for vision tasks.
+    """
+    profile = TASK_PROFILES[task]
+    if model is None:
+        model = get_gemini_model(profile.model)
+
+    start = time.perf_counter()
+    try:
+        response = model.generate_content(
+            contents,
+            generation_config=profile.generation_config(),
+            request_options={"timeout": profile.timeout_seconds}
+        )
+    except Exception:
+        task_latency.record(task, time.perf_counter() - start, ok=False)
+        raise
+
+    duration = time.perf_counter() - start
+    task_latency.record(task, duration)
+    logger.info(f"[LLM] {task.value} on {profile.model} in {duration:.2f}s")
+    return response
+
 def call_gemini_sync_with_retry(
     prompt: str,
-    temperature: float = 0.7,
+    task: LLMTask = LLMTask.GENERAL,
     max_retries: int = 3,  # Reduced from 5 to 3 for faster failure recovery
     delay_seconds: float = 1.0,  # Reduced from 2.0s to 1.0s
-    model=None  # Accept pre-configured model for efficiency
+    model=None,  # Accept pre-configured model for efficiency
+    validate: Optional[Callable[[str], bool]] = None
 ) -> str:
     """
     Call Gemini synchronously using the GenerativeAI client.
-    Temperature: 0 (more factual) - 1.0 (exploratory)
+    Model, temperature, output cap and timeout come from the task's GenerationProfile.
+
+    For cached tasks, a fresh response is stored only when validate(text) is true,
+    so output the caller cannot parse is never replayed from the cache.
     """
-    if model is None:
-        _, _, model = setup_gemini_env()
-    
+    profile = TASK_PROFILES[task]
+
+    cache_ttl = llm_response_cache.ttl_for(task.value)
+    if cache_ttl:
+        cache_key = llm_cache_key(profile.model, prompt, profile.generation_config())
+        cached = llm_response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     for attempt in range(1, max_retries + 1):
         try:
-            # Configure generation for batch wine recommendation processing
-            config = {"temperature": temperature}
-            
-            # For wine pairing prompts (detected by keywords), use larger token limits
-            if any(keyword in prompt.lower() for keyword in ["wine pairing", "menu items", "food pairing"]):
-                config["max_output_tokens"] = 8192  # Increased for complex menu analysis
-                config["candidate_count"] = 1
-            
-            response = model.generate_content(prompt, generation_config=config)
+            response = generate_for_task(task, prompt, model=model)
+            if cache_ttl and validate is not None and validate(response.text):
+                llm_response_cache.set(
+                    cache_key, response.text, task.value, cache_ttl, response_token_count(response, prompt)
+                )
             return response.text
 
         except Exception as e:
@@ -45,13 +79,17 @@ def call_gemini_sync_with_retry(
             logger.warning(f"Gemini API retry {attempt}/{max_retries} in {wait_time}s")
             time.sleep(wait_time)
 
+def is_json_object(text: str) -> bool:
+    parsed = parse_json_from_text(text)
+    return isinstance(parsed, dict) and "raw_output" not in parsed
+
 def summarize_with_gemini(wine_name: str, content: str, sources: list[str]) -> dict:
     """
     Use Gemini to summarize wine info using SAT-style prompt and parse JSON output.
     """
     prompt = get_sat_prompt(wine_name, content, sources, AROMA_LEXICONS)
     try:
-        raw_text = call_gemini_sync_with_retry(prompt, temperature=0.7)
+        raw_text = call_gemini_sync_with_retry(prompt, LLMTask.SAT_SUMMARY)
         logger.info(f"Gemini raw output:\n{raw_text}")
         parsed = parse_json_from_text(raw_text)
 
@@ -69,7 +107,7 @@ def parse_wine_query_with_gemini(query: str) -> dict:
     """
     prompt = get_wine_from_query_prompt(query)
     try:
-        raw_text = call_gemini_sync_with_retry(prompt, temperature=0.3)
+        raw_text = call_gemini_sync_with_retry(prompt, LLMTask.QUERY_PARSE, validate=is_json_object)
         parsed = parse_json_from_text(raw_text)
 
         # Ensure structure
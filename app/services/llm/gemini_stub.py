@@ -0,0 +1,155 @@
+"""
+Local stand-in for the Gemini generateContent API, for offline runs and load tests.
+
+Run it:       uvicorn app.services.llm.gemini_stub:app --port 8090
+Point at it:  GEMINI_API_ENDPOINT=http://localhost:8090
+
+Responses are canned per prompt family (see gemini_stub_responses.py), delayed by a
+lognormal latency per family and optionally replaced by injected errors.
+Settings come from GEMINI_STUB_* env vars and can be changed at runtime via PUT /stub/config.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+from collections import Counter
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from app.services.llm.gemini_stub_responses import classify_prompt, canned_output
+
+logger = logging.getLogger(__name__)
+
+# (median_ms, p95_ms) per prompt family, roughly what gemini-2.5-flash shows in production logs
+DEFAULT_LATENCY_MS = {
+    "sat_summary": (8000, 14000),
+    "query_parse": (900, 1800),
+    "menu_pairing": (12000, 20000),
+    "item_pairing": (5000, 9000),
+    "food_text_pairing": (5000, 9000),
+    "food_pairing": (4000, 7000),
+    "label_vision": (3000, 5500),
+    "menu_vision": (6000, 11000),
+    "ocr_vision": (1500, 3000),
+    "default": (1000, 2000),
+}
+
+ERROR_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+CHARS_PER_TOKEN = 4
+
+def load_stub_config() -> dict:
+    latency = {family: list(values) for family, values in DEFAULT_LATENCY_MS.items()}
+    latency.update(json.loads(os.getenv("GEMINI_STUB_LATENCY_MS", "{}")))
+    return {
+        "latency_ms": latency,
+        "latency_scale": float(os.getenv("GEMINI_STUB_LATENCY_SCALE", 1.0)),   # 0 disables delays
+        "error_rate": float(os.getenv("GEMINI_STUB_ERROR_RATE", 0.0)),
+        "error_codes": [int(c) for c in os.getenv("GEMINI_STUB_ERROR_CODES", "429,503").split(",")],
+        "malformed_rate": float(os.getenv("GEMINI_STUB_MALFORMED_RATE", 0.0)),  # 200 with unparseable text
+        "seed": os.getenv("GEMINI_STUB_SEED"),
+    }
+
+def sample_latency_ms(rng: random.Random, median_ms: float, p95_ms: float) -> float:
+    """
+    Lognormal sample with the given median and 95th percentile.
+    """
+    if median_ms <= 0:
+        return 0.0
+    sigma = math.log(max(p95_ms, median_ms) / median_ms) / 1.645
+    return rng.lognormvariate(math.log(median_ms), sigma)
+
+def extract_prompt(body: dict) -> tuple[str, bool]:
+    """
+    Return (concatenated text parts, has image) from a generateContent request body.
+    """
+    texts, has_image = [], False
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            if "text" in part:
+                texts.append(part["text"])
+            if "inlineData" in part or "inline_data" in part:
+                has_image = True
+    return "\n".join(texts), has_image
+
+def build_response(text: str, prompt: str) -> dict:
+    prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+    output_tokens = len(text) // CHARS_PER_TOKEN
+    return {
+        "candidates": [{
+            "content": {"parts": [{"text": text}], "role": "model"},
+            "finishReason": "STOP",
+            "index": 0
+        }],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens
+        }
+    }
+
+def create_stub_app(config: dict = None) -> FastAPI:
+    stub = FastAPI(title="Gemini stand-in", docs_url="/swagger")
+    stub.state.config = config or load_stub_config()
+    stub.state.rng = random.Random(stub.state.config.get("seed"))
+    stub.state.stats = Counter()
+
+    @stub.post("/v1beta/models/{model}:generateContent")
+    async def generate_content(model: str, request: Request):
+        cfg, rng, stats = stub.state.config, stub.state.rng, stub.state.stats
+        prompt, has_image = extract_prompt(await request.json())
+        family = classify_prompt(prompt)
+        stats[f"requests.{family}"] += 1
+
+        median_ms, p95_ms = cfg["latency_ms"].get(family, cfg["latency_ms"]["default"])
+        delay_ms = sample_latency_ms(rng, median_ms, p95_ms) * cfg["latency_scale"]
+        await asyncio.sleep(delay_ms / 1000)
+
+        if rng.random() < cfg["error_rate"]:
+            code = rng.choice(cfg["error_codes"])
+            stats[f"errors.{code}"] += 1
+            return JSONResponse(status_code=code, content={"error": {
+                "code": code,
+                "message": f"Injected error from Gemini stand-in ({family})",
+                "status": ERROR_STATUSES.get(code, "UNKNOWN")
+            }})
+
+        if rng.random() < cfg["malformed_rate"]:
+            stats["malformed"] += 1
+            return build_response("Sorry, I can't help with that right now.", prompt)
+
+        logger.info(f"[GEMINI-STUB] {model} {family}{' +image' if has_image else ''} in {delay_ms:.0f}ms")
+        return build_response(canned_output(family, prompt), prompt)
+
+    @stub.get("/stub/config")
+    async def get_config():
+        return stub.state.config
+
+    @stub.put("/stub/config")
+    async def update_config(request: Request):
+        # Partial update, e.g. {"error_rate": 0.2} mid load test
+        updates = await request.json()
+        stub.state.config.update(updates)
+        if "seed" in updates:
+            stub.state.rng = random.Random(updates["seed"])
+        return stub.state.config
+
+    @stub.get("/stub/stats")
+    async def get_stats():
+        return dict(stub.state.stats)
+
+    @stub.delete("/stub/stats")
+    async def reset_stats():
+        stub.state.stats.clear()
+        return {"status": "success"}
+
+    return stub
+
+app = create_stub_app()
@@ -0,0 +1,237 @@
+"""
+Canned Gemini outputs for the local stand-in server, one per prompt family.
+Outputs follow the formats the real prompts ask for, so the app's parsers handle them unchanged.
+"""
+import json
+import re
+
+VINTAGE_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# (family, marker) — first marker found in the prompt text wins
+PROMPT_FAMILIES = [
+    ("sat_summary", "Systematic Approach to Tasting (SAT)"),
+    ("query_parse", "extract structured information from unstructured user wine queries"),
+    ("menu_pairing", "Expert sommelier: analyze menu, provide wine pairings"),
+    ("item_pairing", "recommend wines for this dish"),
+    ("food_text_pairing", "analyze this food description"),
+    ("food_pairing", "professional wine and food pairing expert"),
+    ("label_vision", "analyzing a wine label image"),
+    ("menu_vision", "analyzing a restaurant menu image"),
+    ("ocr_vision", "Extract and return all visible text from this image"),
+]
+
+def classify_prompt(prompt: str) -> str:
+    for family, marker in PROMPT_FAMILIES:
+        if marker in prompt:
+            return family
+    return "default"
+
+def _sat_summary(prompt: str) -> str:
+    match = re.search(r'Analyze the wine "(.+?)"', prompt)
+    wine = match.group(1) if match else "Stub Wine"
+    return json.dumps({
+        "wine": wine,
+        "region": "Oakville, Napa Valley, California, USA",
+        "grape_varieties": "85% Cabernet Sauvignon, 15% Merlot",
+        "appearance": "Clear, deep ruby",
+        "nose": "Clean, pronounced intensity, black cherry, cassis, cedar, vanilla",
+        "palate": (
+            "Dry, medium+ acidity, high tannin, high alcohol, full body, pronounced flavor intensity, "
+            "black cherry, cassis, mocha, long finish, balanced"
+        ),
+        "aging": "Can age 15–20 years due to structure and concentration",
+        "quality": "Outstanding",
+        "average_price": "US$350–400",
+        "analysis": "A benchmark Oakville blend with ripe, layered fruit framed by fine-grained tannin.",
+        "aroma": {
+            "Black fruit": ["black cherry", "cassis"],
+            "Oak": ["cedar", "vanilla", "mocha"]
+        },
+        "reference_source": ["https://stub.local/wine"]
+    }, ensure_ascii=False)
+
+def _query_parse(prompt: str) -> str:
+    match = re.search(r'User Query:\s*"(.*)"', prompt)
+    query = match.group(1) if match else ""
+    vintages = VINTAGE_PATTERN.findall(query)
+    name = " ".join(VINTAGE_PATTERN.sub(" ", query).split()).title()
+    return json.dumps({
+        "winery": name,
+        "wine_name": name,
+        "vintage": vintages[0] if vintages else ""
+    }, ensure_ascii=False)
+
+def _menu_pairing(prompt: str) -> str:
+    menu = prompt.split("JSON format:")[0]
+    dish_count = len(re.findall(r"^\d+\. ", menu, flags=re.MULTILINE)) or 1
+    specific = [
+        {
+            "wine_name": "Domaine Drouhin Pinot Noir",
+            "grape_variety": "Pinot Noir",
+            "vintage": "2021",
+            "region": "Willamette Valley, Oregon",
+            "price_range": "US$40-55",
+            "reasoning": "Bright acidity and red fruit lift the dish without overpowering it.",
+            "confidence": 0.85
+        },
+        {
+            "wine_name": "Louis Jadot Chablis",
+            "grape_variety": "Chardonnay",
+            "vintage": "2022",
+            "region": "Chablis, Burgundy",
+            "price_range": "US$25-35",
+            "reasoning": "Crisp minerality cuts through richness.",
+            "confidence": 0.8
+        }
+    ]
+    general = [
+        {
+            "grape_variety": "Pinot Noir",
+            "regions": ["Burgundy", "Willamette Valley"],
+            "wine_style": "Light to medium-bodied red",
+            "characteristics": ["red cherry", "high acidity"],
+            "reasoning": "Soft tannins suit a wide range of dishes."
+        },
+        {
+            "grape_variety": "Chardonnay",
+            "regions": ["Chablis", "Sonoma Coast"],
+            "wine_style": "Unoaked, mineral white",
+            "characteristics": ["citrus", "wet stone"],
+            "reasoning": "Freshness balances fat and salt."
+        },
+        {
+            "grape_variety": "Riesling",
+            "regions": ["Mosel", "Clare Valley"],
+            "wine_style": "Dry to off-dry aromatic white",
+            "characteristics": ["lime", "high acidity"],
+            "reasoning": "Handles spice and aromatic seasoning."
+        }
+    ]
+    return json.dumps({
+        "menu_items": [
+            {
+                "dish_index": i,
+                "wine_pairings": {"specific_recommendations": specific, "general_recommendations": general}
+            }
+            for i in range(1, dish_count + 1)
+        ],
+        "overall_recommendations": [
+            {
+                "category": "Versatile pick",
+                "recommendation": "Pinot Noir",
+                "reasoning": "Works across most dishes on this menu."
+            }
+        ]
+    }, ensure_ascii=False)
+
+ITEM_PAIRING_TEXT = """
+**SPECIFIC RECOMMENDATIONS:**
+1. 2021 Domaine Drouhin Pinot Noir (Pinot Noir) - Willamette Valley, Oregon ($40-55)
+   Reasoning: Bright acidity and red fruit lift the dish without overpowering it.
+
+2. 2022 Louis Jadot Chablis (Chardonnay) - Chablis, Burgundy ($25-35)
+   Reasoning: Crisp minerality cuts through richness.
+
+**GENERAL CATEGORIES:**
+1. **Pinot Noir** from Burgundy, Willamette Valley, Central Otago
+   Style: Light to medium-bodied, dry red
+   Characteristics: Red cherry, high acidity, soft tannins
+   Pairing Logic: Soft tannins and acidity suit a wide range of dishes.
+
+2. **Chardonnay** from Chablis, Sonoma Coast, Margaret River
+   Style: Unoaked to lightly oaked, dry white
+   Characteristics: Citrus, wet stone, medium body
+   Pairing Logic: Freshness balances fat and salt.
+
+3. **Riesling** from Mosel, Clare Valley, Alsace
+   Style: Dry to off-dry aromatic white
+   Characteristics: Lime, high acidity
+   Pairing Logic: Handles spice and aromatic seasoning.
+""".strip()
+
+def _food_pairing(prompt: str) -> str:
+    return json.dumps([
+        {
+            "category": "Lamb",
+            "examples": [
+                {"food": "Herb-crusted lamb rack", "reason": "Tannin and herbal notes match the richness of lamb."},
+                {"food": "Braised lamb shank", "reason": "Depth of flavor complements the wine's body."}
+            ]
+        },
+        {
+            "category": "Hard cheese",
+            "examples": [
+                {"food": "Aged Comté", "reason": "Nutty savoriness softens firm tannin."},
+                {"food": "Parmigiano-Reggiano", "reason": "Umami and salt bring out fruit."}
+            ]
+        },
+        {
+            "category": "Mushrooms",
+            "examples": [
+                {"food": "Wild mushroom risotto", "reason": "Earthy notes echo the wine's savory side."},
+                {"food": "Grilled portobello", "reason": "Char and umami match oak and structure."}
+            ]
+        }
+    ], ensure_ascii=False)
+
+def _label_vision(prompt: str) -> str:
+    return json.dumps({
+        "wine_name": "Opus One",
+        "winery": "Opus One Winery",
+        "vintage": "2018",
+        "region": "Napa Valley",
+        "grape_varieties": "Cabernet Sauvignon, Merlot, Cabernet Franc",
+        "alcohol_content": "14.5%",
+        "wine_type": "Red",
+        "additional_info": "Estate grown",
+        "confidence": 0.9,
+        "extracted_text": "OPUS ONE 2018 NAPA VALLEY RED WINE"
+    })
+
+def _menu_vision(prompt: str) -> str:
+    return json.dumps({
+        "restaurant_name": "Stub Bistro",
+        "cuisine_style": "French",
+        "menu_items": [
+            {
+                "dish_name": "Steak Frites",
+                "category": "main",
+                "price": "$32",
+                "ingredients": ["ribeye", "fries", "béarnaise"],
+                "protein": "beef",
+                "cooking_method": "grilled",
+                "cuisine_type": "French",
+                "flavor_profile": ["rich", "savory"],
+                "description": "Grilled ribeye with fries and béarnaise"
+            },
+            {
+                "dish_name": "Sole Meunière",
+                "category": "main",
+                "price": "$36",
+                "ingredients": ["sole", "brown butter", "lemon"],
+                "protein": "fish",
+                "cooking_method": "pan-fried",
+                "cuisine_type": "French",
+                "flavor_profile": ["buttery", "acidic"],
+                "description": "Dover sole in brown butter and lemon"
+            }
+        ],
+        "confidence": 0.85,
+        "extracted_text": "STUB BISTRO Steak Frites $32 Sole Meunière $36"
+    }, ensure_ascii=False)
+
+CANNED_OUTPUTS = {
+    "sat_summary": _sat_summary,
+    "query_parse": _query_parse,
+    "menu_pairing": _menu_pairing,
+    "item_pairing": lambda prompt: ITEM_PAIRING_TEXT,
+    "food_text_pairing": lambda prompt: ITEM_PAIRING_TEXT,
+    "food_pairing": _food_pairing,
+    "label_vision": _label_vision,
+    "menu_vision": _menu_vision,
+    "ocr_vision": lambda prompt: "OPUS ONE 2018 NAPA VALLEY RED WINE",
+    "default": lambda prompt: "OK",
+}
+
+def canned_output(family: str, prompt: str) -> str:
+    return CANNED_OUTPUTS.get(family, CANNED_OUTPUTS["default"])(prompt)
@@ -0,0 +1,149 @@
+import logging
+import re
+from dataclasses import dataclass
+from sentence_transformers import util
+from app.config import (
+    PROMPT_TOKEN_BUDGET,
+    PROMPT_PARAGRAPH_MAX_TOKENS,
+    PROMPT_NAME_MATCH_WEIGHT,
+    PROMPT_SIMILARITY_WEIGHT,
+)
+from app.utils.text_cleaning import embedding_model
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4     # rough average for English text with Gemini tokenizers
+
+@dataclass
+class Paragraph:
+    source_index: int
+    position: int
+    url: str
+    text: str
+    tokens: int
+    score: float = 0.0
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_paragraphs(text: str, max_tokens: int = PROMPT_PARAGRAPH_MAX_TOKENS) -> list[str]:
+    """
+    Split page text into paragraphs on blank lines.
+    Paragraphs over max_tokens are re-split on line breaks, then hard-wrapped if still too long.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    paragraphs = []
+
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block:
+            continue
+        if len(block) <= max_chars:
+            paragraphs.append(block)
+            continue
+
+        current = ""
+        for line in block.split("\n"):
+            line = line.strip()
+            while len(line) > max_chars:
+                paragraphs.append(line[:max_chars])
+                line = line[max_chars:]
+            if current and len(current) + len(line) + 1 > max_chars:
+                paragraphs.append(current)
+                current = ""
+            current = f"{current}\n{line}" if current else line
+        if current:
+            paragraphs.append(current)
+
+    return paragraphs
+
+def name_match_score(wine_name: str, paragraph: str) -> float:
+    """
+    Fraction of wine-name tokens found in the paragraph, with full credit for the exact name.
+    """
+    lowered = paragraph.casefold()
+    if wine_name.casefold() in lowered:
+        return 1.0
+
+    tokens = [t for t in re.findall(r"\w+", wine_name.casefold()) if len(t) > 1]
+    if not tokens:
+        return 0.0
+    words = set(re.findall(r"\w+", lowered))
+    return sum(t in words for t in tokens) / len(tokens)
+
+def _score_paragraphs(wine_name: str, paragraphs: list[Paragraph]) -> None:
+    query_embedding = embedding_model.encode(wine_name, convert_to_tensor=True)
+    paragraph_embeddings = embedding_model.encode([p.text for p in paragraphs], convert_to_tensor=True)
+    similarities = util.cos_sim(query_embedding, paragraph_embeddings)[0].tolist()
+
+    for paragraph, similarity in zip(paragraphs, similarities):
+        paragraph.score = (
+            PROMPT_NAME_MATCH_WEIGHT * name_match_score(wine_name, paragraph.text)
+            + PROMPT_SIMILARITY_WEIGHT * similarity
+        )
+
+def _format_by_source(paragraphs: list[Paragraph]) -> str:
+    # Keep the original page and paragraph order so each source reads coherently
+    sections = {}
+    for p in sorted(paragraphs, key=lambda p: (p.source_index, p.position)):
+        sections.setdefault(p.url, []).append(p.text)
+
+    return "\n\n".join(
+        f"[Source: {url}]\n" + "\n\n".join(texts)
+        for url, texts in sections.items()
+    )
+
+def assemble_prompt_content(
+    wine_name: str,
+    pages: list[tuple[str, str]],
+    token_budget: int = PROMPT_TOKEN_BUDGET
+) -> str:
+    """
+    Build the content section of the SAT prompt from crawled pages.
+
+    Paragraphs are de-duplicated, scored by wine-name mentions plus embedding similarity
+    to the wine name, and the best ones are packed into token_budget.
+    Each kept paragraph stays under a [Source: url] header for attribution.
+
+    Args:
+        wine_name: Wine being summarized
+        pages: (url, text) pairs from the crawler
+        token_budget: Max estimated tokens of content to keep
+
+    Returns:
+        Content string ready for get_sat_prompt
+    """
+    paragraphs, seen = [], set()
+    for source_index, (url, text) in enumerate(pages):
+        for position, chunk in enumerate(split_paragraphs(text)):
+            fingerprint = " ".join(chunk.casefold().split())
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            paragraphs.append(Paragraph(source_index, position, url, chunk, estimate_tokens(chunk)))
+
+    if not paragraphs:
+        return ""
+
+    tokens_in = sum(estimate_tokens(text) for _, text in pages)
+    tokens_unique = sum(p.tokens for p in paragraphs)
+
+    if tokens_unique <= token_budget:
+        kept = paragraphs   # Everything fits, skip the embedding pass
+    else:
+        _score_paragraphs(wine_name, paragraphs)
+        kept, used = [], 0
+        for p in sorted(paragraphs, key=lambda p: p.score, reverse=True):
+            if used + p.tokens > token_budget:
+                continue
+            kept.append(p)
+            used += p.tokens
+
+    tokens_kept = sum(p.tokens for p in kept)
+    logger.info(
+        f"[PROMPT] {wine_name}: tokens in {tokens_in:,} → kept {tokens_kept:,} "
+        f"(budget {token_budget:,}), paragraphs {len(kept)}/{len(paragraphs)}, "
+        f"sources {len({p.url for p in kept})}/{len(pages)}"
+    )
+
+    return _format_by_source(kept)
@@ -0,0 +1,86 @@
+import logging
+import os
+from collections import OrderedDict
+from app.db.crud.parsed_query import get_parsed_query, save_parsed_query
+from app.db.usage_recorder import usage_recorder
+from app.prompts.wine_prompts import QUERY_PARSE_PROMPT_VERSION
+from app.utils.normalize import canonical_wine_key
+
+logger = logging.getLogger(__name__)
+
+QUERY_MEMO_LRU_SIZE = int(os.getenv("QUERY_MEMO_LRU_SIZE", 2048))
+MAX_QUERY_KEY_LENGTH = 512  # matches parsed_queries.query_key
+
+def build_parsed_query_entry(query: str, parsed: dict, wine_name: str) -> dict:
+    return {
+        "query_key": canonical_wine_key(query),
+        "raw_query": query,
+        "winery": parsed.get("winery", "") or "",
+        "wine_name": parsed.get("wine_name", "") or "",
+        "vintage": parsed.get("vintage", "") or "",
+        "canonical_key": canonical_wine_key(wine_name),
+        "prompt_version": QUERY_PARSE_PROMPT_VERSION,
+    }
+
+class QueryMemo:
+    """
+    Memoizes Gemini query parses: an in-memory LRU in front of the parsed_queries table,
+    both keyed on the normalized raw query.
+    """
+
+    def __init__(self, max_size: int = QUERY_MEMO_LRU_SIZE):
+        self.max_size = max_size
+        self._lru: OrderedDict[str, dict] = OrderedDict()
+
+    def _remember(self, key: str, parsed: dict) -> None:
+        self._lru[key] = parsed
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    async def get(self, session, query: str) -> dict | None:
+        key = canonical_wine_key(query)
+        if not key or len(key) > MAX_QUERY_KEY_LENGTH:
+            return None
+
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            logger.info(f"[QUERY-MEMO] LRU hit: '{key}'")
+            usage_recorder.memo_hit(key)
+            return dict(self._lru[key])
+
+        try:
+            entry = await get_parsed_query(session, key, QUERY_PARSE_PROMPT_VERSION)
+        except Exception as e:
+            logger.warning(f"[QUERY-MEMO] Lookup failed for '{key}': {e}")
+            await session.rollback()
+            return None
+
+        if entry is None:
+            return None
+
+        logger.info(f"[QUERY-MEMO] DB hit: '{key}'")
+        usage_recorder.memo_hit(key)
+        parsed = entry.to_dict()
+        self._remember(key, parsed)
+        return dict(parsed)
+
+    async def put(self, session, query: str, parsed: dict, wine_name: str) -> None:
+        entry = build_parsed_query_entry(query, parsed, wine_name)
+        if not entry["query_key"] or len(entry["query_key"]) > MAX_QUERY_KEY_LENGTH:
+            return
+
+        self._remember(entry["query_key"], {
+            key: entry[key] for key in ("winery", "wine_name", "vintage", "canonical_key", "prompt_version")
+        })
+
+        try:
+            await save_parsed_query(session, entry)
+        except Exception as e:
+            logger.warning(f"[QUERY-MEMO] Failed to save parse for '{query}': {e}")
+            await session.rollback()
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+query_memo = QueryMemo()
@@ -0,0 +1,84 @@
+import json
+import logging
+from hashlib import sha256
+from typing import Optional
+from app.config import LLM_CACHE_ENABLED, LLM_CACHE_TTLS
+from app.utils.cache import TieredCache, cache
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4     # fallback estimate when the response has no usage metadata
+
+def llm_cache_key(model: str, prompt: str, config: dict) -> str:
+    payload = json.dumps({"model": model, "prompt": prompt, "config": config}, sort_keys=True, ensure_ascii=False)
+    return sha256(payload.encode()).hexdigest()
+
+def response_token_count(response, prompt: str) -> int:
+    """
+    Total tokens billed for a response, from usage metadata or a chars/4 estimate.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    total = getattr(usage, "total_token_count", None)
+    if isinstance(total, int) and total > 0:
+        return total
+    return (len(prompt) + len(response.text)) // CHARS_PER_TOKEN
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of Gemini text responses, stored in the "llm" cache namespace.
+
+    Entries are keyed on sha256(model, prompt, generation config), so any prompt or
+    config change is a new entry. Only tasks listed in LLM_CACHE_TTLS (deterministic,
+    low-temperature calls) are cached, each with its own TTL.
+    """
+
+    NAMESPACE = "llm"
+
+    def __init__(self, store: TieredCache = cache, ttls: dict[str, int] = LLM_CACHE_TTLS, enabled: bool = LLM_CACHE_ENABLED):
+        self.store = store
+        self.ttls = ttls
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    def ttl_for(self, task: Optional[str]) -> Optional[int]:
+        if not self.enabled or task is None:
+            return None
+        return self.ttls.get(task)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.store.get(self.NAMESPACE, key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.tokens_saved += entry.get("tokens", 0)
+        logger.info(f"[LLM-CACHE] Hit {entry.get('task')} {key[:12]} — {self.tokens_saved:,} tokens saved so far")
+        return entry["text"]
+
+    def set(self, key: str, text: str, task: str, ttl_seconds: int, tokens: int) -> None:
+        self.store.set(self.NAMESPACE, key, {"text": text, "task": task, "tokens": tokens}, ttl_seconds=ttl_seconds)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "tokens_saved": self.tokens_saved,
+            "ttl_seconds": self.ttls,
+        }
+
+llm_response_cache = LLMResponseCache()
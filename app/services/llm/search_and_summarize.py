@@ -2,13 +2,15 @@ import asyncio
 import httpx
 import logging
 import os
-import re
 import time
 from bs4 import BeautifulSoup
 from app.exceptions import GoogleSearchApiError, GeminiApiError
 from app.services.llm.gemini_engine import summarize_with_gemini
+from app.services.llm.prompt_assembly import assemble_prompt_content
 from app.utils.fetcher import get_relevant_text_and_cache
 from app.utils.logging import log_skipped
+from app.utils.negative_cache import negative_cache
+from app.utils.progress import report_stage
 from app.utils.search import google_search_links_with_retry
 from app.utils.text_cleaning import is_probably_binary, clean_aggressively
 from app.utils.url_utils import is_valid_url
@@ -97,14 +99,14 @@ async def fetch_full_text_from_url_async(client: httpx.AsyncClient, url: str) ->
 
     return ""
 
-# Function to concurrently crawl and aggregate page content from links
-async def aggregate_page_content_async(
+# Function to concurrently crawl links and collect (url, text) per page
+async def collect_page_texts_async(
     search_links: list[str],
     wine_name: str,
     max_concurrent: int = MAX_CONCURRENT_FETCHES,
     slow_threshold: float = 5.0,  # seconds
     total_timeout: float = 20.0  # total timeout for all fetches
-) -> str:
+) -> list[tuple[str, str]] | dict:
     logger.info(f"[SETUP] Using max_concurrent={max_concurrent} for fetching.")
     sem = asyncio.Semaphore(max_concurrent)  # limits concurrent fetches
     
@@ -136,9 +138,11 @@ async def aggregate_page_content_async(
                     return raw_text, final_url
                 except asyncio.TimeoutError:
                     logger.warning(f"Timeout fetching {url}")
+                    await negative_cache.remember_url(wine_name, url, "timeout")
                     return "", url
                 except Exception as e:
                     logger.error(f"Failed to fetch or cache {url}: {e}")
+                    await negative_cache.remember_url(wine_name, url, "error")
                     return "", url
         
         # Concurrently fetch all text with total timeout
@@ -153,13 +157,11 @@ async def aggregate_page_content_async(
             # Return empty result on total timeout
             return {"error": "Content aggregation timed out."}
 
-    pairs = [result for result in raw_results if result is not None]
+    pairs = [result for result in raw_results if isinstance(result, tuple)]
     if not pairs:
         return {"error": "No relevant content found for summarization."}
 
-    texts, urls = zip(*pairs)
-    joined = "\n".join(texts)
-    return re.sub(r"\{2,}", " ", joined).strip()
+    return [(url, text) for text, url in pairs]
 
 # Function to call google search engine API and gemini API to summarize wine info
 async def summarize_wine_info(wine_name: str) -> dict:
@@ -167,6 +169,7 @@ async def summarize_wine_info(wine_name: str) -> dict:
         timings = {}
 
         # Step 1: Get all links from google search engine
+        report_stage("gathering_info")
         t0 = time.perf_counter()
         search_links = google_search_links_with_retry(wine_name)
         if not isinstance(search_links, list):
@@ -174,28 +177,36 @@ async def summarize_wine_info(wine_name: str) -> dict:
             return {"error": "Failed to retrieve search links."}
         timings["google_search"] = time.perf_counter() - t0
 
-        # Step 2: Crawl the links and aggregate contents
+        # Step 2: Crawl the links and collect page contents
         logger.info("Getting details for searched results links...")
+        report_stage("aggregating_results", links=len(search_links))
         t1 = time.perf_counter()
-        web_content = await aggregate_page_content_async(search_links, wine_name)
+        pages = await collect_page_texts_async(search_links, wine_name)
         timings["aggregate_pages"] = time.perf_counter() - t1
 
         # CRITICAL FIX and check before Gemini call
-        if isinstance(web_content, dict) and "error" in web_content:
-            logger.error(f"Error during content aggregation for {wine_name}: {web_content['error']}")
-            return web_content
+        if isinstance(pages, dict) and "error" in pages:
+            logger.error(f"Error during content aggregation for {wine_name}: {pages['error']}")
+            return pages
 
-        if not isinstance(web_content, str):
-            logger.error(f"Web content is not a string after aggregation for {wine_name}: {type(web_content)}. Content: {web_content}")
+        if not isinstance(pages, list):
+            logger.error(f"Page contents are not a list after aggregation for {wine_name}: {type(pages)}. Content: {pages}")
             return {"error": "Failed to process web content for summarization."}
 
-        # Step 3: Gemini analysis (proceed only if web_content is a valid string)
+        # Step 3: Rank paragraphs and pack the most relevant into the prompt token budget
+        t_assemble = time.perf_counter()
+        # Embedding every paragraph is CPU-bound, keep it off the event loop
+        web_content = await asyncio.to_thread(assemble_prompt_content, wine_name, pages)
+        timings["prompt_assembly"] = time.perf_counter() - t_assemble
+
+        # Step 4: Gemini analysis
         logger.info(f"[GEMINI] Started summarizing web content (length: {len(web_content):,}) for {wine_name}...")
+        report_stage("analyzing_ai", content_length=len(web_content))
         t2 = time.perf_counter()
         summary = summarize_with_gemini(wine_name, web_content, search_links)
         timings["gemini"] = time.perf_counter() - t2
 
-        # Step 4: Normalize reference sources to list and combine
+        # Step 5: Normalize reference sources to list and combine
         t3 = time.perf_counter()
         existing_sources = summary.get("reference_source", [])
         if isinstance(existing_sources, str):   # conver to list if returned as string
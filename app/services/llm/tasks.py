@@ -0,0 +1,108 @@
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+from app.config import GEMINI_MODEL
+
+class LLMTask(str, Enum):
+    """
+    Every kind of Gemini call the app makes. Each task has its own GenerationProfile.
+    """
+    GENERAL = "general"
+    QUERY_PARSE = "query_parse"
+    SAT_SUMMARY = "sat_summary"
+    FOOD_PAIRING = "food_pairing"
+    MENU_PAIRING = "menu_pairing"
+    ITEM_PAIRING = "item_pairing"
+    LABEL_VISION = "label_vision"
+    MENU_VISION = "menu_vision"
+    TEXT_EXTRACTION = "text_extraction"
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    model: str
+    temperature: float
+    max_output_tokens: Optional[int] = None
+    timeout_seconds: float = 60.0
+
+    def generation_config(self) -> dict:
+        config = {"temperature": self.temperature}
+        if self.max_output_tokens:
+            config["max_output_tokens"] = self.max_output_tokens
+            config["candidate_count"] = 1
+        return config
+
+# Cheap extraction tasks can be pointed at a faster model; defaults keep one model for everything
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", GEMINI_MODEL)
+
+_DEFAULT_PROFILES = {
+    LLMTask.GENERAL: GenerationProfile(GEMINI_MODEL, temperature=0.7),
+    LLMTask.QUERY_PARSE: GenerationProfile(GEMINI_FAST_MODEL, temperature=0.3, timeout_seconds=20),
+    LLMTask.SAT_SUMMARY: GenerationProfile(GEMINI_MODEL, temperature=0.7, timeout_seconds=90),
+    LLMTask.FOOD_PAIRING: GenerationProfile(GEMINI_MODEL, temperature=0.7, max_output_tokens=8192),
+    LLMTask.MENU_PAIRING: GenerationProfile(GEMINI_MODEL, temperature=0.1, max_output_tokens=8192, timeout_seconds=90),
+    LLMTask.ITEM_PAIRING: GenerationProfile(GEMINI_MODEL, temperature=0.3, max_output_tokens=8192),
+    LLMTask.LABEL_VISION: GenerationProfile(GEMINI_FAST_MODEL, temperature=0.3, timeout_seconds=30),
+    LLMTask.MENU_VISION: GenerationProfile(GEMINI_MODEL, temperature=0.2, max_output_tokens=4096),
+    LLMTask.TEXT_EXTRACTION: GenerationProfile(GEMINI_FAST_MODEL, temperature=0.1, timeout_seconds=30),
+}
+
+def _profile_from_env(task: LLMTask, default: GenerationProfile) -> GenerationProfile:
+    # e.g. GEMINI_MODEL_SAT_SUMMARY, GEMINI_TEMPERATURE_QUERY_PARSE, GEMINI_MAX_TOKENS_MENU_VISION, GEMINI_TIMEOUT_LABEL_VISION
+    suffix = task.name
+    max_tokens = os.getenv(f"GEMINI_MAX_TOKENS_{suffix}")
+    return GenerationProfile(
+        model=os.getenv(f"GEMINI_MODEL_{suffix}", default.model),
+        temperature=float(os.getenv(f"GEMINI_TEMPERATURE_{suffix}", default.temperature)),
+        max_output_tokens=int(max_tokens) if max_tokens else default.max_output_tokens,
+        timeout_seconds=float(os.getenv(f"GEMINI_TIMEOUT_{suffix}", default.timeout_seconds)),
+    )
+
+TASK_PROFILES: dict[LLMTask, GenerationProfile] = {
+    task: _profile_from_env(task, profile) for task, profile in _DEFAULT_PROFILES.items()
+}
+
+class TaskLatencyStats:
+    """
+    Per-task call counts, failures and latency percentiles over the most recent calls.
+    Thread-safe: Gemini calls run in worker threads (see wine_recommender batch processing).
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._calls: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(self, task: LLMTask, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self._calls[task.value] = self._calls.get(task.value, 0) + 1
+            if not ok:
+                self._errors[task.value] = self._errors.get(task.value, 0) + 1
+            self._samples.setdefault(task.value, deque(maxlen=self.window)).append(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for task, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[task] = {
+                    "model": TASK_PROFILES[LLMTask(task)].model,
+                    "calls": self._calls[task],
+                    "errors": self._errors.get(task, 0),
+                    "p50_seconds": round(ordered[len(ordered) // 2], 3),
+                    "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                    "max_seconds": round(ordered[-1], 3),
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._calls.clear()
+            self._errors.clear()
+
+task_latency = TaskLatencyStats()
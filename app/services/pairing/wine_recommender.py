@@ -2,7 +2,10 @@ import logging
 import time
 from typing import Dict, Any, List, Optional
 from app.services.llm.gemini_engine import call_gemini_sync_with_retry
-from app.utils.cache import cache_wine_recommendations, get_cached_wine_recommendations, generate_image_hash
+from app.services.llm.tasks import LLMTask
+from app.utils.cache import cache, generate_image_hash
+from app.utils.metrics import lookup_metrics
+from app.utils.llm_parsing import parse_json_from_text
 from app.exceptions import GeminiApiError
 from app.prompts.wine_pairing_prompts import (
     get_wine_pairing_prompt,
@@ -39,34 +42,130 @@ class WineRecommender:
         menu_hash = self._generate_menu_hash(menu_items)
         
         # Check cache first
-        cached_recommendations = get_cached_wine_recommendations(menu_hash)
+        cached_recommendations = cache.get("pairing", menu_hash)
         if cached_recommendations:
             logger.info(f"Using cached wine recommendations: {menu_hash}")
             return cached_recommendations
         
+        # Then per dish: only dishes we haven't paired recently go to Gemini
+        cached_pairings = self._lookup_cached_items(menu_items)
+        miss_items = [item for item, pairings in zip(menu_items, cached_pairings) if pairings is None]
+
+        if miss_items:
+            fresh = self._recommend_uncached(miss_items)
+            self._cache_items(fresh["menu_items"])
+        else:
+            fresh = {"menu_items": [], "overall_recommendations": [], "analysis_method": "ai_pairing_item_cache"}
+
+        recommendations = self._merge_item_results(menu_items, cached_pairings, fresh)
+        
+        # Cache the results
+        cache.set("pairing", menu_hash, recommendations, ttl_seconds=15 * 60)
+        
+        return recommendations
+
+    def _recommend_uncached(self, menu_items: List[Dict]) -> Dict[str, Any]:
+        """
+        Run the Gemini pairing pipeline for dishes with no cached pairing.
+        """
         # For large menus (>6 items), use parallel batch processing directly for better performance
         if len(menu_items) > 6:
             try:
-                recommendations = self._process_in_smaller_batches(menu_items)
+                return self._process_in_smaller_batches(menu_items)
             except Exception as e:
                 logger.error(f"Parallel batch processing failed: {e}")
                 try:
-                    recommendations = self._recommend_for_batch_items(menu_items)
+                    return self._recommend_for_batch_items(menu_items)
                 except Exception as e2:
                     logger.error(f"Batch processing failed: {e2}")
-                    recommendations = self._fallback_individual_processing(menu_items)
-        else:
-            # For smaller menus (≤6 items), use regular batch processing
-            try:
-                recommendations = self._recommend_for_batch_items(menu_items)
-            except Exception as e:
-                logger.error(f"Batch processing failed: {e}")
-                recommendations = self._fallback_individual_processing(menu_items)
-        
-        # Cache the results
-        cache_wine_recommendations(menu_hash, recommendations, ttl_minutes=15)
-        
-        return recommendations
+                    return self._fallback_individual_processing(menu_items)
+
+        # For smaller menus (≤6 items), use regular batch processing
+        try:
+            return self._recommend_for_batch_items(menu_items)
+        except Exception as e:
+            logger.error(f"Batch processing failed: {e}")
+            return self._fallback_individual_processing(menu_items)
+
+    def _get_cached_item(self, menu_item: Dict) -> Optional[Dict[str, Any]]:
+        cached = cache.get("pairing", f"item_{self._generate_item_hash(menu_item)}")
+        if not cached:
+            return None
+        # Extract wine_pairings from cached format
+        return cached.get("menu_items", [{}])[0].get("wine_pairings") or None
+
+    def _set_cached_item(self, menu_item: Dict, wine_pairings: Dict[str, Any]) -> None:
+        item_cache_data = {
+            "menu_items": [{
+                "dish": menu_item,
+                "wine_pairings": wine_pairings
+            }],
+            "analysis_method": "ai_pairing_individual_cached"
+        }
+        cache.set("pairing", f"item_{self._generate_item_hash(menu_item)}", item_cache_data, ttl_seconds=30 * 60)
+
+    def _lookup_cached_items(self, menu_items: List[Dict]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Cached wine_pairings for each dish in menu order, None where there is none.
+        """
+        results = []
+        for item in menu_items:
+            start = time.perf_counter()
+            pairings = self._get_cached_item(item)
+            lookup_metrics.record("pairing_item", pairings is not None, time.perf_counter() - start)
+            results.append(pairings)
+
+        hits = sum(pairings is not None for pairings in results)
+        if menu_items:
+            logger.info(f"Item pairing cache: {hits}/{len(menu_items)} dishes cached ({hits / len(menu_items):.0%})")
+        return results
+
+    def _cache_items(self, menu_results: List[Dict]) -> None:
+        """
+        Cache fresh per-dish pairings so other menus with the same dish can reuse them.
+        Rule-based fallbacks are not cached.
+        """
+        for result in menu_results:
+            dish, pairings = result.get("dish"), result.get("wine_pairings")
+            if dish and pairings and pairings != self._get_fallback_recommendations(dish):
+                self._set_cached_item(dish, pairings)
+
+    def _merge_item_results(
+        self,
+        menu_items: List[Dict],
+        cached_pairings: List[Optional[Dict[str, Any]]],
+        fresh: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Put cached and fresh pairings back in the original dish order.
+        """
+        fresh_pairings = iter(result.get("wine_pairings", {}) for result in fresh.get("menu_items", []))
+        menu_results = []
+        for item, pairings in zip(menu_items, cached_pairings):
+            if pairings is None:
+                pairings = next(fresh_pairings, None) or self._get_fallback_recommendations(item)
+            menu_results.append({"dish": item, "wine_pairings": pairings})
+
+        hits = sum(pairings is not None for pairings in cached_pairings)
+        overall = list(fresh.get("overall_recommendations", []))
+        if hits:
+            # Fresh overall recommendations only saw the uncached dishes, add rule-based ones for the full menu
+            seen = {rec.get("category", "") for rec in overall}
+            overall.extend(
+                rec for rec in self._generate_overall_recommendations(menu_items)
+                if rec.get("category", "") not in seen
+            )
+
+        return {
+            "menu_items": menu_results,
+            "overall_recommendations": overall,
+            "analysis_method": "ai_pairing_item_cache" if hits else fresh.get("analysis_method"),
+            "item_cache": {
+                "hits": hits,
+                "misses": len(menu_items) - hits,
+                "hit_ratio": round(hits / len(menu_items), 3) if menu_items else 0.0,
+            },
+        }
     
     def _recommend_for_batch_items(self, menu_items: List[Dict]) -> Dict[str, Any]:
         """
@@ -83,9 +182,10 @@ class WineRecommender:
             
             response = call_gemini_sync_with_retry(
                 batch_prompt, 
-                temperature=0.1,  # Lower temperature for faster, more deterministic responses
+                LLMTask.MENU_PAIRING,  # Low temperature for faster, more deterministic responses
                 max_retries=2,  # Fewer retries but more reliable parsing
-                delay_seconds=0.5
+                delay_seconds=0.5,
+                validate=self._is_valid_batch_response
             )
             
             api_duration = time.time() - start_time
@@ -188,12 +288,9 @@ class WineRecommender:
         
         for item in menu_items:
             # Check for individual item cache
-            item_hash = self._generate_item_hash(item)
-            cached_item_recommendations = get_cached_wine_recommendations(f"item_{item_hash}")
+            cached_pairings = self._get_cached_item(item)
             
-            if cached_item_recommendations:
-                # Extract wine_pairings from cached format
-                cached_pairings = cached_item_recommendations.get("menu_items", [{}])[0].get("wine_pairings", {})
+            if cached_pairings:
                 recommendations["menu_items"].append({
                     "dish": item,
                     "wine_pairings": cached_pairings
@@ -208,14 +305,7 @@ class WineRecommender:
                 })
                 
                 # Cache individual item recommendations
-                item_cache_data = {
-                    "menu_items": [{
-                        "dish": item,
-                        "wine_pairings": item_recommendations
-                    }],
-                    "analysis_method": "ai_pairing_individual_cached"
-                }
-                cache_wine_recommendations(f"item_{item_hash}", item_cache_data, ttl_minutes=30)
+                self._set_cached_item(item, item_recommendations)
                 
             except Exception as e:
                 logger.warning(f"Failed to generate recommendations for {item.get('dish_name', 'unknown')}: {e}")
@@ -227,7 +317,7 @@ class WineRecommender:
         
         # Generate overall menu recommendations (cached for performance)
         overall_hash = f"overall_{self._generate_menu_hash(menu_items)}"
-        cached_overall = get_cached_wine_recommendations(overall_hash)
+        cached_overall = cache.get("pairing", overall_hash)
         
         if cached_overall and cached_overall.get("overall_recommendations"):
             recommendations["overall_recommendations"] = cached_overall["overall_recommendations"]
@@ -238,7 +328,7 @@ class WineRecommender:
                 "overall_recommendations": recommendations["overall_recommendations"],
                 "analysis_method": "overall_cached"
             }
-            cache_wine_recommendations(overall_hash, overall_cache_data, ttl_minutes=60)
+            cache.set("pairing", overall_hash, overall_cache_data, ttl_seconds=60 * 60)
         
         return recommendations
     
@@ -251,7 +341,11 @@ class WineRecommender:
         
         try:
             # Use Gemini to generate recommendations
-            response = call_gemini_sync_with_retry(prompt, temperature=0.3)
+            response = call_gemini_sync_with_retry(
+                prompt,
+                LLMTask.ITEM_PAIRING,
+                validate=self._is_valid_item_response
+            )
             
             # Parse the response (expecting structured recommendations)
             parsed_recommendations = self._parse_recommendation_response(response, menu_item)
@@ -268,6 +362,12 @@ class WineRecommender:
         """
         return get_wine_pairing_prompt(menu_item, format_type="text")
     
+    def _is_valid_item_response(self, response: str) -> bool:
+        """
+        True when the text response yields at least one specific recommendation.
+        """
+        return bool(self._parse_recommendation_response(response, {})["specific_recommendations"])
+    
     def _parse_recommendation_response(self, response: str, menu_item: Dict) -> Dict[str, Any]:
         """
         Parse the AI response into structured wine recommendations.
@@ -624,6 +724,13 @@ class WineRecommender:
         """
         return get_wine_pairing_prompt(menu_items, format_type="json")
     
+    def _is_valid_batch_response(self, response: str) -> bool:
+        """
+        True when the batch response holds a JSON object with a menu_items list.
+        """
+        parsed = parse_json_from_text(response)
+        return isinstance(parsed, dict) and isinstance(parsed.get("menu_items"), list)
+    
     def _parse_batch_recommendation_response(self, response: str, menu_items: List[Dict]) -> Dict[str, Any]:
         """
         Parse the batch recommendation response from Gemini.
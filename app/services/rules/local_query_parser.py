@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from app.db.crud.wine_summary import get_all_wine_names
+from app.utils.normalize import strip_accents
+
+logger = logging.getLogger(__name__)
+
+VINTAGE_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# Words users add to a query that never change which wine they mean
+FILLER_WORDS = {"wine", "vintage", "bottle"}
+
+# How long the in-memory index of stored wine names is trusted before reloading
+NAME_INDEX_TTL_SECONDS = int(os.getenv("LOCAL_PARSER_INDEX_TTL_SECONDS", 300))
+
+def split_vintage(text: str) -> tuple[str, str]:
+    """
+    Split a wine name or query into (name without vintage, vintage).
+    Example: '1978 Château Margaux' → ('Château Margaux', '1978')
+    """
+    vintages = VINTAGE_PATTERN.findall(text)
+    name = " ".join(VINTAGE_PATTERN.sub(" ", text).split())
+    return name, vintages[0] if len(vintages) == 1 else ""
+
+def name_tokens(name: str) -> frozenset[str]:
+    words = re.findall(r"\w+", strip_accents(name).casefold().replace("'", ""))
+    return frozenset(w for w in words if w not in FILLER_WORDS)
+
+class LocalQueryParser:
+    """
+    Deterministic query parser that resolves queries for wines already in wine_summaries
+    without an LLM call. Returns the same shape as parse_wine_query_with_gemini, or None
+    when the query is new or ambiguous and Gemini is needed.
+    """
+
+    def __init__(self, ttl_seconds: int = NAME_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._index: dict[tuple[frozenset[str], str], set[str]] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+        # Stats for reporting hit ratio and LLM time saved
+        self.hits = 0
+        self.misses = 0
+        self.ambiguous = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def add_name(self, wine: str) -> None:
+        name, vintage = split_vintage(wine)
+        tokens = name_tokens(name)
+        if tokens:
+            self._index.setdefault((tokens, vintage), set()).add(wine)
+
+    async def _ensure_index(self, session) -> None:
+        if time.monotonic() - self._loaded_at < self.ttl_seconds:
+            return
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self.ttl_seconds:
+                return
+            names = await get_all_wine_names(session)
+            self._index = {}
+            for wine in names:
+                self.add_name(wine)
+            self._loaded_at = time.monotonic()
+            logger.info(f"[LOCAL-PARSE] Indexed {len(names)} stored wine names")
+
+    async def parse(self, session, query: str) -> dict | None:
+        try:
+            await self._ensure_index(session)
+        except Exception as e:
+            logger.warning(f"[LOCAL-PARSE] Could not load stored wine names: {e}")
+            await session.rollback()
+            return None
+
+        name, vintage = split_vintage(query)
+        matches = self._index.get((name_tokens(name), vintage), set())
+
+        if len(matches) != 1:
+            if len(matches) > 1:
+                self.ambiguous += 1
+                logger.info(f"[LOCAL-PARSE] Ambiguous query '{query}': {sorted(matches)}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        matched_wine = next(iter(matches))
+        stored_name, _ = split_vintage(matched_wine)
+        logger.info(
+            f"[LOCAL-PARSE] Resolved '{query}' locally — hit ratio {self.hit_ratio:.0%}, "
+            f"~{self.seconds_saved:.1f}s of LLM parsing saved so far"
+        )
+        # matched_wine is the stored name, so the DB lookup that follows is an exact hit
+        return {"winery": "", "wine_name": stored_name, "vintage": vintage, "matched_wine": matched_wine}
+
+    def record_llm_parse(self, duration: float) -> None:
+        self.llm_calls += 1
+        self.llm_seconds += duration
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        # Estimate: every local hit avoided one average-length Gemini parse
+        avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+        return self.hits * avg_llm
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ambiguous": self.ambiguous,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "llm_calls": self.llm_calls,
+            "avg_llm_parse_seconds": round(self.llm_seconds / self.llm_calls, 3) if self.llm_calls else None,
+            "estimated_seconds_saved": round(self.seconds_saved, 2),
+        }
+
+local_query_parser = LocalQueryParser()
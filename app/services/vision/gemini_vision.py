@@ -3,7 +3,9 @@ import base64
 import logging
 from typing import Dict, Any, Optional
 from app.exceptions import GeminiApiError
-from app.utils.env import setup_gemini_env
+from app.utils.env import configure_gemini
+from app.services.llm.gemini_engine import generate_for_task
+from app.services.llm.tasks import LLMTask
 from app.utils.llm_parsing import parse_json_from_text
 
 logger = logging.getLogger(__name__)
@@ -14,7 +16,8 @@ class GeminiVisionAnalyzer:
     """
     
     def __init__(self):
-        self.api_key, self.model_name, self.model = setup_gemini_env()
+        # Fail fast on a missing API key; the model is picked per task by generate_for_task
+        configure_gemini()
         
     def analyze_wine_label(self, base64_image: str, image_metadata: dict) -> Dict[str, Any]:
         """
@@ -38,10 +41,7 @@ class GeminiVisionAnalyzer:
             }
             
             # Call Gemini Vision API
-            response = self.model.generate_content(
-                [prompt, image_data],
-                generation_config={"temperature": 0.3}  # Lower temperature for more factual extraction
-            )
+            response = generate_for_task(LLMTask.LABEL_VISION, [prompt, image_data])
             
             # Parse the response
             raw_text = response.text
@@ -162,13 +162,7 @@ Analyze the image now and return only the JSON response:
             }
             
             # Call Gemini Vision API with optimized settings for complex menus
-            response = self.model.generate_content(
-                [prompt, image_data],
-                generation_config={
-                    "temperature": 0.2,  # Lower temperature for more consistent parsing
-                    "max_output_tokens": 4096,  # Increased for complex menus with many items
-                }
-            )
+            response = generate_for_task(LLMTask.MENU_VISION, [prompt, image_data])
             
             # Parse the response
             raw_text = response.text
@@ -293,10 +287,7 @@ Analyze the menu image now and return only the JSON response:
                 'data': base64_image
             }
             
-            response = self.model.generate_content(
-                [prompt, image_data],
-                generation_config={"temperature": 0.1}
-            )
+            response = generate_for_task(LLMTask.TEXT_EXTRACTION, [prompt, image_data])
             
             return response.text.strip()
             
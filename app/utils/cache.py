@@ -1,284 +1,455 @@
-import aiofiles
-import json
+import asyncio
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Callable, Awaitable, Any, Optional
-from hashlib import sha1, sha256
+from hashlib import sha256
+from app.config import (
+    CACHE_ROOT,
+    CACHE_NAMESPACES,
+    CACHE_DEFAULT_NAMESPACE,
+    CACHE_MAX_BYTES,
+    CACHE_SWEEP_INTERVAL_SECONDS,
+)
+from app.utils.cache_codec import encode_entry, decode_entry
+from app.utils.cache_index import CacheIndex
+from app.utils.single_flight import SingleFlight, SyncSingleFlight
+from app.utils.metrics import LatencyHistogram
 
 logger = logging.getLogger(__name__)
 
-CACHE_ROOT = "cache"
-IS_PROD = os.getenv("ENV") == "prod"
+@dataclass(frozen=True)
+class CacheNamespace:
+    name: str
+    ttl_seconds: int            # default TTL, set() can override per entry
+    max_entries: int            # in-memory LRU size; the disk tier is not bounded by count
 
-def get_cache_path(category: str, key: str) -> str:
-    os.makedirs(os.path.join(CACHE_ROOT, category), exist_ok=True)
-    hashed_key = sha1(key.encode()).hexdigest()[:10]
-    return os.path.join(CACHE_ROOT, category, f"{hashed_key}.json")
+@dataclass
+class NamespaceStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    expirations: int = 0        # entries found or swept past their TTL
+    evictions: int = 0          # in-memory LRU evictions
+    disk_evictions: int = 0     # files evicted to stay under max_bytes
+    bytes_written: int = 0
+    bytes_evicted: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
 
-def get_cache_or_fetch(category: str, key: str, fetch_func: Callable[[], Any]) -> Any:
-    """
-    Check if result is already cached.
-    If not, fetch it and cache the result.
-    Skip all caching in production.
-    """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping cache read/write for: {key}")
-        return fetch_func()
-
-    path = get_cache_path(category, key)
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            print(f"Cache hit: {path}")
-            return json.load(f)
-
-    logger.info(f"Cache miss: {key} — calling fetch function...")
-    result = fetch_func()
-    with open(path, "w") as f:
-        json.dump(result, f, indent=2)
-    return result
+    def to_dict(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        latency = self.latency.to_dict()
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+            "bytes_written": self.bytes_written,
+            "bytes_evicted": self.bytes_evicted,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            "avg_lookup_ms": latency["avg_ms"],
+            "latency": latency,
+        }
 
-async def get_cache_or_fetch_async(category: str, key: str, fetch_func: Callable[[], Awaitable[Any]]) -> Any:
+class TieredCache:
     """
-    Checks if file exists, loads JSON if cached.
-    Otherwise awaits fetch_func() and caches the result.
-    Skip all caching in production.
-    """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping async cache read/write for: {key}")
-        return await fetch_func()
-
-    path = get_cache_path(category, key)
-
-    if os.path.exists(path):
-        async with aiofiles.open(path, "r") as f:
-            logger.info(f"Cache hit: {path}")
-            contents = await f.read()
-            return json.loads(contents)
-
-    logger.info(f"Cache miss: {key} — calling async fetch function...")
-    result = await fetch_func()
-
-    if not result:
-        logger.warning(f"Empty result for {key}")
-    elif isinstance(result, (str, dict)) and result:
-        # Only cache if result is a non-empty string, valid JSON-like object, or dict-based
-        async with aiofiles.open(path, "w") as f:
-            await f.write(json.dumps(result, indent=2))
-    else:
-        logger.info(f"Skipping cache save: {key}")
-    
-    return result
+    Namespaced cache: an in-process LRU in front of JSON files on local disk.
 
+    Each namespace has its own TTL and LRU size (CACHE_NAMESPACES in app/config.py).
+    Values must be JSON-serializable. Behaves the same in every ENV.
 
-# Menu analysis specific cache functions
-def cache_menu_analysis(image_hash: str, analysis_result: dict, ttl_minutes: int = 15) -> None:
-    """
-    Cache menu analysis result with TTL for temporary storage.
-    Used to avoid reprocessing identical menu photos.
+    Disk files are tracked in a SQLite index (CacheIndex), so expiry sweeps and
+    LRU eviction down to max_bytes never open payload files.
     """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping menu analysis cache write for: {image_hash}")
-        return
-
-    cache_data = {
-        "result": analysis_result,
-        "cached_at": time.time(),
-        "ttl_seconds": ttl_minutes * 60
-    }
-    
-    path = get_cache_path("menu", image_hash)
-    try:
-        with open(path, "w") as f:
-            json.dump(cache_data, f, indent=2)
-    except Exception as e:
-        logger.warning(f"Failed to cache menu analysis: {e}")
 
+    def __init__(
+        self,
+        root: str = CACHE_ROOT,
+        namespaces: dict[str, dict] = CACHE_NAMESPACES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        sweep_interval_seconds: float = CACHE_SWEEP_INTERVAL_SECONDS
+    ):
+        self.root = root
+        self.namespaces = {name: CacheNamespace(name, **cfg) for name, cfg in namespaces.items()}
+        self.max_bytes = max_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._memory: dict[str, OrderedDict] = {}
+        self._stats: dict[str, NamespaceStats] = {}
+        self._lock = threading.Lock()     # pairing runs cache lookups from worker threads
 
-def get_cached_menu_analysis(image_hash: str) -> Optional[dict]:
-    """
-    Retrieve cached menu analysis if exists and not expired.
-    Returns None if cache miss or expired.
-    """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping menu analysis cache read for: {image_hash}")
-        return None
+        self._index: Optional[CacheIndex] = None
+        self._pending_touches: dict[str, float] = {}   # path → last access, flushed on sweep
+        self._approx_bytes = 0
+        self._last_sweep = time.monotonic()
+        self.expired_removed = 0
+        self.bytes_evicted = 0
 
-    path = get_cache_path("menu", image_hash)
-    if not os.path.exists(path):
-        return None
+    @property
+    def index(self) -> CacheIndex:
+        # Opened lazily so importing this module doesn't touch the filesystem
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    index = CacheIndex(os.path.join(self.root, "index.sqlite3"))
+                    if index.created:
+                        self._rebuild_index(index)
+                    self._approx_bytes = index.total_bytes()
+                    self._index = index
+        return self._index
 
-    try:
-        with open(path, "r") as f:
-            cache_data = json.load(f)
-        
-        cached_at = cache_data.get("cached_at", 0)
-        ttl_seconds = cache_data.get("ttl_seconds", 900)  # default 15 min
-        
-        if time.time() - cached_at > ttl_seconds:
-            logger.info(f"Menu analysis cache expired: {image_hash}")
-            os.remove(path)  # cleanup expired cache
-            return None
-        
-        return cache_data.get("result")
-        
-    except Exception as e:
-        logger.warning(f"Failed to read menu analysis cache: {e}")
-        return None
+    def _rebuild_index(self, index: CacheIndex) -> None:
+        """
+        One-time scan of an unindexed cache directory. Unreadable files are removed;
+        .json files from the previous format are left for app/scripts/migrate_cache_format.py.
+        """
+        indexed = removed = 0
+        for namespace in os.listdir(self.root):
+            namespace_path = os.path.join(self.root, namespace)
+            if not os.path.isdir(namespace_path):
+                continue
+            for dirpath, _, filenames in os.walk(namespace_path):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if filename.endswith(".json"):
+                        continue    # previous format, left for app/scripts/migrate_cache_format.py
+                    try:
+                        with open(path, "rb") as f:
+                            expires_at = decode_entry(f).get("expires_at")
+                    except Exception:
+                        expires_at = None
+                    if expires_at is None:
+                        self._remove_file(path)
+                        removed += 1
+                        continue
+                    index.record_write(path, namespace, os.path.getsize(path), expires_at)
+                    indexed += 1
+        logger.info(f"[CACHE] Built disk index: {indexed} files indexed, {removed} legacy files removed")
 
+    def namespace(self, name: str) -> CacheNamespace:
+        if name not in self.namespaces:
+            self.namespaces[name] = CacheNamespace(name, **CACHE_DEFAULT_NAMESPACE)
+        return self.namespaces[name]
 
-def generate_image_hash(image_data: bytes) -> str:
-    """
-    Generate consistent hash for image data.
-    Used for caching menu analysis results.
-    """
-    return sha256(image_data).hexdigest()[:16]  # 16 chars for shorter file names
+    def _path(self, namespace: str, key: str) -> str:
+        digest = sha256(key.encode()).hexdigest()
+        return os.path.join(self.root, namespace, digest[:2], f"{digest}.bin")
 
+    def _remember(self, namespace: str, key: str, value: Any, expires_at: float) -> None:
+        ns = self.namespace(namespace)
+        with self._lock:
+            memory = self._memory.setdefault(namespace, OrderedDict())
+            memory[key] = (expires_at, value)
+            memory.move_to_end(key)
+            while len(memory) > ns.max_entries:
+                memory.popitem(last=False)
+                self._stat(namespace).evictions += 1
 
-def cache_wine_recommendations(food_hash: str, recommendations: dict, ttl_minutes: int = 15) -> None:
-    """
-    Cache wine recommendations for food items with TTL.
-    Used to avoid regenerating recommendations for similar food descriptions.
-    """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping wine recommendations cache write for: {food_hash}")
-        return
-
-    cache_data = {
-        "recommendations": recommendations,
-        "cached_at": time.time(),
-        "ttl_seconds": ttl_minutes * 60
-    }
-    
-    path = get_cache_path("pairing", food_hash)
-    try:
-        with open(path, "w") as f:
-            json.dump(cache_data, f, indent=2)
-    except Exception as e:
-        logger.warning(f"Failed to cache wine recommendations: {e}")
+    def _stat(self, namespace: str) -> NamespaceStats:
+        # Caller holds self._lock
+        return self._stats.setdefault(namespace, NamespaceStats())
 
+    def _read_disk(self, namespace: str, key: str) -> Optional[tuple[float, Any]]:
+        path = self._path(namespace, key)
+        try:
+            with open(path, "rb") as f:
+                entry = decode_entry(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[CACHE] Unreadable {namespace} entry for {key}: {e}")
+            return None
 
-def get_cached_wine_recommendations(food_hash: str) -> Optional[dict]:
-    """
-    Retrieve cached wine recommendations if exists and not expired.
-    Returns None if cache miss or expired.
-    """
-    if IS_PROD:
-        logger.debug(f"[Prod] Skipping wine recommendations cache read for: {food_hash}")
-        return None
+        if entry.get("key") != key or entry.get("expires_at", 0) < time.time():
+            if entry.get("key") == key:
+                with self._lock:
+                    self._stat(namespace).expirations += 1
+            self._remove_file(path)
+            self.index.remove([path])
+            return None
+        return entry["expires_at"], entry["value"]
 
-    path = get_cache_path("pairing", food_hash)
-    if not os.path.exists(path):
-        return None
+    def _remove_file(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
-    try:
-        with open(path, "r") as f:
-            cache_data = json.load(f)
-        
-        cached_at = cache_data.get("cached_at", 0)
-        ttl_seconds = cache_data.get("ttl_seconds", 900)  # default 15 min
-        
-        if time.time() - cached_at > ttl_seconds:
-            logger.info(f"Wine recommendations cache expired: {food_hash}")
-            os.remove(path)  # cleanup expired cache
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        start = time.perf_counter()
+        now = time.time()
+        with self._lock:
+            stats = self._stat(namespace)
+            memory = self._memory.setdefault(namespace, OrderedDict())
+            cached = memory.get(key)
+            if cached is not None and cached[0] < now:
+                del memory[key]
+                stats.expirations += 1
+                cached = None
+            if cached is not None:
+                memory.move_to_end(key)
+                stats.memory_hits += 1
+                stats.latency.observe(time.perf_counter() - start)
+                self._pending_touches[self._path(namespace, key)] = now
+                return cached[1]
+
+        on_disk = self._read_disk(namespace, key)
+        with self._lock:
+            if on_disk is None:
+                stats.misses += 1
+            else:
+                stats.disk_hits += 1
+                self._pending_touches[self._path(namespace, key)] = now
+            stats.latency.observe(time.perf_counter() - start)
+
+        if on_disk is None:
             return None
-        
-        return cache_data.get("recommendations")
-        
-    except Exception as e:
-        logger.warning(f"Failed to read wine recommendations cache: {e}")
-        return None
+        expires_at, value = on_disk
+        logger.info(f"[CACHE] {namespace} disk hit: {key}")
+        self._remember(namespace, key, value, expires_at)
+        return value
 
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.namespace(namespace).ttl_seconds
+        expires_at = time.time() + ttl
+        self._remember(namespace, key, value, expires_at)
 
-def cleanup_expired_cache() -> None:
-    """
-    Cleanup expired cache files for menu and pairing categories.
-    Can be called periodically or on app startup.
-    """
-    if IS_PROD:
-        return
-    
-    categories = ["menu", "pairing"]
-    for category in categories:
-        cache_dir = os.path.join(CACHE_ROOT, category)
-        if not os.path.exists(cache_dir):
-            continue
-            
-        for filename in os.listdir(cache_dir):
-            if not filename.endswith(".json"):
-                continue
-                
-            file_path = os.path.join(cache_dir, filename)
-            try:
-                with open(file_path, "r") as f:
-                    cache_data = json.load(f)
-                
-                cached_at = cache_data.get("cached_at", 0)
-                ttl_seconds = cache_data.get("ttl_seconds", 900)
-                
-                if time.time() - cached_at > ttl_seconds:
-                    os.remove(file_path)
-                    logger.info(f"Removed expired cache file: {file_path}")
-                    
-            except Exception as e:
-                logger.warning(f"Failed to check cache file {file_path}: {e}")
-                # Remove corrupted cache files
+        path = self._path(namespace, key)
+        try:
+            payload = encode_entry({"key": key, "expires_at": expires_at, "value": value})
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            self.index.record_write(path, namespace, len(payload), expires_at)
+        except Exception as e:
+            logger.warning(f"[CACHE] Failed to store {namespace} entry for {key}: {e}")
+            return
 
+        with self._lock:
+            stats = self._stat(namespace)
+            stats.sets += 1
+            stats.bytes_written += len(payload)
+            self._approx_bytes += len(payload)
+            due = (
+                self._approx_bytes > self.max_bytes
+                or time.monotonic() - self._last_sweep > self.sweep_interval_seconds
+            )
+        if due:
+            self.sweep()
 
-def clear_all_cache() -> dict:
-    """
-    Clear all cache files from all categories.
-    This completely removes all cached data.
-    """
-    if IS_PROD:
-        logger.warning("Cache clearing is disabled in production mode")
-        return {"status": "disabled", "message": "Cache clearing is disabled in production mode"}
-    
-    cleared_files = 0
-    cleared_categories = []
-    errors = []
-    
-    try:
-        if not os.path.exists(CACHE_ROOT):
+    def delete(self, namespace: str, key: str) -> None:
+        path = self._path(namespace, key)
+        with self._lock:
+            self._memory.get(namespace, {}).pop(key, None)
+            self._pending_touches.pop(path, None)
+        self._remove_file(path)
+        self.index.remove([path])
+
+    def sweep(self) -> dict:
+        """
+        Remove expired files, then evict least recently used files until the disk
+        tier is back under 90% of max_bytes. Reads only the index, never payloads.
+        """
+        index = self.index
+        with self._lock:
+            touches, self._pending_touches = self._pending_touches, {}
+            self._last_sweep = time.monotonic()
+        index.touch_many(touches)
+
+        expired = index.expired(time.time())
+        for path, _ in expired:
+            self._remove_file(path)
+        index.remove([path for path, _ in expired])
+
+        evicted = []
+        total = index.total_bytes()
+        if total > self.max_bytes:
+            evicted = index.least_recently_used(total - int(self.max_bytes * 0.9))
+            for path, _, _ in evicted:
+                self._remove_file(path)
+            index.remove([path for path, _, _ in evicted])
+            freed = total - index.total_bytes()
+            total -= freed
+            self.bytes_evicted += freed
+            logger.info(f"[CACHE] Evicted {len(evicted)} files ({freed:,} bytes) to stay under {self.max_bytes:,} bytes")
+
+        with self._lock:
+            self._approx_bytes = total
+            self.expired_removed += len(expired)
+            for _, namespace in expired:
+                self._stat(namespace).expirations += 1
+            for _, namespace, size in evicted:
+                stats = self._stat(namespace)
+                stats.disk_evictions += 1
+                stats.bytes_evicted += size
+        return {"expired": len(expired), "evicted": len(evicted), "disk_bytes": total}
+
+    async def get_async(self, namespace: str, key: str) -> Optional[Any]:
+        # Disk reads go to a worker thread so large entries (crawled HTML) don't block the loop
+        return await asyncio.to_thread(self.get, namespace, key)
+
+    async def set_async(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        await asyncio.to_thread(self.set, namespace, key, value, ttl_seconds)
+
+    def clear(self) -> dict:
+        """
+        Drop both tiers for every namespace.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._pending_touches.clear()
+            self._approx_bytes = 0
+        self.index.clear()
+
+        cleared_files = 0
+        cleared_categories = []
+        errors = []
+
+        if not os.path.exists(self.root):
             return {"status": "success", "message": "No cache directory found", "files_cleared": 0}
-        
-        # Get all cache categories
-        for category in os.listdir(CACHE_ROOT):
-            category_path = os.path.join(CACHE_ROOT, category)
+
+        for category in os.listdir(self.root):
+            category_path = os.path.join(self.root, category)
             if not os.path.isdir(category_path):
                 continue
-                
+
             category_files = 0
             try:
-                for filename in os.listdir(category_path):
-                    file_path = os.path.join(category_path, filename)
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
+                for dirpath, _, filenames in os.walk(category_path):
+                    for filename in filenames:
+                        os.remove(os.path.join(dirpath, filename))
                         category_files += 1
-                        cleared_files += 1
-                
-                if category_files > 0:
-                    cleared_categories.append(f"{category} ({category_files} files)")
-                    logger.info(f"Cleared {category_files} files from {category} cache")
-                    
             except Exception as e:
                 error_msg = f"Failed to clear {category} cache: {str(e)}"
                 errors.append(error_msg)
                 logger.error(error_msg)
-        
+
+            if category_files > 0:
+                cleared_files += category_files
+                cleared_categories.append(f"{category} ({category_files} files)")
+                logger.info(f"Cleared {category_files} files from {category} cache")
+
         result = {
             "status": "success",
             "files_cleared": cleared_files,
             "categories_cleared": cleared_categories,
         }
-        
         if errors:
             result["errors"] = errors
-            
-        logger.info(f"Cache clearing completed: {cleared_files} files cleared from categories: {cleared_categories}")
         return result
-        
+
+    def stats(self) -> dict:
+        disk_usage = self.index.namespace_usage()
+        with self._lock:
+            names = set(self._stats) | set(disk_usage)
+            return {
+                name: {
+                    **self._stats.get(name, NamespaceStats()).to_dict(),
+                    "memory_entries": len(self._memory.get(name, {})),
+                    "disk_files": disk_usage.get(name, {}).get("files", 0),
+                    "disk_bytes": disk_usage.get(name, {}).get("bytes", 0),
+                    "ttl_seconds": self.namespace(name).ttl_seconds,
+                }
+                for name in sorted(names)
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+cache = TieredCache()
+
+# Concurrent misses on the same cache entry share one fetch
+fetch_flight = SingleFlight()
+sync_fetch_flight = SyncSingleFlight()
+
+def get_cache_or_fetch(category: str, key: str, fetch_func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """
+    Return the cached value for key in the category namespace,
+    otherwise call fetch_func() and cache its result.
+    Concurrent misses on the same key wait for the first caller's fetch.
+    """
+    cached = cache.get(category, key)
+    if cached is not None:
+        return cached
+
+    def fetch():
+        logger.info(f"Cache miss: {key} — calling fetch function...")
+        result = fetch_func()
+        if result is not None:
+            cache.set(category, key, result)
+        return result
+
+    result, _ = sync_fetch_flight.do(f"{category}:{key}", fetch, timeout=timeout)
+    return result
+
+async def get_cache_or_fetch_async(
+    category: str,
+    key: str,
+    fetch_func: Callable[[], Awaitable[Any]],
+    timeout: Optional[float] = None
+) -> Any:
+    """
+    Async version of get_cache_or_fetch. Empty results are not cached.
+    """
+    cached = await cache.get_async(category, key)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        logger.info(f"Cache miss: {key} — calling async fetch function...")
+        result = await fetch_func()
+
+        if not result:
+            logger.warning(f"Empty result for {key}")
+        else:
+            await cache.set_async(category, key, result)
+        return result
+
+    result, _ = await fetch_flight.do(f"{category}:{key}", fetch, timeout=timeout)
+    return result
+
+def generate_image_hash(image_data: bytes) -> str:
+    """
+    Generate consistent hash for image data.
+    Used for caching menu analysis results.
+    """
+    return sha256(image_data).hexdigest()[:16]  # 16 chars for shorter file names
+
+def cleanup_expired_cache() -> None:
+    """
+    Remove expired entries from the disk tier and enforce its byte budget.
+    Also runs automatically from set() every CACHE_SWEEP_INTERVAL_SECONDS.
+    """
+    result = cache.sweep()
+    if result["expired"] or result["evicted"]:
+        logger.info(f"Cache sweep removed {result['expired']} expired and {result['evicted']} evicted files")
+
+def clear_all_cache() -> dict:
+    """
+    Clear all cache files from all categories, plus the in-memory tier.
+    This completely removes all cached data. Disabled in production, where the
+    caches are shared by every user and rebuilding them costs LLM and search quota.
+    """
+    if os.getenv("ENV", "prod") == "prod":
+        logger.warning("Cache clearing is disabled in production mode")
+        return {"status": "disabled", "message": "Cache clearing is disabled in production mode"}
+
+    try:
+        result = cache.clear()
+        logger.info(f"Cache clearing completed: {result.get('files_cleared', 0)} files cleared")
+        return result
     except Exception as e:
         error_msg = f"Failed to clear cache: {str(e)}"
         logger.error(error_msg)
-        return {"status": "error", "message": error_msg}
\ No newline at end of file
+        return {"status": "error", "message": error_msg}
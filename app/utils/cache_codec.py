@@ -0,0 +1,74 @@
+"""
+On-disk format for cache entries:
+
+    b"WAC" | format version (1 byte) | codec (1 byte) | payload
+
+The payload is compact JSON of {"key", "expires_at", "value"}, compressed with zstd when
+the zstandard package is installed, else gzip. Entries under COMPRESS_MIN_BYTES are stored raw.
+Files without the magic header are the previous plain-JSON format and still decode.
+"""
+import gzip
+import io
+import json
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:     # optional, gzip is used without it
+    zstandard = None
+
+MAGIC = b"WAC"
+FORMAT_VERSION = 1
+HEADER_SIZE = len(MAGIC) + 2
+
+CODEC_RAW = b"r"
+CODEC_GZIP = b"g"
+CODEC_ZSTD = b"z"
+DEFAULT_CODEC = CODEC_ZSTD if zstandard is not None else CODEC_GZIP
+
+COMPRESS_MIN_BYTES = 512
+ZSTD_LEVEL = 3
+GZIP_LEVEL = 5
+
+def encode_entry(entry: dict, codec: bytes = DEFAULT_CODEC) -> bytes:
+    payload = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(payload) < COMPRESS_MIN_BYTES:
+        codec = CODEC_RAW
+
+    if codec == CODEC_ZSTD:
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    elif codec == CODEC_GZIP:
+        payload = gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0)
+
+    return MAGIC + bytes([FORMAT_VERSION]) + codec + payload
+
+def decode_entry(f: BinaryIO) -> dict:
+    """
+    Read one entry from a binary file object, decompressing as a stream.
+    """
+    header = f.read(HEADER_SIZE)
+    if not header.startswith(MAGIC):
+        # Previous format: plain (possibly indented) JSON
+        return json.loads(header + f.read())
+
+    version, codec = header[len(MAGIC)], header[len(MAGIC) + 1:]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache format version {version}")
+
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("Cache entry is zstd-compressed but zstandard is not installed")
+        stream = zstandard.ZstdDecompressor().stream_reader(f)
+    elif codec == CODEC_GZIP:
+        stream = gzip.GzipFile(fileobj=f, mode="rb")
+    elif codec == CODEC_RAW:
+        stream = f
+    else:
+        raise ValueError(f"Unknown cache codec {codec!r}")
+
+    return json.load(io.TextIOWrapper(stream, encoding="utf-8"))
+
+def is_current_format(path: str) -> bool:
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    return header.startswith(MAGIC) and header[len(MAGIC)] == FORMAT_VERSION
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+import time
+
+class CacheIndex:
+    """
+    SQLite index of the disk cache tier: one row per cache file with its size, expiry
+    and last access time. Expiry sweeps and LRU eviction query this table instead of
+    opening cache files.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.created = not os.path.exists(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                path TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)")
+
+    def record_write(self, path: str, namespace: str, size: int, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (path, namespace, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (path, namespace, size, expires_at, time.time())
+            )
+
+    def touch_many(self, accesses: dict[str, float]) -> None:
+        if not accesses:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE path = ? AND last_access < ?",
+                [(ts, path, ts) for path, ts in accesses.items()]
+            )
+
+    def remove(self, paths: list[str]) -> None:
+        if not paths:
+            return
+        with self._lock:
+            self._conn.executemany("DELETE FROM entries WHERE path = ?", [(p,) for p in paths])
+
+    def expired(self, now: float) -> list[tuple[str, str]]:
+        """
+        (path, namespace) of every entry past its expiry.
+        """
+        with self._lock:
+            return self._conn.execute("SELECT path, namespace FROM entries WHERE expires_at < ?", (now,)).fetchall()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def least_recently_used(self, bytes_to_free: int) -> list[tuple[str, str, int]]:
+        """
+        (path, namespace, size) of the oldest-accessed entries whose sizes add up to at least bytes_to_free.
+        """
+        victims, freed = [], 0
+        with self._lock:
+            for path, namespace, size in self._conn.execute("SELECT path, namespace, size FROM entries ORDER BY last_access"):
+                if freed >= bytes_to_free:
+                    break
+                victims.append((path, namespace, size))
+                freed += size
+        return victims
+
+    def namespace_usage(self) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY namespace"
+            ).fetchall()
+        return {namespace: {"files": count, "bytes": size} for namespace, count, size in rows}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
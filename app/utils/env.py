@@ -1,7 +1,7 @@
 import os
 import sys
 import google.generativeai as genai
-from app.config import ENV, GEMINI_API_KEY, GEMINI_MODEL, DATABASE_URL, GOOGLE_API_KEY, GOOGLE_CX
+from app.config import ENV, GEMINI_API_KEY, GEMINI_MODEL, GEMINI_API_ENDPOINT, DATABASE_URL, GOOGLE_API_KEY, GOOGLE_CX
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,15 +12,39 @@ if "pytest" in sys.modules and "postgres:5432" in DATABASE_URL:
         os.environ["DATABASE_URL"] = patched_url
         logger.info(f"\nPatched DATABASE_URL for local pytest: {patched_url}")
 
-def setup_gemini_env():
+def configure_gemini():
+    if GEMINI_API_ENDPOINT:
+        # Local stand-in server (app/services/llm/gemini_stub.py), only reachable over REST
+        genai.configure(
+            api_key=GEMINI_API_KEY or "stub",
+            transport="rest",
+            client_options={"api_endpoint": GEMINI_API_ENDPOINT}
+        )
+        logger.info(f"Using Gemini stand-in at {GEMINI_API_ENDPOINT}")
+        return
+
     if ENV == "prod" and (not GEMINI_API_KEY or not GEMINI_API_KEY.startswith("AIza")):
         raise ValueError("Missing or invalid GEMINI_API_KEY — check .env")
 
     genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel(GEMINI_MODEL)
-    logger.info(f"Using Gemini Model: {GEMINI_MODEL}")
 
-    return ENV, GEMINI_API_KEY, model
+_gemini_models: dict[str, genai.GenerativeModel] = {}
+
+def get_gemini_model(model_name: str = GEMINI_MODEL) -> genai.GenerativeModel:
+    """
+    Return a GenerativeModel for model_name, configuring the client on first use.
+    Models are reused across calls; per-task model choice lives in app/services/llm/tasks.py.
+    """
+    model = _gemini_models.get(model_name)
+    if model is None:
+        if not _gemini_models:
+            configure_gemini()
+        model = _gemini_models[model_name] = genai.GenerativeModel(model_name)
+        logger.info(f"Using Gemini Model: {model_name}")
+    return model
+
+def setup_gemini_env():
+    return ENV, GEMINI_API_KEY, get_gemini_model(GEMINI_MODEL)
 
 def get_google_keys():
     """Return (api_key, cx) for Google Custom Search"""
@@ -1,12 +1,10 @@
 from sentence_transformers import SentenceTransformer, util
 from app.config import EMBEDDING_MODEL_NAME, WINE_NAME_SIM_THRESHOLD
-from app.utils.cache import get_cache_path
+from app.utils.cache import cache, fetch_flight
 from app.utils.logging import log_skipped
+from app.utils.negative_cache import negative_cache
 from typing import Awaitable, Callable
-from pathlib import Path
-import aiofiles
 import asyncio
-import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,35 +20,43 @@ async def get_relevant_text_and_cache(
 ) -> tuple[str, str]:
     """
     Fetch and cache content if semantically relevant to wine_name.
+    Empty or irrelevant pages are negative-cached so the URL isn't fetched again for this wine.
     """
     key = f"{wine_name}({url})"
-    cache_path = Path(get_cache_path(category, key))
-    if cache_path.exists():
+    cached = await cache.get_async(category, key)
+    if cached is not None:
         logger.info(f"[CACHE HIT] {key}")
-        async with aiofiles.open(cache_path, "r") as f:
-            cached = await f.read()
-            return cached.strip(), url
+        return cached.strip(), url
 
-    text = await fetch_func()
-    if not text or len(text) < 100:
-        log_skipped("Too short or empty", url)
+    if (reason := await negative_cache.url_reason(wine_name, url)):
+        log_skipped(f"Negative cache: {reason}", url)
         return "", url
 
-    if wine_name not in _embedding_cache:
-        _embedding_cache[wine_name] = _model.encode(wine_name, convert_to_tensor=True)
-    query_embedding = _embedding_cache[wine_name]
+    async def fetch_and_score() -> str:
+        text = await fetch_func()
+        if not text or len(text) < 100:
+            log_skipped("Too short or empty", url)
+            await negative_cache.remember_url(wine_name, url, "no_content")
+            return ""
 
-    page_embedding = _model.encode(text, convert_to_tensor=True)
-    score = util.cos_sim(query_embedding, page_embedding)[0].item()
-    logger.info(f"[RELEVANCE] Cosine similarity for {url}: {score:.4f}")
+        if wine_name not in _embedding_cache:
+            _embedding_cache[wine_name] = _model.encode(wine_name, convert_to_tensor=True)
+        query_embedding = _embedding_cache[wine_name]
 
-    if score < WINE_NAME_SIM_THRESHOLD:
-        log_skipped("Not relevant content", url)
-        return "", url
+        page_embedding = _model.encode(text, convert_to_tensor=True)
+        score = util.cos_sim(query_embedding, page_embedding)[0].item()
+        logger.info(f"[RELEVANCE] Cosine similarity for {url}: {score:.4f}")
+
+        if score < WINE_NAME_SIM_THRESHOLD:
+            log_skipped("Not relevant content", url)
+            await negative_cache.remember_url(wine_name, url, "irrelevant")
+            return ""
 
-    async with aiofiles.open(cache_path, "w") as f:
-        await f.write(json.dumps(text, indent=2))
+        await cache.set_async(category, key, text)
+        return text
 
+    # Concurrent requests crawling the same URL for the same wine share one fetch
+    text, _ = await fetch_flight.do(f"{category}:{key}", fetch_and_score)
     return text, url
 
 async def gather_in_chunks(tasks: list, chunk_size: int):
@@ -0,0 +1,69 @@
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+# Upper bounds in milliseconds; lookups slower than the last bound land in "+Inf"
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+@dataclass
+class LatencyHistogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    total_ms: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total_ms += ms
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        count = sum(self.counts)
+        return {
+            "count": count,
+            "avg_ms": round(self.total_ms / count, 3) if count else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+@dataclass
+class LookupStats:
+    hits: int = 0
+    misses: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "latency": self.latency.to_dict(),
+        }
+
+class LookupMetrics:
+    """
+    Hit/miss counters and latency histograms for lookups that aren't TieredCache
+    namespaces, e.g. stored summaries and pairings read back from the database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, LookupStats] = {}
+
+    def record(self, name: str, hit: bool, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, LookupStats())
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+            stats.latency.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+lookup_metrics = LookupMetrics()
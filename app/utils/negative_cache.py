@@ -0,0 +1,50 @@
+import logging
+from typing import Optional
+from app.config import NEGATIVE_CACHE_TTLS
+from app.utils.cache import TieredCache, cache
+
+logger = logging.getLogger(__name__)
+
+class NegativeCache:
+    """
+    Remembers work that produced nothing, so it isn't repeated until a short TTL expires:
+    URLs that failed or weren't relevant for a wine, and searches with no results.
+    Stored in the "negative" cache namespace with a TTL per reason (NEGATIVE_CACHE_TTLS).
+    """
+
+    NAMESPACE = "negative"
+
+    def __init__(self, store: TieredCache = cache, ttls: dict[str, int] = NEGATIVE_CACHE_TTLS):
+        self.store = store
+        self.ttls = ttls
+
+    @staticmethod
+    def _url_key(wine_name: str, url: str) -> str:
+        return f"url:{wine_name}({url})"
+
+    @staticmethod
+    def _search_key(query: str) -> str:
+        return f"search:{query}"
+
+    async def url_reason(self, wine_name: str, url: str) -> Optional[str]:
+        """
+        Why url was skipped for wine_name recently, or None if it should be fetched.
+        """
+        entry = await self.store.get_async(self.NAMESPACE, self._url_key(wine_name, url))
+        return entry["reason"] if entry else None
+
+    async def remember_url(self, wine_name: str, url: str, reason: str) -> None:
+        await self.store.set_async(
+            self.NAMESPACE, self._url_key(wine_name, url), {"reason": reason}, ttl_seconds=self.ttls[reason]
+        )
+
+    def is_empty_search(self, query: str) -> bool:
+        return self.store.get(self.NAMESPACE, self._search_key(query)) is not None
+
+    def remember_empty_search(self, query: str) -> None:
+        logger.info(f"[NEGATIVE-CACHE] No search results for '{query}'")
+        self.store.set(
+            self.NAMESPACE, self._search_key(query), {"reason": "empty_search"}, ttl_seconds=self.ttls["empty_search"]
+        )
+
+negative_cache = NegativeCache()
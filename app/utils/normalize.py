@@ -1,7 +1,47 @@
+import unicodedata
+
 def to_title_case_wine_name(text: str) -> str:
     """
     Capitalize each word in a wine name, keeping numbers unchanged.
     Example: 'opus one 2015' → 'Opus One 2015'
     """
     parts = text.strip().split()
-    return " ".join([p.capitalize() if not p.isdigit() else p for p in parts])
\ No newline at end of file
+    return " ".join([p.capitalize() if not p.isdigit() else p for p in parts])
+
+def canonical_wine_key(text: str) -> str:
+    """
+    Normalize a wine name into a stable lookup key (case and whitespace insensitive).
+    Example: '  Opus ONE   2015 ' → 'opus one 2015'
+    """
+    return " ".join(text.casefold().split())
+
+def strip_accents(text: str) -> str:
+    """
+    Drop combining marks so accented and plain spellings compare equal.
+    Example: 'Château Léoville' → 'Chateau Leoville'
+    """
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance between two strings (insertions, deletions, substitutions).
+    """
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def join_wine_name(winery: str, wine: str, vintage: str) -> str:
+    """
+    Combine parsed winery, wine and vintage into the name used for search and DB lookup.
+    """
+    if wine.casefold() in winery.casefold():
+        wine_name = f"{winery} {vintage}"
+    elif winery.casefold() in wine.casefold():
+        wine_name = f"{wine} {vintage}"
+    else:
+        wine_name = f"{winery} {wine} {vintage}"
+    return wine_name.strip()
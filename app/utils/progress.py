@@ -0,0 +1,62 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+class ProgressReporter:
+    """
+    Collects pipeline stage events with timings for a single streamed analysis.
+    Stage names match AnalysisStage in frontend/src/types/Progress.ts.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.started_at = time.perf_counter()
+        self.timings: dict[str, int] = {}
+        self._stage: Optional[str] = None
+        self._stage_started_at = self.started_at
+
+    def _close_stage(self, now: float) -> Optional[int]:
+        if self._stage is None:
+            return None
+        duration_ms = round((now - self._stage_started_at) * 1000)
+        self.timings[self._stage] = self.timings.get(self._stage, 0) + duration_ms
+        return duration_ms
+
+    def stage(self, stage: str, **data) -> None:
+        now = time.perf_counter()
+        event = {"stage": stage, "elapsed_ms": round((now - self.started_at) * 1000)}
+
+        previous_ms = self._close_stage(now)
+        if previous_ms is not None:
+            event["previous_stage"] = self._stage
+            event["previous_stage_ms"] = previous_ms
+
+        self._stage, self._stage_started_at = stage, now
+        event.update(data)
+        self.queue.put_nowait(("stage", event))
+
+    def finish(self) -> dict:
+        """
+        Close the running stage and return the total and per-stage timings (ms).
+        """
+        now = time.perf_counter()
+        self._close_stage(now)
+        self._stage = None
+        return {"total_ms": round((now - self.started_at) * 1000), "stages": self.timings}
+
+_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("progress_reporter", default=None)
+
+def set_progress_reporter(reporter: Optional[ProgressReporter]):
+    return _reporter.set(reporter)
+
+def reset_progress_reporter(token) -> None:
+    _reporter.reset(token)
+
+def report_stage(stage: str, **data) -> None:
+    """
+    Emit a stage event for the current request. No-op outside a streamed request.
+    """
+    reporter = _reporter.get()
+    if reporter is not None:
+        reporter.stage(stage, **data)
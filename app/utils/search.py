@@ -3,8 +3,9 @@ import requests
 import time
 from urllib.parse import urlparse
 from app.exceptions import GoogleSearchApiError
-from app.utils.cache import get_cache_or_fetch
+from app.utils.cache import cache
 from app.utils.env import get_google_keys
+from app.utils.negative_cache import negative_cache
 
 logger = logging.getLogger(__name__)
 
@@ -103,4 +104,18 @@ def google_search_links_with_retry(
 
         return results
 
-    return get_cache_or_fetch("search", query, lambda: fetch_urls(query))
\ No newline at end of file
+    cached = cache.get("search", query)
+    if cached:
+        return cached
+
+    # Empty results are kept in the negative cache with a short TTL instead of the 7-day search namespace
+    if negative_cache.is_empty_search(query):
+        logger.info(f"[NEGATIVE-CACHE] Skipping search with no recent results: '{query}'")
+        return []
+
+    results = fetch_urls(query)
+    if results:
+        cache.set("search", query, results)
+    else:
+        negative_cache.remember_empty_search(query)
+    return results
\ No newline at end of file
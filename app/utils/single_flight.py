@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """
+    Deduplicate concurrent async calls that share the same key.
+    The first caller (leader) runs the work; callers arriving while it is in flight
+    (followers) await the leader's result instead of repeating it.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> tuple[Any, bool]:
+        """
+        Run func() once per key at a time.
+        Returns (result, shared) where shared is True if the result came from another caller.
+
+        With a timeout, the leader's work is cancelled after timeout seconds and followers
+        stop waiting after timeout seconds; both raise asyncio.TimeoutError.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (fut := self._inflight.get(key)) is not None:
+            logger.info(f"[SINGLE-FLIGHT] Waiting for in-flight work: {key}")
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                # Shield so a follower going away never cancels the leader's work
+                return await asyncio.wait_for(asyncio.shield(fut), remaining), True
+            except asyncio.CancelledError:
+                if fut.cancelled():
+                    continue    # Leader was cancelled, take over as the new leader
+                raise
+
+        fut = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved even when nobody is waiting on them
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = fut
+
+        try:
+            if deadline is None:
+                result = await func()
+            else:
+                result = await asyncio.wait_for(func(), max(0.0, deadline - time.monotonic()))
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result, False
+        finally:
+            self._inflight.pop(key, None)
+
+
+class SyncSingleFlight:
+    """
+    Thread-based SingleFlight for blocking fetchers called from worker threads
+    (e.g. menu pairing batches). Followers block until the leader finishes.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+            self.waiters = 0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[str, "SyncSingleFlight._Call"] = {}
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._inflight
+
+    def waiters(self, key: str) -> int:
+        """
+        Followers currently blocked on the in-flight call for key.
+        """
+        with self._lock:
+            call = self._inflight.get(key)
+            return call.waiters if call is not None else 0
+
+    def do(self, key: str, func: Callable[[], Any], timeout: Optional[float] = None) -> tuple[Any, bool]:
+        """
+        Run func() once per key at a time. Returns (result, shared) like SingleFlight.do.
+        Followers raise TimeoutError after timeout seconds; the leader is never interrupted.
+        """
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = self._Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            logger.info(f"[SINGLE-FLIGHT] Waiting for in-flight work: {key}")
+            finished = call.done.wait(timeout)
+            with self._lock:
+                call.waiters -= 1
+            if not finished:
+                raise TimeoutError(f"Timed out after {timeout}s waiting for in-flight work: {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
@@ -170,8 +170,9 @@ export default function WineChatPage() {
   }
 
   // Wine-specific handlers
-  const handleWineSearch = async () => {
-    if (!query.trim()) return
+  // exact: analyze the query as typed instead of offering a close stored match
+  const handleWineSearch = async (searchQuery: string = query, exact: boolean = false) => {
+    if (!searchQuery.trim()) return
     setLoading(true)
     setWineResponse(null)
     setProgress(0)
@@ -186,7 +187,7 @@ export default function WineChatPage() {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
-          input: { query },
+          input: exact ? { query: searchQuery, exact: true } : { query: searchQuery },
           context: {
             model: process.env.NEXT_PUBLIC_GEMINI_MODEL,
             user_id: 'demo-user',
@@ -200,6 +201,22 @@ export default function WineChatPage() {
       
       // Wait for both progress and API response
       const [data] = await Promise.all([res.json(), progressPromise])
+
+      // A close stored match with a different name: let the user pick before analyzing
+      if (data.status === 'did_you_mean') {
+        setWineResponse({
+          status: 'did_you_mean',
+          query: searchQuery,
+          suggestion: data.did_you_mean.wine,
+          similarity: data.did_you_mean.similarity,
+        })
+        return
+      }
+
+      if (data.status === 'error') {
+        setWineResponse({ status: 'error', error: data.error })
+        return
+      }
       
       const result: WineAnalysisResponse = {
         status: 'success',
@@ -209,7 +226,7 @@ export default function WineChatPage() {
   
       // Save to history and clear query if successful
       if (result.status === 'success') {
-        saveToHistory(result, 'wine', query)
+        saveToHistory(result, 'wine', searchQuery)
         setQuery('');
       }
 
@@ -567,6 +584,31 @@ export default function WineChatPage() {
           </div>
         )}
         
+        {appMode === 'wine' && wineResponse?.status === 'did_you_mean' && (
+          <div className="bg-zinc-900 border border-zinc-700 p-4 rounded-md text-center text-sm mt-4 space-y-3">
+            <p className="text-zinc-300">
+              Did you mean <span className="font-semibold text-white">{wineResponse.suggestion}</span>?
+            </p>
+            <div className="flex flex-wrap justify-center gap-2">
+              <button
+                className="px-3 py-1 rounded-md bg-white text-black hover:bg-zinc-200"
+                onClick={() => {
+                  setQuery(wineResponse.suggestion)
+                  handleWineSearch(wineResponse.suggestion)
+                }}
+              >
+                Analyze {wineResponse.suggestion}
+              </button>
+              <button
+                className="px-3 py-1 rounded-md border border-zinc-600 text-zinc-300 hover:bg-zinc-800"
+                onClick={() => handleWineSearch(wineResponse.query, true)}
+              >
+                Use &ldquo;{wineResponse.query}&rdquo; as typed
+              </button>
+            </div>
+          </div>
+        )}
+
         {getCurrentResponse()?.status === 'success' && (
           <>
             {appMode === 'wine' ? (
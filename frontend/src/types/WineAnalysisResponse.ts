@@ -22,6 +22,12 @@ export type WineAnalysisResponse =
       sat: SATResult
       reference_source: string[]
     }
+  | {
+      status: 'did_you_mean'
+      query: string       // what the user typed
+      suggestion: string  // stored wine with a close but different name
+      similarity: number
+    }
   | {
       status: 'error'
       error: string
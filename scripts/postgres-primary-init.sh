@@ -0,0 +1,5 @@
+#!/bin/bash
+# Runs once when the primary's data directory is created (docker-entrypoint-initdb.d):
+# let the replica stream WAL as POSTGRES_USER.
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -1,5 +1,8 @@
+import json
 import os
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
+from app.db.session import get_async_session
 from app.main import app
 
 client = TestClient(app)
@@ -24,4 +27,74 @@ def test_analyze_wine_mock():
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "mocked"
-    assert "wine" in data["output"]
\ No newline at end of file
+    assert "wine" in data["output"]
+
+def test_analyze_wine_stream_mock():
+    os.environ["ENV"] = "dev"
+
+    payload = {
+        "input": {"query": "Opus One 2015"},
+        "context": {
+            "model": "gemini-2.5-flash",
+            "timestamp": "2025-04-25T00:00:00",
+            "use_mock": True
+        }
+    }
+
+    response = client.post("/api/analyze-wine/stream", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = [block for block in response.text.split("\n\n") if block.startswith("event:")]
+    assert events[-1].startswith("event: result")
+
+    result = json.loads(events[-1].split("data: ", 1)[1])
+    assert result["status"] == "mocked"
+    assert "wine" in result["output"]
+    assert "total_ms" in result["timings"]
+
+async def fake_session():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    yield session
+
+def analyze_payload(query, exact=False):
+    payload = {
+        "input": {"query": query},
+        "context": {"model": "gemini-2.5-flash", "timestamp": "2025-04-25T00:00:00", "use_mock": False}
+    }
+    if exact:
+        payload["input"]["exact"] = True
+    return payload
+
+def test_did_you_mean_round_trip_with_exact_retry():
+    handler = "app.services.handlers.wine_summary_handler"
+    parsed = {"wine_name": "Opus One 2015", "original_query": "opus one 2015"}
+    sibling = MagicMock(wine="Opus One Overture 2015")
+    fresh = AsyncMock(return_value={"status": "analyzed", "output": {"wine": "Opus One 2015"}})
+
+    app.dependency_overrides[get_async_session] = fake_session
+    try:
+        with patch("app.api.routes.handle_wine_analysis_query", AsyncMock(return_value=parsed)), \
+             patch("app.api.routes.handle_cached_wine_summary", AsyncMock(return_value=None)), \
+             patch(f"{handler}.handle_cached_wine_summary", AsyncMock(return_value=None)), \
+             patch(f"{handler}.search_similar_wines", AsyncMock(return_value=[(sibling, 0.74)])), \
+             patch(f"{handler}.try_acquire_lease", AsyncMock(return_value=True)), \
+             patch(f"{handler}.release_lease", AsyncMock()), \
+             patch(f"{handler}.handle_fresh_summary", fresh):
+            suggested = client.post("/api/analyze-wine", json=analyze_payload("opus one 2015")).json()
+            fresh.assert_not_awaited()
+
+            confirmed = client.post("/api/analyze-wine", json=analyze_payload("opus one 2015", exact=True)).json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert suggested["status"] == "did_you_mean"
+    assert suggested["did_you_mean"] == {"wine": "Opus One Overture 2015", "similarity": 0.74}
+    assert "output" not in suggested
+
+    assert confirmed["status"] == "analyzed"
+    assert confirmed["output"]["wine"] == "Opus One 2015"
+    fresh.assert_awaited_once()
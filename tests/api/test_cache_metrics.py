@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.cache import TieredCache
+from app.utils.metrics import lookup_metrics
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, monkeypatch):
+    # Keep the metrics and clear-cache routes off the repo's ./cache directory
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    monkeypatch.setattr("app.api.routes.cache", store)
+    monkeypatch.setattr("app.utils.cache.cache", store)
+    return store
+
+def test_metrics_reports_cache_db_and_llm_sections():
+    lookup_metrics.record("db_summary", True, 0.001)
+    response = client.get("/api/metrics")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"caches", "db", "llm", "db_pool"}
+    assert body["db_pool"]["checked_out"] >= 0
+    assert body["db"]["db_summary"]["hits"] >= 1
+
+def test_clear_cache_resets_metrics():
+    lookup_metrics.record("db_pairing", False, 0.001)
+    with patch("app.api.routes.clear_all_cache", return_value={"status": "success", "files_cleared": 0}):
+        response = client.post("/api/clear-cache")
+
+    assert response.json()["metrics_reset"] is True
+    assert client.get("/api/metrics").json()["db"] == {}
+
+def test_clear_cache_is_disabled_in_prod(monkeypatch):
+    monkeypatch.setenv("ENV", "prod")
+    lookup_metrics.record("db_pairing", False, 0.001)
+    response = client.post("/api/clear-cache")
+
+    assert response.json()["status"] == "disabled"
+    assert client.get("/api/metrics").json()["db"] != {}
+
+def test_metrics_reset_works_when_clear_cache_is_disabled(monkeypatch):
+    monkeypatch.setenv("ENV", "prod")
+    lookup_metrics.record("db_summary", True, 0.001)
+    response = client.post("/api/metrics/reset")
+
+    assert response.json() == {"status": "success", "metrics_reset": True}
+    assert client.get("/api/metrics").json()["db"] == {}
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.db.session import get_read_session
+from app.main import app
+
+client = TestClient(app)
+
+async def fake_session():
+    yield AsyncMock()
+
+def get_wines(rows, **params):
+    app.dependency_overrides[get_read_session] = fake_session
+    try:
+        with patch("app.api.routes.list_wine_summaries", AsyncMock(return_value=rows)) as list_wines:
+            response = client.get("/api/wines", params=params)
+    finally:
+        app.dependency_overrides.clear()
+    return response.json(), list_wines
+
+def row(wine_id, **columns):
+    return {"id": wine_id, "created_at": datetime(2026, 1, wine_id, tzinfo=timezone.utc), **columns}
+
+def test_full_page_returns_cursor_for_the_next_one():
+    body, list_wines = get_wines([row(3, wine="Opus One 2015"), row(2, wine="Barolo 2016")], limit=2, fields="wine")
+
+    assert body["items"] == [{"wine": "Opus One 2015"}, {"wine": "Barolo 2016"}]
+    assert list_wines.await_args.kwargs["fields"] == ("wine",)
+
+    _, list_wines = get_wines([], limit=2, cursor=body["next_cursor"])
+    assert list_wines.await_args.kwargs["after"] == (datetime(2026, 1, 2, tzinfo=timezone.utc), 2)
+
+def test_last_page_has_no_cursor_and_fills_empty_defaults():
+    body, _ = get_wines([row(1, wine="Barolo 2016", sat=None)], limit=2, fields="wine,sat")
+    assert body == {"items": [{"wine": "Barolo 2016", "sat": {}}], "next_cursor": None}
+
+def test_unknown_field_and_bad_cursor_are_rejected():
+    assert get_wines([], fields="wine,password")[0]["status"] == "error"
+    assert get_wines([], cursor="not-a-cursor")[0] == {"status": "error", "error": "Invalid cursor."}
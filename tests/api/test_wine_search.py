@@ -0,0 +1,24 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from app.db.session import get_read_session
+from app.main import app
+
+client = TestClient(app)
+
+async def fake_session():
+    yield AsyncMock()
+
+def test_search_returns_matches_with_scores():
+    wine = MagicMock(wine="Château Margaux 2015", region="Bordeaux")
+    app.dependency_overrides[get_read_session] = fake_session
+    try:
+        with patch("app.api.routes.search_similar_wines", AsyncMock(return_value=[(wine, 0.6667)])) as search:
+            response = client.get("/api/wines/search", params={"q": "chateau margaux 2015", "limit": 3})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.json() == [{"wine": "Château Margaux 2015", "region": "Bordeaux", "similarity": 0.667}]
+    assert search.await_args.kwargs["limit"] == 3
+
+def test_search_requires_query():
+    assert client.get("/api/wines/search").status_code == 422
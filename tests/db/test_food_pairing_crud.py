@@ -6,6 +6,12 @@ from app.db.models.food_pairing import FoodPairingCategory, FoodPairingExample
 from app.db.models.wine_summary import WineSummary
 
 
+def category_ids_result(ids):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = ids
+    return result
+
+
 class TestFoodPairingCRUD:
     
     @pytest.mark.asyncio
@@ -24,10 +30,14 @@ class TestFoodPairingCRUD:
             }
         ]
         
+        mock_session.execute.return_value = category_ids_result([10])
         await save_food_pairings(mock_session, wine_id, data)
         
-        assert mock_session.add.call_count == 3
-        assert mock_session.flush.call_count == 1
+        assert mock_session.execute.call_count == 2
+        categories, examples = (c.args[1] for c in mock_session.execute.call_args_list)
+        assert categories == [{"wine_id": 1, "category": "Beef", "base_category": "Beef"}]
+        assert [e["category_id"] for e in examples] == [10, 10]
+        assert not mock_session.flush.called
         assert mock_session.commit.called
     
     @pytest.mark.asyncio
@@ -53,10 +63,15 @@ class TestFoodPairingCRUD:
             }
         ]
         
+        mock_session.execute.return_value = category_ids_result([10, 11])
         await save_food_pairings(mock_session, wine_id, data)
         
-        assert mock_session.add.call_count == 5
-        assert mock_session.flush.call_count == 2
+        # One INSERT ... RETURNING for both categories, one executemany for all examples
+        assert mock_session.execute.call_count == 2
+        examples = mock_session.execute.call_args_list[1].args[1]
+        assert [(e["category_id"], e["food"]) for e in examples] == [
+            (10, "Grilled Steak"), (11, "Aged Cheddar"), (11, "Blue Cheese")
+        ]
         assert mock_session.commit.called
     
     @pytest.mark.asyncio
@@ -72,10 +87,10 @@ class TestFoodPairingCRUD:
             }
         ]
         
+        mock_session.execute.return_value = category_ids_result([10])
         await save_food_pairings(mock_session, wine_id, data)
         
-        assert mock_session.add.call_count == 1
-        assert mock_session.flush.call_count == 1
+        assert mock_session.execute.call_count == 1
         assert mock_session.commit.called
     
     @pytest.mark.asyncio
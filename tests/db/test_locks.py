@@ -0,0 +1,25 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from app.db.locks import try_acquire_lease, release_lease
+
+@pytest.mark.asyncio
+async def test_lease_is_taken_only_when_free_or_expired_and_committed_at_once():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(scalar=MagicMock(return_value=None))
+
+    assert not await try_acquire_lease(session, "opus one 2015", "abc", 120)
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (key) DO UPDATE" in sql
+    assert "WHERE summary_leases.expires_at < now()" in sql
+    session.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_release_only_deletes_own_lease():
+    session = AsyncMock()
+    await release_lease(session, "opus one 2015", "abc")
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "summary_leases.key = " in sql and "summary_leases.holder = " in sql
+    session.commit.assert_awaited_once()
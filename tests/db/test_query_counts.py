@@ -0,0 +1,80 @@
+"""
+Statements each read path issues against the migrated database. Rows are seeded in a
+transaction that is rolled back; only statements sent by the read path are counted.
+"""
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.crud.food_pairing import save_food_pairings
+from app.db.crud.wine_summary import list_wine_summaries, save_wine_summary, search_similar_wines
+from app.db.models.wine_summary import WineSummary
+from app.db.session import engine
+from app.models.mcp_model import MCPContext, WineMCPRequest
+from app.services.handlers.food_pairing_handler import handle_cached_pairings
+from app.services.handlers.wine_summary_handler import handle_cached_wine_summary
+
+WINE_NAME = "Query Count Test Wine 2015"
+WINE = {
+    "wine": WINE_NAME, "query_text": "query count test", "region": "Napa Valley",
+    "grape_varieties": "Cabernet Sauvignon", "appearance": "", "nose": "", "palate": "", "aging": "",
+    "average_price": "", "quality": "", "analysis": "", "reference_source": [],
+    "sat": {"score": 3, "quality": "Good", "criteria": [], "aroma": {}},
+}
+PAIRINGS = [
+    {"category": "Beef", "base_category": "Beef", "examples": [{"food": "Steak", "reason": "Tannins"}]},
+    {"category": "Cheese", "base_category": "Cheese", "examples": [{"food": "Cheddar", "reason": "Acidity"}]},
+]
+
+@asynccontextmanager
+async def seeded_session():
+    async with engine.connect() as conn:
+        outer = await conn.begin()
+        session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+        try:
+            await save_wine_summary(session, dict(WINE))
+            wine_id = await session.scalar(select(WineSummary.id).where(WineSummary.wine == WINE_NAME))
+            await save_food_pairings(session, wine_id, PAIRINGS)
+            session.expunge_all()   # start the read path with an empty identity map, like a new request
+            yield session
+        finally:
+            await session.close()
+            await outer.rollback()
+
+@asynccontextmanager
+async def count_statements():
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+@pytest.mark.asyncio
+async def test_cached_summary_is_one_statement_without_join():
+    request = WineMCPRequest(input={"query": WINE_NAME}, context=MCPContext(model="test", timestamp=datetime.now(timezone.utc)))
+    async with seeded_session() as session, count_statements() as statements:
+        assert await handle_cached_wine_summary(session, WINE_NAME, request)
+
+    assert len(statements) == 1
+    assert "JOIN" not in statements[0]
+
+@pytest.mark.asyncio
+async def test_cached_pairings_are_three_statements():
+    async with seeded_session() as session, count_statements() as statements:
+        cached, _ = await handle_cached_pairings(session, WINE_NAME)
+
+    assert len(cached["output"].pairings) == 2
+    assert len(statements) == 3     # wine, categories, examples
+
+@pytest.mark.asyncio
+async def test_wine_listing_and_search_statements():
+    async with seeded_session() as session, count_statements() as statements:
+        await list_wine_summaries(session, limit=10)
+        assert len(statements) == 1
+
+        await search_similar_wines(session, WINE_NAME)
+        assert len(statements) == 3     # similarity threshold + search
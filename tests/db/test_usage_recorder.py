@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from app.db.crud.parsed_query import record_parsed_query_hits
+from app.db.crud.wine_request import record_wine_requests
+from app.db.usage_recorder import UsageRecorder
+
+def session_factory(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+def test_memo_hits_are_counted_without_a_running_loop():
+    recorder = UsageRecorder()
+    for key in ("opus one 2015", "opus one 2015", "barolo 2016"):
+        recorder.memo_hit(key)
+    assert recorder._memo_hits == {"opus one 2015": 2, "barolo 2016": 1}
+
+@pytest.mark.asyncio
+async def test_flush_writes_one_batch_and_never_raises():
+    recorder = UsageRecorder(session_factory=session_factory(AsyncMock()))
+    recorder._memo_hits = {"opus one 2015": 2}
+    with patch("app.db.usage_recorder.record_parsed_query_hits", AsyncMock(side_effect=Exception("db down"))) as record:
+        await recorder.flush()
+        await recorder.flush()      # nothing pending, no second write
+
+    record.assert_awaited_once()
+    assert record.await_args.args[1] == {"opus one 2015": 2}
+
+@pytest.mark.asyncio
+async def test_hits_are_added_with_one_executemany():
+    session = AsyncMock()
+    await record_parsed_query_hits(session, {"opus one 2015": 2, "barolo 2016": 1})
+
+    stmt, params = session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "SET hit_count=(parsed_queries.hit_count + %(hits)s" in sql
+    assert params == [{"key": "opus one 2015", "hits": 2}, {"key": "barolo 2016", "hits": 1}]
+
+@pytest.mark.asyncio
+async def test_wine_requests_are_aggregated_per_wine_and_flushed():
+    recorder = UsageRecorder(session_factory=session_factory(AsyncMock()))
+    with patch.object(recorder, "_ensure_flusher"):
+        recorder.wine_requested("opus one winery 2015", "Opus One Winery", "Opus One", "2015")
+        recorder.wine_requested("opus one winery 2015", "Opus One Winery", "Opus One", "2015")
+
+    with patch("app.db.usage_recorder.record_wine_requests", AsyncMock()) as record:
+        await recorder.flush()
+
+    assert record.await_args.args[1] == {
+        "opus one winery 2015": {"winery": "Opus One Winery", "wine_name": "Opus One", "vintage": "2015", "requests": 2}
+    }
+
+@pytest.mark.asyncio
+async def test_wine_requests_add_to_todays_row():
+    session = AsyncMock()
+    await record_wine_requests(session, {"barolo 2016": {"winery": "", "wine_name": "Barolo", "vintage": "2016", "requests": 3}})
+
+    stmt, params = session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (canonical_key, day) DO UPDATE SET requests = (wine_request_counts.requests + excluded.requests)" in sql
+    assert params[0]["canonical_key"] == "barolo 2016" and params[0]["requests"] == 3
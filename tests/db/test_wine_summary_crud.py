@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from app.db.crud.wine_summary import get_wine_summary_by_name, list_wine_summaries, save_wine_summary, search_similar_wines
+from app.db.models.wine_summary import WineSummary
+from app.db.session import async_session
+
+def compile_pg(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+@pytest.mark.asyncio
+async def test_lookup_is_equality_on_normalized_wine_key():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    await get_wine_summary_by_name(session, "  Opus ONE   2015 ")
+
+    sql = compile_pg(session.execute.await_args.args[0])
+    assert "wine_summaries.wine_key = 'opus one 2015'" in sql
+    assert "ILIKE" not in sql.upper()
+    assert "JOIN" not in sql    # pairings aren't eagerly joined on the analyze hot path
+
+@pytest.mark.asyncio
+async def test_save_sets_wine_key():
+    session = MagicMock()
+    session.commit = AsyncMock()
+    await save_wine_summary(session, {"wine": "Opus One 2015", "query_text": "opus one"})
+
+    assert session.add.call_args.args[0].wine_key == "opus one 2015"
+
+@pytest.mark.asyncio
+async def test_similar_wines_filters_with_trigram_operator_and_ranks_by_similarity():
+    session = AsyncMock()
+    rows = MagicMock()
+    rows.all.return_value = [(MagicMock(wine="Opus One 2015"), 0.82)]
+    session.execute.side_effect = [MagicMock(), rows]
+
+    matches = await search_similar_wines(session, "opus 1 2015", limit=3, min_similarity=0.4)
+
+    threshold_sql = compile_pg(session.execute.await_args_list[0].args[0])
+    sql = compile_pg(session.execute.await_args_list[1].args[0])
+    assert "set_config('pg_trgm.similarity_threshold', '0.4', true)" in threshold_sql
+    assert "wine_summaries.wine %% 'opus 1 2015'" in sql     # % escaped by the pyformat compiler
+    assert "score DESC" in sql and "LIMIT 3" in sql
+    assert matches[0][1] == 0.82
+
+@pytest.mark.asyncio
+async def test_listing_is_keyset_paginated_projection_without_join():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock()
+    after = (datetime(2026, 1, 2, tzinfo=timezone.utc), 42)
+    await list_wine_summaries(session, limit=20, after=after, fields=("wine", "region"))
+
+    sql = compile_pg(session.execute.await_args.args[0])
+    assert sql.startswith("SELECT wine_summaries.created_at, wine_summaries.id, wine_summaries.wine, wine_summaries.region \nFROM wine_summaries")
+    assert "(wine_summaries.created_at, wine_summaries.id) < ('2026-01-02 00:00:00+00:00', 42)" in sql
+    assert "ORDER BY wine_summaries.created_at DESC, wine_summaries.id DESC" in sql
+    assert "JOIN" not in sql and "analysis" not in sql
+
+@pytest.mark.asyncio
+async def test_wine_key_lookup_uses_unique_index():
+    """
+    Needs the migrated database. With sequential scans disabled the planner still has to
+    scan for the old ilike filter, but uses ix_wine_summaries_wine_key for the equality lookup.
+    """
+    lookup = select(WineSummary).where(WineSummary.wine_key == "opus one 2015")
+    old_lookup = select(WineSummary).where(WineSummary.wine.ilike("opus one 2015"))
+
+    async with async_session() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join((await session.execute(text(f"EXPLAIN {compile_pg(lookup)}"))).scalars())
+        old_plan = "\n".join((await session.execute(text(f"EXPLAIN {compile_pg(old_lookup)}"))).scalars())
+        await session.rollback()
+
+    assert "ix_wine_summaries_wine_key" in plan
+    assert "ix_wine_summaries_wine_key" not in old_plan
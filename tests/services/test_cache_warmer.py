@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.handlers.cache_warmer import CacheWarmer
+
+POPULAR = [("Opus One Winery", "Opus One", "2015", 12), ("", "Barolo", "2016", 3)]
+
+def session_factory(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+@pytest.mark.asyncio
+async def test_run_warms_uncached_wines_and_skips_stored_ones():
+    warmer = CacheWarmer(min_interval=0, session_factory=session_factory(AsyncMock()))
+    wine = MagicMock()
+
+    with patch("app.services.handlers.cache_warmer.get_popular_wines", AsyncMock(return_value=POPULAR)), \
+         patch("app.services.handlers.cache_warmer.handle_cached_wine_summary", AsyncMock(side_effect=[{"status": "analyzed"}, None])), \
+         patch("app.services.handlers.cache_warmer.handle_summary_once", AsyncMock(return_value={"status": "analyzed"})) as summarize, \
+         patch("app.services.handlers.cache_warmer.handle_cached_pairings", AsyncMock(return_value=(None, wine))), \
+         patch("app.services.handlers.cache_warmer.handle_food_pairing", AsyncMock(return_value={"status": "success"})) as pair:
+        report = await warmer.run(top_n=2)
+
+    assert summarize.await_args.args[1] == "Barolo 2016"
+    assert pair.await_count == 2
+    assert report["wines"] == 2
+    assert report["summaries"] == {"cached": 1, "warmed": 1}
+    assert report["pairings"] == {"warmed": 2}
+
+@pytest.mark.asyncio
+async def test_failure_on_one_wine_does_not_stop_the_run():
+    session = AsyncMock()
+    warmer = CacheWarmer(min_interval=0, session_factory=session_factory(session))
+
+    with patch("app.services.handlers.cache_warmer.get_popular_wines", AsyncMock(return_value=POPULAR)), \
+         patch("app.services.handlers.cache_warmer.handle_cached_wine_summary", AsyncMock(return_value=None)), \
+         patch("app.services.handlers.cache_warmer.handle_summary_once", AsyncMock(side_effect=[Exception("gemini down"), {"status": "analyzed"}])):
+        report = await warmer.run(top_n=2, pairings=False)
+
+    assert report["summaries"] == {"failed": 1, "warmed": 1}
+    assert "pairings" not in report
+    session.rollback.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_uncached_steps_are_spaced_by_min_interval():
+    warmer = CacheWarmer(min_interval=5)
+    with patch("app.services.handlers.cache_warmer.asyncio.sleep", AsyncMock()) as sleep:
+        await warmer._throttle()
+        await warmer._throttle()
+
+    sleep.assert_awaited_once()
+    assert 4 < sleep.await_args.args[0] <= 5
@@ -0,0 +1,49 @@
+from fastapi.testclient import TestClient
+from app.prompts.wine_prompts import get_sat_prompt, get_wine_from_query_prompt
+from app.prompts.wine_pairing_prompts import get_wine_pairing_prompt
+from app.services.llm.gemini_stub import create_stub_app, load_stub_config
+from app.services.llm.gemini_stub_responses import classify_prompt
+from app.utils.llm_parsing import parse_json_from_text
+
+URL = "/v1beta/models/gemini-2.5-flash:generateContent"
+
+def make_client(**overrides) -> TestClient:
+    config = {**load_stub_config(), "latency_scale": 0, "seed": 7, **overrides}
+    return TestClient(create_stub_app(config))
+
+def request_body(prompt: str) -> dict:
+    return {"contents": [{"role": "user", "parts": [{"text": prompt}]}], "generationConfig": {"temperature": 0.3}}
+
+def response_text(response) -> str:
+    return response.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+def test_classify_prompt_families():
+    assert classify_prompt(get_sat_prompt("Opus One 2015", "content", [], {"Oak": []})) == "sat_summary"
+    assert classify_prompt(get_wine_from_query_prompt("opus one 2015")) == "query_parse"
+    assert classify_prompt(get_wine_pairing_prompt({"dish_name": "Steak"})) == "item_pairing"
+    assert classify_prompt(get_wine_pairing_prompt([{"dish_name": "A"}, {"dish_name": "B"}])) == "menu_pairing"
+    assert classify_prompt("hello") == "default"
+
+def test_query_parse_and_batch_pairing_outputs_parse():
+    client = make_client()
+
+    parsed = parse_json_from_text(response_text(client.post(URL, json=request_body(get_wine_from_query_prompt("opus one 2015")))))
+    assert parsed["vintage"] == "2015"
+    assert parsed["wine_name"] == "Opus One"
+
+    batch_prompt = get_wine_pairing_prompt([{"dish_name": "A"}, {"dish_name": "B"}, {"dish_name": "C"}])
+    batch = parse_json_from_text(response_text(client.post(URL, json=request_body(batch_prompt))))
+    assert [item["dish_index"] for item in batch["menu_items"]] == [1, 2, 3]
+
+def test_error_injection_uses_google_error_shape():
+    client = make_client(error_rate=1.0, error_codes=[503])
+    response = client.post(URL, json=request_body("hello"))
+
+    assert response.status_code == 503
+    assert response.json()["error"]["status"] == "UNAVAILABLE"
+    assert client.get("/stub/stats").json()["errors.503"] == 1
+
+def test_config_can_be_changed_at_runtime():
+    client = make_client()
+    client.put("/stub/config", json={"error_rate": 1.0, "error_codes": [429]})
+    assert client.post(URL, json=request_body("hello")).status_code == 429
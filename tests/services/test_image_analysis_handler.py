@@ -0,0 +1,19 @@
+from app.services.handlers.image_analysis_handler import extract_wine_query_from_vision, is_reusable_label_reading
+
+def reading(**overrides):
+    result = {"wine_name": "Opus One", "winery": "Opus One Winery", "vintage": "2019", "confidence": 0.9}
+    result.update(overrides)
+    return result
+
+def test_confident_reading_with_a_query_is_reusable():
+    result = reading()
+    assert is_reusable_label_reading(result, extract_wine_query_from_vision(result))
+
+def test_low_confidence_and_fallback_readings_are_not_reusable():
+    for result in (
+        reading(confidence=0.4),
+        reading(parsing_method="text_fallback"),
+        {"raw_output": "I can't read this label", "confidence": 0.9},
+        reading(wine_name="Unknown Wine", winery="", vintage=None),
+    ):
+        assert not is_reusable_label_reading(result, extract_wine_query_from_vision(result))
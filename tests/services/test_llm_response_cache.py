@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+from app.services.llm.gemini_engine import call_gemini_sync_with_retry, is_json_object
+from app.services.llm.response_cache import LLMResponseCache, llm_cache_key
+from app.services.llm.tasks import LLMTask
+from app.utils.cache import TieredCache
+
+def make_model(text="{}"):
+    model = MagicMock()
+    model.model_name = "models/gemini-test"
+    model.generate_content.return_value = MagicMock(text=text, usage_metadata=MagicMock(total_token_count=120))
+    return model
+
+def test_cache_key_changes_with_model_prompt_and_config():
+    base = llm_cache_key("m", "prompt", {"temperature": 0.1})
+    assert base == llm_cache_key("m", "prompt", {"temperature": 0.1})
+    assert base != llm_cache_key("m2", "prompt", {"temperature": 0.1})
+    assert base != llm_cache_key("m", "prompt!", {"temperature": 0.1})
+    assert base != llm_cache_key("m", "prompt", {"temperature": 0.3})
+
+def test_cached_task_skips_second_gemini_call(tmp_path):
+    cache = LLMResponseCache(store=TieredCache(root=str(tmp_path), namespaces={}), ttls={"query_parse": 60})
+    model = make_model('{"wine_name": "Opus One"}')
+
+    with patch("app.services.llm.gemini_engine.llm_response_cache", cache):
+        first = call_gemini_sync_with_retry("parse this", LLMTask.QUERY_PARSE, model=model, validate=is_json_object)
+        second = call_gemini_sync_with_retry("parse this", LLMTask.QUERY_PARSE, model=model, validate=is_json_object)
+
+    assert first == second == '{"wine_name": "Opus One"}'
+    assert model.generate_content.call_count == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["tokens_saved"] == 120
+
+def test_unparseable_response_is_not_cached(tmp_path):
+    cache = LLMResponseCache(store=TieredCache(root=str(tmp_path), namespaces={}), ttls={"query_parse": 60})
+    model = make_model("Sorry, I can't help with that.")
+
+    with patch("app.services.llm.gemini_engine.llm_response_cache", cache):
+        call_gemini_sync_with_retry("parse this", LLMTask.QUERY_PARSE, model=model, validate=is_json_object)
+        call_gemini_sync_with_retry("parse this", LLMTask.QUERY_PARSE, model=model, validate=is_json_object)
+
+    assert model.generate_content.call_count == 2
+    assert cache.stats()["hits"] == 0
+
+def test_uncached_tasks_always_call_gemini(tmp_path):
+    cache = LLMResponseCache(store=TieredCache(root=str(tmp_path), namespaces={}), ttls={"query_parse": 60})
+    model = make_model()
+
+    with patch("app.services.llm.gemini_engine.llm_response_cache", cache):
+        call_gemini_sync_with_retry("summarize", model=model)
+        call_gemini_sync_with_retry("summarize", LLMTask.SAT_SUMMARY, model=model)
+        call_gemini_sync_with_retry("summarize", model=model)
+
+    assert model.generate_content.call_count == 3
+    assert cache.hits == cache.misses == 0
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = LLMResponseCache(store=TieredCache(root=str(tmp_path), namespaces={}), ttls={"query_parse": 60})
+    cache.set("abc123", "cached text", "query_parse", ttl_seconds=60, tokens=10)
+    assert cache.get("abc123") == "cached text"
+
+    with patch("app.utils.cache.time.time", return_value=10**12):
+        assert cache.get("abc123") is None
+    assert cache.misses == 1
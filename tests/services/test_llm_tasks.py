@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from app.services.llm.gemini_engine import call_gemini_sync_with_retry, generate_for_task
+from app.services.llm.tasks import LLMTask, GenerationProfile, TASK_PROFILES, TaskLatencyStats
+
+def test_every_task_has_a_profile():
+    assert set(TASK_PROFILES) == set(LLMTask)
+
+def test_generation_config_only_caps_tokens_when_set():
+    assert GenerationProfile("m", temperature=0.3).generation_config() == {"temperature": 0.3}
+    assert GenerationProfile("m", temperature=0.1, max_output_tokens=8192).generation_config() == {
+        "temperature": 0.1, "max_output_tokens": 8192, "candidate_count": 1
+    }
+
+def test_generate_for_task_uses_task_model_config_and_timeout():
+    model = MagicMock()
+    stats = TaskLatencyStats()
+    profiles = {LLMTask.QUERY_PARSE: GenerationProfile("fast-model", temperature=0.3, timeout_seconds=5)}
+
+    with patch("app.services.llm.gemini_engine.TASK_PROFILES", profiles), \
+         patch("app.services.llm.gemini_engine.get_gemini_model", return_value=model) as get_model, \
+         patch("app.services.llm.gemini_engine.task_latency", stats):
+        generate_for_task(LLMTask.QUERY_PARSE, "opus one 2015")
+
+    get_model.assert_called_once_with("fast-model")
+    model.generate_content.assert_called_once_with(
+        "opus one 2015", generation_config={"temperature": 0.3}, request_options={"timeout": 5}
+    )
+    assert stats.snapshot()["query_parse"]["calls"] == 1
+
+def test_failed_calls_are_counted_per_task():
+    model = MagicMock()
+    model.generate_content.side_effect = TimeoutError("deadline")
+    stats = TaskLatencyStats()
+
+    with patch("app.services.llm.gemini_engine.task_latency", stats), \
+         patch("app.services.llm.gemini_engine.llm_response_cache.enabled", False):
+        with pytest.raises(Exception):
+            call_gemini_sync_with_retry("menu", LLMTask.MENU_PAIRING, max_retries=2, delay_seconds=0, model=model)
+
+    snapshot = stats.snapshot()["menu_pairing"]
+    assert snapshot["calls"] == snapshot["errors"] == 2
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services.rules.local_query_parser import LocalQueryParser, split_vintage, name_tokens
+
+STORED = ["Opus One 2015", "1978 Château Margaux", "Penfolds Grange 2018", "Penfolds Grange Bin 95 2018"]
+
+def test_split_vintage():
+    assert split_vintage("Opus One 2015") == ("Opus One", "2015")
+    assert split_vintage("1978 château margaux") == ("château margaux", "1978")
+    assert split_vintage("Opus One") == ("Opus One", "")
+
+def test_name_tokens_ignores_case_accents_order_and_filler():
+    assert name_tokens("Château Margaux") == name_tokens("margaux chateau wine")
+
+@pytest.mark.asyncio
+async def test_parse_resolves_stored_wine_without_llm():
+    parser = LocalQueryParser()
+    with patch("app.services.rules.local_query_parser.get_all_wine_names", AsyncMock(return_value=STORED)):
+        result = await parser.parse(AsyncMock(), "chateau margaux 1978")
+
+    assert result["matched_wine"] == "1978 Château Margaux"
+    assert result["vintage"] == "1978"
+    assert result["wine_name"] == "Château Margaux"
+    assert parser.hits == 1
+
+@pytest.mark.asyncio
+async def test_parse_misses_new_or_different_vintage():
+    parser = LocalQueryParser()
+    with patch("app.services.rules.local_query_parser.get_all_wine_names", AsyncMock(return_value=STORED)):
+        assert await parser.parse(AsyncMock(), "Opus One 2016") is None
+        assert await parser.parse(AsyncMock(), "Opus One") is None
+        assert await parser.parse(AsyncMock(), "Grange 2018") is None
+
+    assert parser.misses == 3
+    assert parser.hit_ratio == 0.0
+
+@pytest.mark.asyncio
+async def test_parse_loads_index_once_and_learns_new_names():
+    parser = LocalQueryParser()
+    loader = AsyncMock(return_value=STORED)
+    with patch("app.services.rules.local_query_parser.get_all_wine_names", loader):
+        await parser.parse(AsyncMock(), "Opus One 2015")
+        parser.add_name("Sassicaia 2019")
+        result = await parser.parse(AsyncMock(), "sassicaia 2019")
+
+    assert loader.await_count == 1
+    assert result["matched_wine"] == "Sassicaia 2019"
+
+@pytest.mark.asyncio
+async def test_parse_falls_back_when_db_unavailable():
+    parser = LocalQueryParser()
+    with patch("app.services.rules.local_query_parser.get_all_wine_names", AsyncMock(side_effect=RuntimeError("db down"))):
+        assert await parser.parse(AsyncMock(), "Opus One 2015") is None
+
+def test_stats_estimate_time_saved():
+    parser = LocalQueryParser()
+    parser.hits, parser.misses = 3, 1
+    parser.record_llm_parse(2.0)
+
+    stats = parser.stats()
+    assert stats["hit_ratio"] == 0.75
+    assert stats["estimated_seconds_saved"] == 6.0
@@ -0,0 +1,60 @@
+import io
+import random
+from unittest.mock import patch
+from PIL import Image, ImageDraw
+from app.services.image.perceptual_hash import (
+    BKTree, NearDuplicateIndex, dhash, find_near_duplicate, hamming
+)
+from app.utils.cache import TieredCache
+
+def menu_image(lines, size=(600, 800), quality=95):
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for i, width in enumerate(lines):
+        draw.rectangle([40, 60 + i * 50, 40 + width, 80 + i * 50], fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+def test_resized_reencoded_photo_is_near_original():
+    original = menu_image([300, 420, 250, 380, 200, 450])
+    retaken = Image.open(io.BytesIO(original)).resize((450, 600))
+    buffer = io.BytesIO()
+    retaken.save(buffer, format="JPEG", quality=60)
+
+    other = menu_image([120, 500, 90, 260, 480, 150])
+
+    assert hamming(dhash(original), dhash(buffer.getvalue())) <= 10
+    assert hamming(dhash(original), dhash(other)) > 30
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    tree = BKTree()
+    for i, h in enumerate(hashes):
+        tree.add(h, i)
+
+    query = hashes[42] ^ 0b1011     # 3 bits away from an entry
+    expected = sorted((hamming(query, h), i) for i, h in enumerate(hashes) if hamming(query, h) <= 20)
+    assert sorted(tree.search(query, 20)) == expected
+    assert tree.search(query, 3)[0] == (3, 42)
+
+def test_index_drops_oldest_half_when_full():
+    index = NearDuplicateIndex(max_distance=0, max_entries=4)
+    for i in range(5):
+        index.add(i << 8, f"key{i}")
+
+    assert index.find(0) is None
+    assert index.find(4 << 8) == ("key4", 0)
+
+def test_find_near_duplicate_ignores_expired_results(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    index = NearDuplicateIndex(max_distance=4)
+    index.add(0b1111, "fresh")
+    index.add(0b1111 << 20, "gone")
+    store.set("menu", "fresh", {"status": "success"})
+
+    with patch("app.services.image.perceptual_hash.cache", store):
+        assert find_near_duplicate(index, "menu", 0b0111) == {"status": "success"}
+        assert find_near_duplicate(index, "menu", 0b1111 << 20) is None
+        assert find_near_duplicate(index, "menu", None) is None
@@ -0,0 +1,50 @@
+from app.services.llm.prompt_assembly import (
+    assemble_prompt_content,
+    estimate_tokens,
+    name_match_score,
+    split_paragraphs,
+)
+
+WINE = "Opus One 2015"
+
+def test_split_paragraphs_on_blank_lines_and_size():
+    text = "First block\nstill first\n\nSecond block\n\n\n" + "x" * 50
+    assert split_paragraphs(text) == ["First block\nstill first", "Second block", "x" * 50]
+
+    long_text = "\n".join(["word " * 20] * 10)
+    chunks = split_paragraphs(long_text, max_tokens=60)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(c) <= 60 for c in chunks)
+
+def test_name_match_score():
+    assert name_match_score(WINE, "The 2015 Opus One shows cassis") == 1.0
+    assert name_match_score(WINE, "OPUS ONE 2015 review") == 1.0
+    assert name_match_score(WINE, "Nothing relevant here") == 0.0
+
+def test_assemble_keeps_everything_under_budget_with_attribution():
+    pages = [
+        ("https://a.com", "Opus One 2015 is deep ruby.\n\nShared paragraph about Napa."),
+        ("https://b.com", "Shared paragraph about Napa.\n\nLong finish with cassis."),
+    ]
+
+    content = assemble_prompt_content(WINE, pages, token_budget=10_000)
+
+    assert content.startswith("[Source: https://a.com]")
+    assert "[Source: https://b.com]" in content
+    assert content.count("Shared paragraph about Napa.") == 1  # de-duplicated across sources
+    assert "Long finish with cassis." in content
+
+def test_assemble_ranks_and_respects_budget():
+    relevant = "Opus One 2015 tasting note: cassis, graphite and cedar with a long finish."
+    filler = [f"Shipping policy number {i}: orders over fifty dollars ship free." for i in range(20)]
+    pages = [("https://shop.com", "\n\n".join(filler)), ("https://review.com", relevant)]
+
+    budget = estimate_tokens(relevant) + estimate_tokens(filler[0])
+    content = assemble_prompt_content(WINE, pages, token_budget=budget)
+
+    assert relevant in content
+    assert "[Source: https://review.com]" in content
+    assert sum(f in content for f in filler) <= 1
+
+def test_assemble_empty_pages():
+    assert assemble_prompt_content(WINE, [("https://a.com", "")]) == ""
@@ -0,0 +1,50 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.prompts.wine_prompts import QUERY_PARSE_PROMPT_VERSION
+from app.services.llm.query_memo import QueryMemo
+
+PARSED = {"winery": "Opus One Winery", "wine_name": "Opus One", "vintage": "2015"}
+
+@pytest.mark.asyncio
+async def test_put_then_get_is_served_from_lru():
+    memo = QueryMemo()
+    with patch("app.services.llm.query_memo.save_parsed_query", AsyncMock()) as save, \
+         patch("app.services.llm.query_memo.get_parsed_query", AsyncMock()) as lookup:
+        await memo.put(AsyncMock(), "  Opus One   2015 ", PARSED, "Opus One Winery 2015")
+        result = await memo.get(AsyncMock(), "opus one 2015")
+
+    saved = save.await_args.args[1]
+    assert saved["query_key"] == "opus one 2015"
+    assert saved["canonical_key"] == "opus one winery 2015"
+    assert saved["prompt_version"] == QUERY_PARSE_PROMPT_VERSION
+    assert result["wine_name"] == "Opus One"
+    lookup.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_get_reads_db_with_current_prompt_version():
+    memo = QueryMemo()
+    entry = MagicMock()
+    entry.to_dict.return_value = {**PARSED, "canonical_key": "opus one winery 2015"}
+    with patch("app.services.llm.query_memo.get_parsed_query", AsyncMock(return_value=entry)) as lookup, \
+         patch("app.services.llm.query_memo.usage_recorder") as usage:
+        first = await memo.get(AsyncMock(), "Opus One 2015")
+        second = await memo.get(AsyncMock(), "OPUS ONE 2015")
+
+    lookup.assert_awaited_once()
+    assert usage.memo_hit.call_count == 2     # DB hit and LRU hit, written later in a batch
+    assert lookup.await_args.args[1:] == ("opus one 2015", QUERY_PARSE_PROMPT_VERSION)
+    assert first == second
+
+@pytest.mark.asyncio
+async def test_get_returns_none_and_rolls_back_on_db_error():
+    memo = QueryMemo()
+    session = AsyncMock()
+    with patch("app.services.llm.query_memo.get_parsed_query", AsyncMock(side_effect=Exception("db down"))):
+        assert await memo.get(session, "Opus One 2015") is None
+    session.rollback.assert_awaited_once()
+
+def test_lru_evicts_oldest_entry():
+    memo = QueryMemo(max_size=2)
+    for key in ("a", "b", "c"):
+        memo._remember(key, PARSED)
+    assert list(memo._lru) == ["b", "c"]
@@ -0,0 +1,58 @@
+import asyncio
+import json
+import pytest
+from app.services.handlers.stream_handler import stream_analysis
+from app.utils.progress import report_stage
+
+def parse_events(chunks: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for chunk in chunks:
+        if chunk.startswith("event:"):
+            name_line, data_line = chunk.strip().split("\n", 1)
+            events.append((name_line.split(": ", 1)[1], json.loads(data_line.split(": ", 1)[1])))
+    return events
+
+@pytest.mark.asyncio
+async def test_stream_analysis_emits_stages_then_result():
+    async def run():
+        report_stage("parsing_query")
+        report_stage("gathering_info")
+        report_stage("analyzing_ai", content_length=42)
+        return {"status": "analyzed", "output": {"wine": "Opus One 2015"}}
+
+    chunks = [chunk async for chunk in stream_analysis(run)]
+    events = parse_events(chunks)
+
+    stages = [data["stage"] for name, data in events if name == "stage"]
+    assert stages == ["parsing_query", "gathering_info", "analyzing_ai", "completed"]
+    assert events[1][1]["previous_stage"] == "parsing_query"
+    assert events[2][1]["content_length"] == 42
+
+    name, result = events[-1]
+    assert name == "result"
+    assert result["status"] == "analyzed"
+    assert set(result["timings"]["stages"]) == {"parsing_query", "gathering_info", "analyzing_ai", "completed"}
+
+@pytest.mark.asyncio
+async def test_stream_analysis_sends_heartbeats_while_waiting():
+    async def run():
+        await asyncio.sleep(0.05)
+        return {"status": "analyzed"}
+
+    chunks = [chunk async for chunk in stream_analysis(run, heartbeat_seconds=0.01)]
+
+    assert any(chunk == ": keep-alive\n\n" for chunk in chunks)
+    assert parse_events(chunks)[-1][0] == "result"
+
+@pytest.mark.asyncio
+async def test_stream_analysis_reports_pipeline_errors():
+    async def run():
+        raise RuntimeError("boom")
+
+    events = parse_events([chunk async for chunk in stream_analysis(run)])
+
+    assert events[-1][0] == "result"
+    assert events[-1][1]["status"] == "error"
+
+def test_report_stage_is_noop_outside_stream():
+    report_stage("parsing_query")
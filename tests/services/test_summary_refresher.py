@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.handlers.summary_refresher import SummaryRefresher
+
+def make_summary(name="Opus One 2015", age_days=40, refreshed=True):
+    stamp = datetime.now(timezone.utc) - timedelta(days=age_days)
+    return SimpleNamespace(id=1, wine=name, created_at=stamp, refreshed_at=stamp if refreshed else None)
+
+def session_factory(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+def test_is_stale_uses_refreshed_at_then_created_at():
+    refresher = SummaryRefresher(freshness=timedelta(days=30))
+    assert refresher.is_stale(make_summary(age_days=40))
+    assert not refresher.is_stale(make_summary(age_days=5))
+    assert refresher.is_stale(make_summary(age_days=40, refreshed=False))
+
+@pytest.mark.asyncio
+async def test_schedules_stale_wine_once_and_skips_fresh():
+    refresher = SummaryRefresher(freshness=timedelta(days=30))
+    refresher._run = AsyncMock(return_value=True)
+
+    assert not refresher.maybe_schedule(make_summary(age_days=1))
+    assert refresher.maybe_schedule(make_summary())
+    assert not refresher.maybe_schedule(make_summary(name="opus one  2015"))   # same canonical key
+
+    await asyncio.gather(*refresher._tasks.values())
+    assert refresher._run.await_count == 1
+    assert refresher.refreshed == 1
+    assert refresher.stats()["pending"] == []
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    refresher = SummaryRefresher(concurrency=2)
+    running, peak = 0, 0
+
+    async def run(key, wine_name):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return True
+
+    refresher._run = run
+    for i in range(6):
+        refresher.maybe_schedule(make_summary(name=f"Wine {i}"))
+    await asyncio.gather(*refresher._tasks.values())
+
+    assert peak == 2
+    assert refresher.refreshed == 6
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_not_retried_until_backoff_expires():
+    refresher = SummaryRefresher(retry_seconds=3600)
+    refresher._run = AsyncMock(side_effect=Exception("gemini down"))
+
+    refresher.maybe_schedule(make_summary())
+    await asyncio.gather(*refresher._tasks.values())
+
+    assert refresher.failed == 1
+    assert not refresher.maybe_schedule(make_summary())
+
+@pytest.mark.asyncio
+async def test_run_overwrites_row_but_keeps_stored_name():
+    session = AsyncMock()
+    refresher = SummaryRefresher(session_factory=session_factory(session))
+    generated = {"wine": "Opus One Winery 2015", "region": "Napa Valley"}
+
+    with patch("app.services.handlers.summary_refresher.try_acquire_lease", AsyncMock(return_value=True)), \
+         patch("app.services.handlers.summary_refresher.release_lease", AsyncMock()) as release, \
+         patch("app.services.handlers.summary_refresher.get_wine_summary_by_name", AsyncMock(return_value=make_summary())), \
+         patch("app.services.handlers.summary_refresher.summarize_wine_info", AsyncMock(return_value=generated)), \
+         patch("app.services.handlers.wine_summary_handler.prepare_summary", return_value=(dict(generated), None)), \
+         patch("app.services.handlers.summary_refresher.refresh_wine_summary", AsyncMock()) as refresh:
+        assert await refresher._run("opus one 2015", "Opus One 2015")
+
+    assert refresh.await_args.args[1:] == (1, {"region": "Napa Valley"})
+    release.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_run_skips_when_another_instance_holds_the_lock():
+    refresher = SummaryRefresher(session_factory=session_factory(AsyncMock()))
+    with patch("app.services.handlers.summary_refresher.try_acquire_lease", AsyncMock(return_value=False)), \
+         patch("app.services.handlers.summary_refresher.summarize_wine_info", AsyncMock()) as summarize:
+        assert not await refresher._run("opus one 2015", "Opus One 2015")
+    summarize.assert_not_awaited()
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from app.services.pairing.wine_recommender import WineRecommender
+from app.utils.cache import TieredCache
+
+DISHES = [
+    {"dish_name": "Duck Breast", "protein": "duck", "cooking_method": "pan-seared"},
+    {"dish_name": "Ribeye", "protein": "beef", "cooking_method": "grilled"},
+    {"dish_name": "Sea Bass", "protein": "fish", "cooking_method": "roasted"},
+]
+
+def pairing(name):
+    return {"specific_recommendations": [{"wine_name": name}], "general_recommendations": []}
+
+def batch_result(items):
+    return {
+        "menu_items": [{"dish": item, "wine_pairings": pairing(f"fresh {item['dish_name']}")} for item in items],
+        "overall_recommendations": [{"category": "AI Pick"}],
+        "analysis_method": "ai_pairing_batch",
+    }
+
+def test_only_uncached_dishes_are_sent_and_order_is_kept(tmp_path):
+    recommender = WineRecommender()
+    store = TieredCache(root=str(tmp_path), namespaces={})
+
+    with patch("app.services.pairing.wine_recommender.cache", store), \
+         patch.object(recommender, "_recommend_for_batch_items", side_effect=batch_result) as batch:
+        recommender._set_cached_item(DISHES[1], pairing("cached Ribeye"))
+        result = recommender.recommend_wines_for_menu(DISHES)
+
+    sent = batch.call_args.args[0]
+    assert [d["dish_name"] for d in sent] == ["Duck Breast", "Sea Bass"]
+    assert [r["wine_pairings"]["specific_recommendations"][0]["wine_name"] for r in result["menu_items"]] == [
+        "fresh Duck Breast", "cached Ribeye", "fresh Sea Bass"
+    ]
+    assert result["item_cache"] == {"hits": 1, "misses": 2, "hit_ratio": 0.333}
+    assert result["overall_recommendations"][0]["category"] == "AI Pick"
+
+def test_fresh_pairings_are_reused_by_another_menu(tmp_path):
+    recommender = WineRecommender()
+    store = TieredCache(root=str(tmp_path), namespaces={})
+
+    with patch("app.services.pairing.wine_recommender.cache", store), \
+         patch.object(recommender, "_recommend_for_batch_items", side_effect=batch_result) as batch:
+        recommender.recommend_wines_for_menu(DISHES)
+        result = recommender.recommend_wines_for_menu(DISHES[:2])
+
+    assert batch.call_count == 1
+    assert result["analysis_method"] == "ai_pairing_item_cache"
+    assert result["item_cache"]["hit_ratio"] == 1.0
+
+def test_rule_based_fallbacks_are_not_cached(tmp_path):
+    recommender = WineRecommender()
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    fallback = {
+        "menu_items": [{"dish": DISHES[1], "wine_pairings": recommender._get_fallback_recommendations(DISHES[1])}],
+        "overall_recommendations": [],
+    }
+
+    with patch("app.services.pairing.wine_recommender.cache", store):
+        recommender._cache_items(fallback["menu_items"])
+        assert recommender._get_cached_item(DISHES[1]) is None
@@ -6,4 +6,84 @@ def test_parse_wine_query_with_gemini_success():
     result = parse_wine_query_with_gemini(query)
     assert isinstance(result, dict)
     assert "wine_name" in result
-    assert "vintage" in result
\ No newline at end of file
+    assert "vintage" in result
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.models.mcp_model import MCPContext, WineMCPRequest
+from app.services.handlers.wine_summary_handler import handle_similar_wine_summary
+
+def make_request(query):
+    return WineMCPRequest(input={"query": query}, context=MCPContext(model="test", timestamp=datetime.now(timezone.utc)))
+
+def stored_summary(wine):
+    summary = MagicMock(wine=wine)
+    summary.to_dict.return_value = {"wine": wine}
+    return summary
+
+@pytest.mark.asyncio
+async def test_spelling_variant_summary_is_reused_for_same_vintage():
+    match = [(stored_summary("Château Léoville-Barton 2010"), 0.81)]
+    with patch("app.services.handlers.wine_summary_handler.search_similar_wines", AsyncMock(return_value=match)), \
+         patch("app.services.handlers.wine_summary_handler.WineMCPOutput", lambda **fields: fields), \
+         patch("app.services.handlers.wine_summary_handler.summary_refresher.maybe_schedule"):
+        result = await handle_similar_wine_summary(MagicMock(), "Chateau Leoville Barton 2010", make_request("chateau leoville barton 2010"))
+
+    assert result["status"] == "analyzed"
+    assert result["matched"] == {"wine": "Château Léoville-Barton 2010", "similarity": 0.81}
+
+@pytest.mark.asyncio
+async def test_other_close_match_is_only_suggested():
+    match = [(stored_summary("Opus One Overture 2015"), 0.74)]
+    with patch("app.services.handlers.wine_summary_handler.search_similar_wines", AsyncMock(return_value=match)):
+        result = await handle_similar_wine_summary(MagicMock(), "Opus One 2015", make_request("opus one 2015"))
+        exact = await handle_similar_wine_summary(
+            MagicMock(), "Opus One 2015",
+            WineMCPRequest(input={"query": "opus one 2015", "exact": True}, context=make_request("").context)
+        )
+
+    assert result["status"] == "did_you_mean"
+    assert result["did_you_mean"] == {"wine": "Opus One Overture 2015", "similarity": 0.74}
+    assert "output" not in result
+    assert exact is None
+
+@pytest.mark.asyncio
+async def test_similar_summary_of_other_vintage_is_not_reused():
+    match = [(stored_summary("Opus One 2015"), 0.9)]
+    with patch("app.services.handlers.wine_summary_handler.search_similar_wines", AsyncMock(return_value=match)):
+        assert await handle_similar_wine_summary(MagicMock(), "Opus One 2016", make_request("opus one 2016")) is None
+
+@pytest.mark.asyncio
+async def test_failed_fuzzy_lookup_rolls_back_only_its_savepoint():
+    session = MagicMock()
+    session.rollback = AsyncMock()
+    with patch("app.services.handlers.wine_summary_handler.search_similar_wines", AsyncMock(side_effect=RuntimeError("no pg_trgm"))):
+        assert await handle_similar_wine_summary(session, "Opus One 2015", make_request("opus one 2015")) is None
+
+    session.begin_nested.assert_called_once()
+    session.rollback.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_outside_a_transaction_and_releases_the_lease():
+    from app.services.handlers.wine_summary_handler import _lead_fresh_summary
+
+    session = AsyncMock()
+    calls = []
+    session.commit.side_effect = lambda: calls.append("commit")
+
+    async def fresh(*args):
+        calls.append("pipeline")
+        return {"status": "analyzed"}
+
+    with patch("app.services.handlers.wine_summary_handler.try_acquire_lease", AsyncMock(return_value=True)) as acquire, \
+         patch("app.services.handlers.wine_summary_handler.release_lease", AsyncMock()) as release, \
+         patch("app.services.handlers.wine_summary_handler.handle_cached_wine_summary", AsyncMock(return_value=None)), \
+         patch("app.services.handlers.wine_summary_handler.handle_similar_wine_summary", AsyncMock(return_value=None)), \
+         patch("app.services.handlers.wine_summary_handler.handle_fresh_summary", fresh):
+        await _lead_fresh_summary(session, "opus one 2015", "Opus One 2015", "opus one", make_request("opus one"))
+
+    # One commit of the caller's session; the lease lives on its own session
+    assert calls == ["commit", "pipeline"]
+    release.assert_awaited_once()
+    assert acquire.await_args.args[0] is not session
+    assert release.await_args.args[0] is not session
@@ -1,9 +1,120 @@
-from app.utils.cache import get_cache_or_fetch, get_cache_or_fetch_async
+import asyncio
+import os
+import time
+import pytest
+from unittest.mock import patch
+from app.utils.cache import get_cache_or_fetch, get_cache_or_fetch_async, TieredCache
 
 def test_get_cache_or_fetch_basic(tmp_path):
-    result = get_cache_or_fetch(
-        "test_category",
-        "test_key",
-        lambda: {"mock": "data"}
-    )
-    assert result["mock"] == "data"
\ No newline at end of file
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    with patch("app.utils.cache.cache", store):
+        result = get_cache_or_fetch(
+            "test_category",
+            "test_key",
+            lambda: {"mock": "data"}
+        )
+    assert result["mock"] == "data"
+    assert store.get("test_category", "test_key") == {"mock": "data"}
+
+def test_tiered_cache_serves_memory_then_disk(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={"menu": {"ttl_seconds": 60, "max_entries": 2}})
+    store.set("menu", "abc", {"menu_items": []})
+    assert store.get("menu", "abc") == {"menu_items": []}
+
+    # A fresh process only has the disk tier
+    restarted = TieredCache(root=str(tmp_path), namespaces={"menu": {"ttl_seconds": 60, "max_entries": 2}})
+    assert restarted.get("menu", "abc") == {"menu_items": []}
+    assert restarted.get("menu", "abc") == {"menu_items": []}
+
+    stats = restarted.stats()["menu"]
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+def test_tiered_cache_lru_evicts_and_ttl_expires(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={"pairing": {"ttl_seconds": 60, "max_entries": 1}})
+    store.set("pairing", "a", 1)
+    store.set("pairing", "b", 2)
+    assert list(store._memory["pairing"]) == ["b"]
+    assert store.get("pairing", "a") == 1     # evicted from memory, still on disk
+
+    store.set("pairing", "short", 3, ttl_seconds=-1)
+    assert store.get("pairing", "short") is None
+
+def test_clear_drops_both_tiers(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    store.set("search", "opus one", ["https://example.com"])
+    result = store.clear()
+
+    assert result["files_cleared"] == 1
+    assert store.get("search", "opus one") is None
+
+def test_sweep_removes_expired_files_without_reading_them(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    store.set("html", "fresh", "x" * 100)
+    store.set("html", "stale", "y" * 100, ttl_seconds=-1)
+
+    with patch("builtins.open", side_effect=AssertionError("sweep must not open payloads")):
+        result = store.sweep()
+
+    assert result["expired"] == 1
+    assert store.stats()["html"]["disk_files"] == 1
+
+def test_sweep_evicts_least_recently_used_to_byte_budget(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={}, max_bytes=10**9)
+    for key in ("a", "b", "c"):
+        store.set("search", key, "z" * 1000)
+        time.sleep(0.01)
+    store.get("search", "a")    # a is now the most recently used
+
+    total = store.sweep()["disk_bytes"]
+    store.max_bytes = int(total * 0.8)
+    result = store.sweep()
+
+    assert result["evicted"] == 1
+    assert result["disk_bytes"] <= store.max_bytes
+    store._memory.clear()
+    assert store.get("search", "b") is None
+    assert store.get("search", "a") is not None
+
+def test_index_is_rebuilt_for_existing_cache_directory(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    store.set("menu", "abc", {"menu_items": []})
+    os.remove(tmp_path / "index.sqlite3")
+
+    rebuilt = TieredCache(root=str(tmp_path), namespaces={})
+    assert rebuilt.stats()["menu"]["disk_files"] == 1
+
+def test_stats_count_expirations_evictions_and_latency(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={"search": {"ttl_seconds": 60, "max_entries": 10}}, max_bytes=10**9)
+    store.set("search", "stale", "x" * 1000, ttl_seconds=-1)
+    store.set("search", "a", "y" * 1000)
+    store.set("search", "b", "z" * 1000)
+    assert store.get("search", "stale") is None     # expired in memory
+    store.get("search", "a")
+
+    store.max_bytes = 1
+    store.sweep()
+    stats = store.stats()["search"]
+
+    assert stats["expirations"] == 2                # once on lookup, once when swept from disk
+    assert stats["disk_evictions"] == 2
+    assert stats["bytes_evicted"] > 0
+    assert stats["latency"]["count"] == 2
+    assert sum(stats["latency"]["buckets"].values()) == 2
+
+@pytest.mark.asyncio
+async def test_concurrent_async_misses_share_one_fetch(tmp_path):
+    store = TieredCache(root=str(tmp_path), namespaces={})
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"text": "page"}
+
+    with patch("app.utils.cache.cache", store):
+        results = await asyncio.gather(*[get_cache_or_fetch_async("html", "same-url", fetch) for _ in range(5)])
+
+    assert calls == 1
+    assert all(result == {"text": "page"} for result in results)
+    assert store.stats()["html"]["sets"] == 1
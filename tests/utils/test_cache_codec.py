@@ -0,0 +1,36 @@
+import io
+import json
+import pytest
+from app.utils.cache_codec import encode_entry, decode_entry, CODEC_RAW, CODEC_GZIP, CODEC_ZSTD, zstandard
+from app.scripts.migrate_cache_format import migrate_cache_format
+from app.utils.cache import TieredCache
+
+ENTRY = {"key": "Opus One 2015(https://example.com)", "expires_at": 1.5, "value": "Cassis, cedar, graphite. " * 200}
+
+@pytest.mark.parametrize("codec", [CODEC_RAW, CODEC_GZIP, CODEC_ZSTD])
+def test_roundtrip_and_compression(codec):
+    if codec == CODEC_ZSTD and zstandard is None:
+        pytest.skip("zstandard not installed")
+    payload = encode_entry(ENTRY, codec)
+
+    assert decode_entry(io.BytesIO(payload)) == ENTRY
+    if codec != CODEC_RAW:
+        assert len(payload) < len(json.dumps(ENTRY)) / 5
+
+def test_small_entries_are_stored_raw():
+    payload = encode_entry({"key": "k", "expires_at": 1, "value": [1, 2]}, CODEC_GZIP)
+    assert payload[4:5] == CODEC_RAW
+
+def test_previous_plain_json_still_decodes():
+    assert decode_entry(io.BytesIO(json.dumps(ENTRY, indent=2).encode())) == ENTRY
+
+def test_migration_rewrites_legacy_files(tmp_path):
+    (tmp_path / "html" / "ab").mkdir(parents=True)
+    (tmp_path / "html" / "ab" / "old.json").write_text(json.dumps({**ENTRY, "expires_at": 4102444800}, indent=2))
+    (tmp_path / "menu").mkdir()
+    (tmp_path / "menu" / "00942f4668.json").write_text(json.dumps({"result": {}}))
+
+    migrate_cache_format(str(tmp_path))
+
+    assert not list(tmp_path.rglob("*.json"))
+    assert TieredCache(root=str(tmp_path), namespaces={}).get("html", ENTRY["key"]) == ENTRY["value"]
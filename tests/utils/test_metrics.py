@@ -0,0 +1,26 @@
+from app.utils.metrics import LatencyHistogram, LookupMetrics
+
+def test_histogram_buckets_by_upper_bound():
+    histogram = LatencyHistogram()
+    for seconds in (0.00005, 0.0001, 0.003, 2.0):
+        histogram.observe(seconds)
+
+    result = histogram.to_dict()
+    assert result["count"] == 4
+    assert result["buckets"]["le_0.1ms"] == 2
+    assert result["buckets"]["le_5ms"] == 1
+    assert result["buckets"]["+Inf"] == 1
+
+def test_lookup_metrics_hit_ratio_and_reset():
+    metrics = LookupMetrics()
+    metrics.record("db_summary", True, 0.002)
+    metrics.record("db_summary", False, 0.004)
+    metrics.record("db_pairing", True, 0.001)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["db_summary"]["hit_ratio"] == 0.5
+    assert snapshot["db_summary"]["latency"]["avg_ms"] == 3.0
+    assert list(snapshot) == ["db_pairing", "db_summary"]
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.utils.cache import TieredCache
+from app.utils.negative_cache import NegativeCache
+from app.utils.search import google_search_links_with_retry
+
+@pytest.fixture
+def negative(tmp_path):
+    return NegativeCache(store=TieredCache(root=str(tmp_path), namespaces={}), ttls={"irrelevant": 60, "no_content": 60, "empty_search": 60, "timeout": -1})
+
+@pytest.mark.asyncio
+async def test_url_reason_is_per_wine_and_expires(negative):
+    await negative.remember_url("Opus One 2015", "https://example.com/a", "irrelevant")
+    await negative.remember_url("Opus One 2015", "https://example.com/b", "timeout")
+
+    assert await negative.url_reason("Opus One 2015", "https://example.com/a") == "irrelevant"
+    assert await negative.url_reason("Barolo 2016", "https://example.com/a") is None
+    assert await negative.url_reason("Opus One 2015", "https://example.com/b") is None
+
+@pytest.mark.asyncio
+async def test_fetcher_skips_negative_cached_url_without_fetching(negative):
+    from app.utils.fetcher import get_relevant_text_and_cache
+    fetch = AsyncMock(return_value="")
+
+    with patch("app.utils.fetcher.negative_cache", negative), \
+         patch("app.utils.fetcher.cache", negative.store):
+        await get_relevant_text_and_cache("html", "Opus One 2015", "https://example.com/pdf", fetch)
+        result = await get_relevant_text_and_cache("html", "Opus One 2015", "https://example.com/pdf", fetch)
+
+    assert result == ("", "https://example.com/pdf")
+    fetch.assert_awaited_once()
+
+def test_empty_search_is_negative_cached_not_stored_as_results(negative):
+    response = MagicMock()
+    response.json.return_value = {"items": []}
+
+    with patch("app.utils.search.negative_cache", negative), \
+         patch("app.utils.search.cache", negative.store), \
+         patch("app.utils.search.get_google_keys", return_value=("key", "cx")), \
+         patch("app.utils.search.requests.get", return_value=response) as get:
+        assert google_search_links_with_retry("Unknown Wine 1999") == []
+        assert google_search_links_with_retry("Unknown Wine 1999") == []
+
+    get.assert_called_once()
+    assert negative.store.get("search", "Unknown Wine 1999 wine review") is None
@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.single_flight import SingleFlight, SyncSingleFlight
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_result_between_concurrent_callers():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"wine": "Opus One 2015"}
+
+    results = await asyncio.gather(*[flight.do("opus one 2015", work) for _ in range(5)])
+
+    assert calls == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result == {"wine": "Opus One 2015"} for result, _ in results)
+    assert not flight.in_flight("opus one 2015")
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_leader_error():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("pipeline failed")
+
+    results = await asyncio.gather(
+        flight.do("key", failing), flight.do("key", failing), return_exceptions=True
+    )
+
+    assert all(isinstance(r, ValueError) for r in results)
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_again_after_completion():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", work) == (1, False)
+    assert await flight.do("key", work) == (2, False)
+
+@pytest.mark.asyncio
+async def test_single_flight_follower_takes_over_when_leader_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def quick():
+        return "done"
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("key", quick))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("done", False)
+
+@pytest.mark.asyncio
+async def test_single_flight_timeout_reaches_leader_and_followers():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    results = await asyncio.gather(
+        flight.do("key", slow, timeout=0.05), flight.do("key", slow, timeout=0.05), return_exceptions=True
+    )
+
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert not flight.in_flight("key")
+
+def wait_for_followers(flight, key, count, timeout=5.0):
+    # Polls the follower count instead of guessing how long thread start-up takes
+    deadline = time.monotonic() + timeout
+    while flight.waiters(key) < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return flight.waiters(key)
+
+def test_sync_single_flight_shares_result_and_errors_across_threads():
+    flight = SyncSingleFlight()
+    calls = 0
+    joined = []
+
+    def work():
+        nonlocal calls
+        calls += 1
+        joined.append(wait_for_followers(flight, "search", 3))   # held until every caller is waiting
+        return "links"
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "search", work) for _ in range(4)]
+        results = [f.result() for f in futures]
+
+    assert joined == [3]
+    assert calls == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert flight.waiters("search") == 0
+
+    def failing():
+        wait_for_followers(flight, "search", 1)
+        raise ValueError("quota exceeded")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.do, "search", failing) for _ in range(2)]
+    assert all(isinstance(f.exception(), ValueError) for f in futures)
+
+def test_sync_single_flight_follower_timeout():
+    flight = SyncSingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait()
+        with pytest.raises(TimeoutError):
+            flight.do("key", slow, timeout=0.01)
+        assert flight.waiters("key") == 0
+        release.set()
+        assert leader.result() == ("done", False)